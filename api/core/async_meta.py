@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Async Meta Graph API v24.0 Client
+Concurrent fleet publishing on top of the institutional client
+
+Calls run the sync request pipeline on a worker pool instead of an
+async HTTP stack, so single-flight, caching, breakers, rate limiting and
+error mapping live in one place. Each call in flight holds one worker and
+one pooled keep-alive connection; the default of 64 keeps dozens in
+flight, well past what the per-page buckets admit.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from .meta_client_v24 import (MetaAppConfig, MetaAPIError, RateLimitExceeded,
+                              ContentType, BatchRequest)
+from .institutional_meta import InstitutionalMetaClient
+
+class AsyncMetaGraphClient:
+    """
+    asyncio front-end for the Auto-Notion Meta clients.
+    Every call goes through the same request pipeline as the sync client
+    (appsecret_proof, error-code mapping, rate limiting) on a bounded pool
+    of workers on the shared keep-alive transport, so a single event loop can
+    keep dozens of Graph calls in flight.
+    """
+
+    def __init__(self, config: MetaAppConfig,
+                 client: Optional[InstitutionalMetaClient] = None,
+                 max_concurrency: Optional[int] = None,
+                 max_rate_limit_wait: float = 900.0):
+        self.config = config
+        self.max_concurrency = max_concurrency or config.max_concurrency
+        # Longest rate-limit wait worth awaiting before giving up on a call
+        self.max_rate_limit_wait = max_rate_limit_wait
+        # Sync facade: existing callers keep using this object unchanged
+        self.sync = client or InstitutionalMetaClient(config)
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="meta-graph"
+        )
+
+    async def __aenter__(self) -> "AsyncMetaGraphClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release worker threads"""
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking client call without blocking the event loop.
+        When the rate limiter has no free slot the call is awaited until the
+        next one instead of parking a worker thread in time.sleep().
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await loop.run_in_executor(
+                    self._executor, partial(func, *args, **kwargs)
+                )
+            except RateLimitExceeded as e:
+                if e.retry_after > self.max_rate_limit_wait:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    def time_until_next_slot(self, page_id: str = None, calls: int = 1) -> float:
+        """Seconds until `calls` calls for this page would be admitted (0.0 = now)"""
+        return self.sync.time_until_next_slot(page_id, calls)
+
+    # ==================== INSTAGRAM BUSINESS API METHODS ====================
+
+    async def upload_media(self, page_id: str, access_token: str,
+                          media_path: str, media_type: ContentType,
+                          caption: str = None, **kwargs) -> Dict:
+        """Upload media to Instagram (see MetaGraphClient.upload_media)"""
+        return await self._call(self.sync.upload_media, page_id, access_token,
+                                media_path, media_type, caption, **kwargs)
+
+    async def publish_media(self, page_id: str, access_token: str,
+                           creation_id: str) -> Dict:
+        """Publish uploaded media"""
+        return await self._call(self.sync.publish_media, page_id,
+                                access_token, creation_id)
+
+    async def get_instagram_insights(self, page_id: str, access_token: str,
+                                    metrics: List[str], period: str = 'day') -> Dict:
+        """Get Instagram insights data"""
+        return await self._call(self.sync.get_instagram_insights, page_id,
+                                access_token, metrics, period)
+
+    async def get_instagram_media(self, page_id: str, access_token: str,
+                                 fields: List[str] = None) -> Dict:
+        """Get Instagram media objects"""
+        return await self._call(self.sync.get_instagram_media, page_id,
+                                access_token, fields)
+
+    async def get_media_object(self, page_id: str, access_token: str, media_id: str,
+                              fields: List[str] = None) -> Dict:
+        """Get one Instagram media object"""
+        return await self._call(self.sync.get_media_object, page_id,
+                                access_token, media_id, fields)
+
+    async def comment_on_media(self, page_id: str, access_token: str,
+                              media_id: str, message: str) -> Dict:
+        """Comment on Instagram media"""
+        return await self._call(self.sync.comment_on_media, page_id,
+                                access_token, media_id, message)
+
+    # ==================== STREAMING PAGINATION ====================
+
+    async def _aiter_edge(self, endpoint: str, access_token: str, page_id: str,
+                         params: Dict, stop_after: Callable[[Dict], bool] = None
+                         ) -> AsyncIterator[Dict]:
+        """Follow paging cursors on an edge, holding one page at a time"""
+        params = dict(params)
+        while True:
+            response = await self._call(self.sync._make_request, 'GET', endpoint,
+                                        access_token, page_id, params=dict(params))
+            for item in response.get('data', []):
+                yield item
+
+            next_params = self.sync._next_page_params(response.get('paging'))
+            if next_params is None or (stop_after and stop_after(next_params)):
+                return
+            params.update(next_params)
+
+    async def iter_media(self, page_id: str, access_token: str, fields: List[str] = None,
+                        page_size: int = 25, since: Union[datetime, int, None] = None,
+                        stop: Callable[[Dict], bool] = None) -> AsyncIterator[Dict]:
+        """Stream every media object of an account (see MetaGraphClient.iter_media)"""
+        params = self.sync._media_page_params(fields, page_size, since)
+        should_stop = self.sync._media_stop_condition(since, stop)
+
+        async for item in self._aiter_edge(f"{page_id}/media", access_token,
+                                           page_id, params):
+            if should_stop(item):
+                return
+            yield item
+
+    async def iter_insights(self, page_id: str, access_token: str, metrics: List[str],
+                           period: str = 'day', since: Union[datetime, int, None] = None,
+                           until: Union[datetime, int, None] = None) -> AsyncIterator[Dict]:
+        """Stream insight values window by window (see MetaGraphClient.iter_insights)"""
+        params = self.sync._insights_page_params(metrics, period, since, until)
+        until_ts = int(params['until'])
+
+        def past_until(next_params: Dict) -> bool:
+            return int(next_params.get('since', 0)) >= until_ts
+
+        async for metric in self._aiter_edge(f"{page_id}/insights", access_token,
+                                             page_id, params, stop_after=past_until):
+            for row in self.sync._flatten_insight(metric):
+                yield row
+
+    # ==================== BATCH REQUESTS ====================
+
+    async def batch(self, calls: List[BatchRequest]) -> List[Union[Dict, MetaAPIError]]:
+        """Send sub-requests as Graph batch calls of up to 50"""
+        return await self._call(self.sync.batch, calls)
+
+    async def batch_get_instagram_insights(self, pages: Dict[str, str], metrics: List[str],
+                                          period: str = 'day') -> Dict[str, Union[Dict, MetaAPIError]]:
+        """Insights for many pages in batched calls"""
+        return await self._call(self.sync.batch_get_instagram_insights,
+                                pages, metrics, period)
+
+    async def batch_get_instagram_media(self, pages: Dict[str, str],
+                                       fields: List[str] = None) -> Dict[str, Union[Dict, MetaAPIError]]:
+        """Media lists for many pages in batched calls"""
+        return await self._call(self.sync.batch_get_instagram_media, pages, fields)
+
+    # ==================== INSTITUTIONAL REELS & STORIES ====================
+
+    async def upload_reel(self, page_id: str, access_token: str,
+                         video_url: str, caption: str,
+                         thumb_url: Optional[str] = None) -> Dict:
+        """Upload an Instagram Reel container"""
+        return await self._call(self.sync.upload_reel, page_id, access_token,
+                                video_url, caption, thumb_url)
+
+    async def upload_story(self, page_id: str, access_token: str,
+                          image_url: str) -> Dict:
+        """Upload an Instagram Story container"""
+        return await self._call(self.sync.upload_story, page_id,
+                                access_token, image_url)
+
+    async def check_upload_status(self, container_id: str, access_token: str) -> str:
+        """Check the status of a media container upload"""
+        return await self._call(self.sync.check_upload_status,
+                                container_id, access_token)
+
+    async def publish_container(self, page_id: str, access_token: str,
+                               creation_id: str) -> Dict:
+        """Publish a successfully uploaded media container"""
+        return await self._call(self.sync.publish_container, page_id,
+                                access_token, creation_id)
+
+    async def rotate_token(self, old_token: str) -> str:
+        """Rotate a long-lived token"""
+        return await self._call(self.sync.rotate_token, old_token)
+
+    # ==================== FLEET OPERATIONS ====================
+
+    async def publish_post(self, page_id: str, access_token: str,
+                          media_path: str, media_type: ContentType,
+                          caption: str = None, **kwargs) -> Dict:
+        """Upload and publish a single post"""
+        container = await self.upload_media(page_id, access_token, media_path,
+                                            media_type, caption, **kwargs)
+        creation_id = container.get('id')
+        if not creation_id:
+            raise MetaAPIError(f"Upload for {page_id} returned no container id")
+        return await self.publish_media(page_id, access_token, creation_id)
+
+    async def publish_fleet(self, posts: List[Dict]) -> List[Dict]:
+        """
+        Publish many posts concurrently.
+        Each post is a dict of publish_post keyword arguments; the result list
+        keeps input order with either the publish response or the error.
+        """
+        results = await asyncio.gather(
+            *(self.publish_post(**post) for post in posts),
+            return_exceptions=True
+        )
+
+        report = []
+        for post, result in zip(posts, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Fleet publish failed for {post.get('page_id')}: {result}")
+                report.append({"page_id": post.get('page_id'), "status": "failed",
+                               "error": str(result)})
+            else:
+                report.append({"page_id": post.get('page_id'), "status": "published",
+                               "result": result})
+        return report
+
+    def publish_fleet_sync(self, posts: List[Dict]) -> List[Dict]:
+        """Blocking entry point for scripts that are not async yet"""
+        return asyncio.run(self.publish_fleet(posts))
+
+if __name__ == "__main__":
+    print("Async Meta Client Loaded")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Carousel Publisher
+Fans out child container uploads, then creates and publishes the
+parent carousel container
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .meta_client_v24 import MetaAPIError, ContentType
+from .async_meta import AsyncMetaGraphClient
+from .container_poller import ContainerPoller, PollerEventType
+
+# Instagram carousels hold 2 to 10 items
+MIN_CAROUSEL_ITEMS = 2
+MAX_CAROUSEL_ITEMS = 10
+
+@dataclass
+class CarouselItem:
+    """One slide: a public image or video URL"""
+    media_url: str
+    media_type: ContentType = ContentType.IMAGE
+
+class CarouselPublishError(MetaAPIError):
+    """
+    A carousel could not be published.
+    Graph cannot delete unpublished containers; the ones listed in
+    `orphaned_containers` expire on their own after 24 hours.
+    """
+
+    def __init__(self, message: str, orphaned_containers: Optional[List[str]] = None):
+        super().__init__(message)
+        self.orphaned_containers = orphaned_containers or []
+
+@dataclass
+class CarouselResult:
+    """Published carousel"""
+    page_id: str
+    media_id: Optional[str]
+    container_id: str
+    children: List[str] = field(default_factory=list)
+
+class CarouselPublisher:
+    """
+    Concurrent carousel pipeline.
+    All child containers are created at once and their processing is
+    awaited together through one ContainerPoller, so a carousel takes
+    about as long as its slowest slide. If any child fails, the other
+    uploads are still awaited (they cannot be recalled once sent), no
+    parent is created, and every child that was created is reported as
+    an orphan.
+    """
+
+    def __init__(self, client: AsyncMetaGraphClient, initial_delay: float = 2.0,
+                 max_delay: float = 30.0, timeout: float = 600.0):
+        self.client = client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+    def _poller(self) -> ContainerPoller:
+        return ContainerPoller(self.client, initial_delay=self.initial_delay,
+                               max_delay=self.max_delay, timeout=self.timeout)
+
+    async def _create_child(self, page_id: str, access_token: str, item: CarouselItem) -> str:
+        result = await self.client.upload_media(page_id, access_token, item.media_url,
+                                                item.media_type, is_carousel_item=True)
+        if not result.get('id'):
+            raise MetaAPIError(f"Carousel item {item.media_url} returned no container id")
+        return result['id']
+
+    async def _create_children(self, page_id: str, access_token: str,
+                               items: List[CarouselItem]) -> List[str]:
+        """Create every child container concurrently, in slide order"""
+        # Uploads run on executor threads and cannot be cancelled once sent,
+        # so every one is awaited and each created container accounted for
+        results = await asyncio.gather(
+            *(self._create_child(page_id, access_token, item) for item in items),
+            return_exceptions=True
+        )
+
+        failed = [r for r in results if isinstance(r, BaseException)]
+        if not failed:
+            return results
+
+        created = [r for r in results if not isinstance(r, BaseException)]
+        raise CarouselPublishError(f"Carousel item upload failed for {page_id}: "
+                                   f"{failed[0]}", created)
+
+    async def _wait_ready(self, page_id: str, access_token: str, children: List[str]):
+        poller = self._poller()
+        for container_id in children:
+            poller.track(container_id, page_id, access_token, auto_publish=False)
+        events = await poller.run_until_complete()
+
+        not_ready = [e for e in events if e.type != PollerEventType.READY]
+        if not_ready:
+            raise CarouselPublishError(
+                f"{len(not_ready)} carousel item(s) for {page_id} did not finish processing: "
+                f"{not_ready[0].type.value} {not_ready[0].data}", children
+            )
+
+    async def publish(self, page_id: str, access_token: str, items: List[CarouselItem],
+                      caption: str = None) -> CarouselResult:
+        """Upload the slides, create the carousel container and publish it"""
+        if not MIN_CAROUSEL_ITEMS <= len(items) <= MAX_CAROUSEL_ITEMS:
+            raise ValueError(f"A carousel needs {MIN_CAROUSEL_ITEMS}-{MAX_CAROUSEL_ITEMS} "
+                             f"items, got {len(items)}")
+
+        children = await self._create_children(page_id, access_token, items)
+        await self._wait_ready(page_id, access_token, children)
+
+        try:
+            parent = await self.client.upload_media(page_id, access_token, '',
+                                                    ContentType.CAROUSEL, caption,
+                                                    children=children)
+        except MetaAPIError as e:
+            raise CarouselPublishError(f"Carousel container failed for {page_id}: {e}", children)
+        container_id = parent.get('id')
+        if not container_id:
+            raise CarouselPublishError(f"Carousel container for {page_id} returned no id", children)
+
+        poller = self._poller()
+        poller.track(container_id, page_id, access_token, auto_publish=True)
+        event = (await poller.run_until_complete())[-1]
+        if event.type != PollerEventType.PUBLISHED:
+            raise CarouselPublishError(
+                f"Carousel {container_id} for {page_id} not published: "
+                f"{event.type.value} {event.data}", children + [container_id]
+            )
+
+        self.logger.info(f"Published carousel of {len(children)} items for {page_id}")
+        return CarouselResult(page_id=page_id, media_id=event.data.get('media_id'),
+                              container_id=container_id, children=children)
+
+    async def publish_content_item(self, page_id: str, access_token: str,
+                                   content: Dict) -> CarouselResult:
+        """
+        Publish an EDUCATIONAL_CAROUSEL item from ContentIntelligence once its
+        slides have been rendered (each slide needs an image_url or video_url).
+        """
+        items = []
+        for slide in content.get('slides', []):
+            if slide.get('video_url'):
+                items.append(CarouselItem(slide['video_url'], ContentType.VIDEO))
+            elif slide.get('image_url'):
+                items.append(CarouselItem(slide['image_url'], ContentType.IMAGE))
+            else:
+                raise ValueError(f"Slide {slide.get('title')!r} has not been rendered to media")
+
+        caption = content.get('caption') or content.get('call_to_action')
+        return await self.publish(page_id, access_token, items, caption)
+
+    async def publish_many(self, carousels: List[Dict]) -> List[Dict]:
+        """
+        Publish several carousels concurrently.
+        Each entry holds publish keyword arguments; results keep input order.
+        """
+        results = await asyncio.gather(*(self.publish(**c) for c in carousels),
+                                       return_exceptions=True)
+        report = []
+        for carousel, result in zip(carousels, results):
+            if isinstance(result, CarouselPublishError):
+                self.logger.error(f"Carousel failed for {carousel.get('page_id')}: {result}; "
+                                  f"orphaned containers: {result.orphaned_containers}")
+                report.append({"page_id": carousel.get('page_id'), "status": "failed",
+                               "error": str(result), "orphaned": result.orphaned_containers})
+            elif isinstance(result, Exception):
+                report.append({"page_id": carousel.get('page_id'), "status": "failed",
+                               "error": str(result)})
+            else:
+                report.append({"page_id": carousel.get('page_id'), "status": "published",
+                               "media_id": result.media_id})
+        return report
+
+    def publish_sync(self, page_id: str, access_token: str, items: List[CarouselItem],
+                     caption: str = None) -> CarouselResult:
+        """Blocking entry point for scripts that are not async yet"""
+        return asyncio.run(self.publish(page_id, access_token, items, caption))
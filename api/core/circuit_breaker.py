@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Circuit Breakers
+Fail fast on endpoint families and pages whose upstream is degraded
+instead of spending a full timeout on every call
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Iterable, Optional
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+class BreakerState(Enum):
+    """Circuit breaker states (values are the exported gauge)"""
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+@dataclass
+class BreakerConfig:
+    """When a breaker trips and how long it stays open"""
+    window_size: int = 20              # most recent calls considered
+    min_calls: int = 5                 # no verdict on fewer calls
+    failure_rate: float = 0.5          # trip at >= 50% failures...
+    slow_call_seconds: float = 10.0
+    slow_call_rate: float = 0.5        # ...or >= 50% slow calls
+    open_seconds: float = 30.0         # wait before probing again
+    half_open_probes: int = 1          # successful probes needed to close
+
+class CircuitBreaker:
+    """
+    Rolling-window breaker for one key.
+    CLOSED counts outcomes of the last `window_size` calls and opens once
+    the failure or slow-call rate crosses its threshold. OPEN rejects calls
+    for `open_seconds`, then HALF_OPEN lets probes through one at a time:
+    enough successes close it, any failure opens it again.
+    """
+
+    def __init__(self, name: str, config: BreakerConfig,
+                 metrics: MetricsRegistry, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.config = config
+        self.metrics = metrics
+        self.clock = clock
+        self.state = BreakerState.CLOSED
+        self._calls: deque = deque(maxlen=config.window_size)  # (failed, slow)
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self._export()
+
+    def time_until_allowed(self) -> float:
+        """Seconds until a call would be let through (0.0 = now)"""
+        with self._lock:
+            return self._wait(self.clock())
+
+    def _wait(self, now: float) -> float:
+        if self.state == BreakerState.OPEN:
+            return max(0.0, self._opened_at + self.config.open_seconds - now)
+        if self.state == BreakerState.HALF_OPEN and self._probe_started_at is not None:
+            # A probe is in flight; another may go once it is overdue
+            return max(0.0, self._probe_started_at + self.config.open_seconds - now)
+        return 0.0
+
+    def allow(self) -> float:
+        """Admit a call (returns 0.0) or return the seconds to wait"""
+        with self._lock:
+            now = self.clock()
+            wait = self._wait(now)
+            if wait > 0:
+                self.metrics.inc("circuit_breaker_rejections", breaker=self.name)
+                return wait
+            if self.state == BreakerState.OPEN:
+                self._transition(BreakerState.HALF_OPEN)
+            if self.state == BreakerState.HALF_OPEN:
+                self._probe_started_at = now
+            return 0.0
+
+    def release(self):
+        """Give back an admitted call that was never sent, freeing its probe"""
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                self._probe_started_at = None
+
+    def record(self, failed: bool, latency: float = 0.0):
+        """Report the outcome of an admitted call"""
+        slow = latency >= self.config.slow_call_seconds
+        with self._lock:
+            if self.state == BreakerState.HALF_OPEN:
+                self._probe_started_at = None
+                if failed or slow:
+                    self._open()
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.config.half_open_probes:
+                    self._calls.clear()
+                    self._transition(BreakerState.CLOSED)
+                return
+
+            self._calls.append((failed, slow))
+            if self.state == BreakerState.CLOSED and self._should_trip():
+                self._open()
+
+    def _should_trip(self) -> bool:
+        total = len(self._calls)
+        if total < self.config.min_calls:
+            return False
+        failures = sum(1 for failed, _ in self._calls if failed)
+        slow = sum(1 for _, is_slow in self._calls if is_slow)
+        return (failures / total >= self.config.failure_rate
+                or slow / total >= self.config.slow_call_rate)
+
+    def _open(self):
+        self._opened_at = self.clock()
+        self._probe_successes = 0
+        self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState):
+        if state == self.state:
+            return
+        self.logger.warning(f"Circuit {self.name}: {self.state.name} -> {state.name}")
+        self.state = state
+        self.metrics.inc("circuit_breaker_transitions", breaker=self.name, state=state.name)
+        self._export()
+
+    def _export(self):
+        self.metrics.gauge("circuit_breaker_state", self.state.value, breaker=self.name)
+
+class CircuitBreakerRegistry:
+    """
+    Breakers created on first use, keyed e.g. "meta:{id}/media" or
+    "meta:page:123". A call is admitted only if all of its breakers admit it.
+    """
+
+    def __init__(self, config: Optional[BreakerConfig] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.config = config or BreakerConfig()
+        self.metrics = metrics or get_metrics_registry()
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self.breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(name, self.config, self.metrics, self.clock)
+                self.breakers[name] = breaker
+            return breaker
+
+    def allow(self, names: Iterable[str]) -> float:
+        """0.0 if every breaker admits the call, else the longest wait"""
+        breakers = [self.get(name) for name in names]
+        # Check first so a refusal does not leave a half-open probe claimed
+        wait = max((b.time_until_allowed() for b in breakers), default=0.0)
+        if wait > 0:
+            for b in breakers:
+                if b.time_until_allowed() > 0:
+                    self.metrics.inc("circuit_breaker_rejections", breaker=b.name)
+            return wait
+        return max((b.allow() for b in breakers), default=0.0)
+
+    def release(self, names: Iterable[str]):
+        """Undo allow() for a call refused before it was sent (e.g. rate limited)"""
+        for name in names:
+            self.get(name).release()
+
+    def record(self, names: Iterable[str], failed: bool, latency: float = 0.0):
+        for name in names:
+            self.get(name).record(failed, latency)
+
+    def states(self) -> Dict[str, str]:
+        """Current state of every breaker"""
+        with self._lock:
+            return {name: b.state.name for name, b in self.breakers.items()}
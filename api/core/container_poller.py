@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Media Container Poller
+Tracks many pending Reels/video containers and publishes each one as
+soon as Meta finishes processing it
+"""
+
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from .meta_client_v24 import MetaAPIError, RateLimitExceeded, BatchRequest
+from .async_meta import AsyncMetaGraphClient
+
+class PollerEventType(Enum):
+    """Lifecycle events emitted by the poller"""
+    READY = "ready"                    # FINISHED, auto-publish disabled
+    PUBLISHED = "published"
+    PUBLISH_FAILED = "publish_failed"
+    ERROR = "error"                    # Meta reported ERROR
+    EXPIRED = "expired"                # Meta reported EXPIRED or we timed out
+
+@dataclass
+class PollerEvent:
+    """Outcome for one container"""
+    type: PollerEventType
+    container_id: str
+    page_id: str
+    data: Dict = field(default_factory=dict)
+
+@dataclass
+class _PendingContainer:
+    container_id: str
+    page_id: str
+    access_token: str
+    auto_publish: bool
+    deadline: float
+    delay: float
+    next_poll_at: float
+    polls: int = 0
+    check_errors: int = 0
+
+class ContainerPoller:
+    """
+    Multiplexed status poller for media containers.
+    Every due container is checked in one Graph batch call per round;
+    each container backs off exponentially (with jitter) while it is
+    IN_PROGRESS, and FINISHED containers are published concurrently
+    while polling carries on for the rest. A round only includes as many
+    checks per page as that page's bucket can pay for right now; the
+    others wait for their page's next slot.
+    """
+
+    def __init__(self, client: AsyncMetaGraphClient,
+                 initial_delay: float = 5.0, max_delay: float = 60.0,
+                 backoff: float = 2.0, jitter: float = 0.25,
+                 timeout: float = 900.0, max_check_errors: int = 5,
+                 on_event: Optional[Callable[[PollerEvent], None]] = None):
+        self.client = client
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+        self.max_check_errors = max_check_errors
+        self.on_event = on_event
+        self.pending: Dict[str, _PendingContainer] = {}
+        self.events: List[PollerEvent] = []
+        self.logger = logging.getLogger(__name__)
+
+    def track(self, container_id: str, page_id: str, access_token: str,
+              auto_publish: bool = True):
+        """Start watching a container created by upload_reel/upload_media"""
+        now = time.monotonic()
+        self.pending[container_id] = _PendingContainer(
+            container_id=container_id,
+            page_id=page_id,
+            access_token=access_token,
+            auto_publish=auto_publish,
+            deadline=now + self.timeout,
+            delay=self.initial_delay,
+            next_poll_at=now + self._jittered(self.initial_delay)
+        )
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _emit(self, event: PollerEvent):
+        self.events.append(event)
+        self.logger.info(f"Container {event.container_id} ({event.page_id}): {event.type.value}")
+        if self.on_event:
+            self.on_event(event)
+
+    def _reschedule(self, job: _PendingContainer, now: float):
+        job.delay = min(self.max_delay, job.delay * self.backoff)
+        job.next_poll_at = now + self._jittered(job.delay)
+
+    async def _publish(self, job: _PendingContainer):
+        try:
+            result = await self.client.publish_container(
+                job.page_id, job.access_token, job.container_id
+            )
+            self._emit(PollerEvent(PollerEventType.PUBLISHED, job.container_id,
+                                   job.page_id, {"media_id": result.get('id')}))
+        except MetaAPIError as e:
+            self._emit(PollerEvent(PollerEventType.PUBLISH_FAILED, job.container_id,
+                                   job.page_id, {"error": str(e)}))
+
+    def _handle_status(self, job: _PendingContainer, result, now: float) -> Optional[str]:
+        """Apply one status result; returns the terminal status or None"""
+        if isinstance(result, RateLimitExceeded):
+            # Nothing was asked of Meta; try again once the quota allows
+            job.next_poll_at = min(job.deadline, now + result.retry_after)
+            return None
+        job.polls += 1
+        if isinstance(result, MetaAPIError):
+            job.check_errors += 1
+            if job.check_errors >= self.max_check_errors:
+                self._emit(PollerEvent(PollerEventType.ERROR, job.container_id,
+                                       job.page_id, {"error": str(result)}))
+                return "ERROR"
+            self._reschedule(job, now)
+            return None
+
+        status_code = result.get('status_code', 'UNKNOWN')
+        if status_code in ('FINISHED', 'PUBLISHED'):
+            return status_code
+        if status_code == 'ERROR':
+            self._emit(PollerEvent(PollerEventType.ERROR, job.container_id,
+                                   job.page_id, {"status": result.get('status')}))
+            return status_code
+        if status_code == 'EXPIRED':
+            self._emit(PollerEvent(PollerEventType.EXPIRED, job.container_id,
+                                   job.page_id, {"status": result.get('status')}))
+            return status_code
+
+        self._reschedule(job, now)
+        return None
+
+    def _admit(self, due: List[_PendingContainer], now: float) -> List[_PendingContainer]:
+        """
+        Due containers whose page can pay for a check now, most overdue
+        first; pages with no free slot are moved to their next one.
+        """
+        by_page: Dict[str, List[_PendingContainer]] = {}
+        for job in sorted(due, key=lambda j: j.next_poll_at):
+            by_page.setdefault(job.page_id, []).append(job)
+
+        admitted = []
+        for page_id, jobs in by_page.items():
+            count = len(jobs)
+            while count and self.client.time_until_next_slot(page_id, count) > 0:
+                count -= 1
+            admitted.extend(jobs[:count])
+            if count == 0:
+                wait = self.client.time_until_next_slot(page_id)
+                for job in jobs:
+                    job.next_poll_at = min(job.deadline, now + wait)
+            # Otherwise the rest stay due and get the slot after this round's
+        return admitted
+
+    async def _poll_round(self, due: List[_PendingContainer], publishes: List[asyncio.Task]):
+        due = self._admit(due, time.monotonic())
+        if not due:
+            return
+        try:
+            results = await self.client.batch([
+                # page_id charges the per-page bucket like any other page call
+                BatchRequest('GET', job.container_id, job.access_token,
+                             page_id=job.page_id, params={'fields': 'status_code,status'})
+                for job in due
+            ])
+        except MetaAPIError as e:
+            # The whole round failed; count it against every container
+            # (a rate-limit refusal only reschedules them)
+            results = [e] * len(due)
+
+        now = time.monotonic()
+        for job, result in zip(due, results):
+            status = self._handle_status(job, result, now)
+            if status is None:
+                continue
+
+            del self.pending[job.container_id]
+            if status == 'PUBLISHED':
+                self._emit(PollerEvent(PollerEventType.PUBLISHED, job.container_id,
+                                       job.page_id, {"already_published": True}))
+            elif status == 'FINISHED' and job.auto_publish:
+                publishes.append(asyncio.create_task(self._publish(job)))
+            elif status == 'FINISHED':
+                self._emit(PollerEvent(PollerEventType.READY, job.container_id, job.page_id))
+
+    def _expire_overdue(self, now: float):
+        for job in [j for j in self.pending.values() if now >= j.deadline]:
+            del self.pending[job.container_id]
+            self._emit(PollerEvent(PollerEventType.EXPIRED, job.container_id, job.page_id,
+                                   {"reason": f"not finished after {self.timeout:.0f}s",
+                                    "polls": job.polls}))
+
+    async def run_until_complete(self) -> List[PollerEvent]:
+        """Poll until every tracked container reached a terminal event"""
+        publishes: List[asyncio.Task] = []
+
+        while self.pending:
+            now = time.monotonic()
+            self._expire_overdue(now)
+            if not self.pending:
+                break
+
+            next_due = min(job.next_poll_at for job in self.pending.values())
+            if next_due > now:
+                await asyncio.sleep(next_due - now)
+                continue
+
+            due = [job for job in self.pending.values() if job.next_poll_at <= now]
+            await self._poll_round(due, publishes)
+
+        if publishes:
+            await asyncio.gather(*publishes)
+        return self.events
+
+    def run_sync(self) -> List[PollerEvent]:
+        """Blocking entry point for scripts that are not async yet"""
+        return asyncio.run(self.run_until_complete())
@@ -11,6 +11,7 @@ import requests
 from typing import Dict, List, Optional
 from datetime import datetime
 from .meta_client_v24 import MetaGraphClient, MetaAppConfig, MetaAPIError
+from .transport import HTTPTransport
 
 class InstitutionalMetaClient(MetaGraphClient):
     """
@@ -18,8 +19,8 @@ class InstitutionalMetaClient(MetaGraphClient):
     Implements Reels upload, Story automation, and long-lived token rotation.
     """
     
-    def __init__(self, config: MetaAppConfig):
-        super().__init__(config)
+    def __init__(self, config: MetaAppConfig, transport: Optional[HTTPTransport] = None):
+        super().__init__(config, transport)
         self.logger = logging.getLogger(__name__)
 
     def upload_reel(self, page_id: str, access_token: str, 
@@ -42,6 +43,21 @@ class InstitutionalMetaClient(MetaGraphClient):
         self.logger.info(f"Initiating Reel upload for {page_id}")
         return self._make_request('POST', endpoint, access_token, page_id, params=params)
 
+    def upload_reel_from_file(self, page_id: str, access_token: str,
+                             file_path: str, caption: str,
+                             thumb_url: Optional[str] = None) -> Dict:
+        """
+        Upload a local Reel through the resumable upload endpoint
+        (no public video_url needed)
+        """
+        from .resumable_upload import ResumableUploader
+        
+        self.logger.info(f"Initiating resumable Reel upload for {page_id}")
+        container_id = ResumableUploader(self).upload_file(
+            page_id, access_token, file_path, caption, thumb_url=thumb_url
+        )
+        return {'id': container_id}
+
     def upload_story(self, page_id: str, access_token: str, 
                     image_url: str) -> Dict:
         """
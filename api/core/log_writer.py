@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Log Writer
+Buffered JSON-lines writer with daily rotation for activity and audit logs
+"""
+
+import os
+import json
+import atexit
+import threading
+import logging
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple
+
+class Durability(Enum):
+    """How far a line gets before write() returns"""
+    FLUSH = "flush"        # handed to the OS on every write; survives a process crash
+    BATCHED = "batched"    # queued for the writer thread, fsynced per batch; survives power loss per batch
+
+class JsonLinesWriter:
+    """
+    One JSON object per line in <directory>/<prefix>_<YYYYMMDD>.json.
+    The file handle stays open until the day changes. In BATCHED mode
+    write() only queues the line: a daemon writer thread does every write
+    and fsync, woken when max_lines or max_bytes is reached and at least
+    every flush_interval otherwise, so callers never wait on the disk.
+    Write errors are logged, never raised, so logging cannot break a sync.
+    """
+
+    def __init__(self, directory: str, prefix: str,
+                 durability: Durability = Durability.FLUSH, max_lines: int = 500,
+                 max_bytes: int = 1 << 20, flush_interval: float = 2.0,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.directory = directory
+        self.prefix = prefix
+        self.durability = durability
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()       # guards the queue
+        self._io_lock = threading.Lock()    # guards the file; one batch at a time, in order
+        self._buffer: List[Tuple[str, str]] = []    # (day, line)
+        self._buffered_bytes = 0
+        self._day: Optional[str] = None
+        self._file = None
+        self._closed = False
+
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        if durability == Durability.BATCHED:
+            self._thread = threading.Thread(target=self._run, name=f"log-{prefix}", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def path_for(self, day: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}_{day}.json")
+
+    def write(self, entry: Dict):
+        """Append one entry"""
+        line = json.dumps(entry, default=str) + "\n"
+        day = self.clock().strftime('%Y%m%d')
+        with self._lock:
+            if self._closed:
+                self.logger.error(f"Log writer {self.prefix} is closed; dropped entry")
+                return
+            self._buffer.append((day, line))
+            self._buffered_bytes += len(line)
+            full = (len(self._buffer) >= self.max_lines
+                    or self._buffered_bytes >= self.max_bytes)
+        if self.durability == Durability.FLUSH:
+            self.flush()
+        elif full:
+            self._wake.set()
+
+    def flush(self):
+        """Write out whatever is queued"""
+        with self._io_lock:
+            with self._lock:
+                batch, self._buffer, self._buffered_bytes = self._buffer, [], 0
+            self._write_batch(batch)
+
+    def close(self):
+        """Flush and release the file handle"""
+        with self._lock:
+            self._closed = True
+        self._stop.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+        with self._io_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    # ==================== INTERNALS ====================
+
+    def _handle(self, day: str):
+        """File for a day, rotating the open handle when the day changes"""
+        if day != self._day or self._file is None:
+            if self._file:
+                self._file.close()
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path_for(day), 'a')
+            self._day = day
+        return self._file
+
+    def _write_batch(self, batch: List[Tuple[str, str]]):
+        """Write and sync one batch; caller holds _io_lock"""
+        if not batch:
+            return
+        try:
+            # Entries are in time order; a batch spanning midnight is split
+            start = 0
+            for i in range(1, len(batch) + 1):
+                if i == len(batch) or batch[i][0] != batch[start][0]:
+                    handle = self._handle(batch[start][0])
+                    handle.write("".join(line for _, line in batch[start:i]))
+                    handle.flush()
+                    if self.durability == Durability.BATCHED:
+                        os.fsync(handle.fileno())
+                    start = i
+        except OSError as e:
+            self.logger.error(f"Failed to write {len(batch)} {self.prefix} log line(s): {e}")
+            if self._file:
+                self._file.close()
+            self._file = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+# Process-wide writers, one per log file family
+_writers: Dict[Tuple[str, str], JsonLinesWriter] = {}
+_writers_lock = threading.Lock()
+
+def get_log_writer(directory: str, prefix: str, **kwargs) -> JsonLinesWriter:
+    """Get or create the shared writer for <directory>/<prefix>_*.json"""
+    key = (os.path.abspath(directory), prefix)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = JsonLinesWriter(key[0], prefix, **kwargs)
+            _writers[key] = writer
+        return writer
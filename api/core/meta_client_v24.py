@@ -6,23 +6,58 @@ Fully compliant with Meta Platform Terms and Security Requirements
 """
 
 import os
+import copy
 import json
 import hmac
 import hashlib
 import base64
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union, Callable, Iterator
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import logging
 from dataclasses import dataclass, asdict
 from enum import Enum
 import time
+from urllib.parse import urlencode, urlparse, parse_qs
+from .rate_limiter import TokenBucketLimiter, BucketSpec
+from .usage_model import MetaUsageModel
+from .response_cache import ResponseCache
+from .transport import HTTPTransport, HostPoolConfig, get_shared_transport, endpoint_template
+from .circuit_breaker import CircuitBreakerRegistry
+from .single_flight import SingleFlight
 
 class MetaAPIError(Exception):
     """Custom exception for Meta API errors"""
-    pass
+    
+    def __init__(self, message: str = "", code: Any = None):
+        super().__init__(message)
+        self.code = code
+
+class RateLimitExceeded(MetaAPIError):
+    """Raised instead of sleeping when no rate-limit slot is free"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class CircuitOpenError(MetaAPIError):
+    """Raised without a network call while an endpoint or page breaker is open"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+# Graph API accepts at most 50 sub-requests per batch call
+MAX_BATCH_SIZE = 50
+
+@dataclass
+class BatchRequest:
+    """One sub-request of a Graph API batch call"""
+    method: str
+    endpoint: str
+    access_token: str
+    page_id: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
 
 class ContentType(Enum):
     """Instagram content types supported by API v24.0"""
@@ -42,6 +77,10 @@ class MetaAppConfig:
     api_version: str = "v24.0"
     ip_whitelist: List[str] = None
     require_app_secret_proof: bool = True
+    max_concurrency: int = 64  # Graph connection pool size / async in-flight calls
+    rate_limit_ledger: Optional[str] = None  # SQLite file shared by runners
+    cache_enabled: bool = True
+    cache_path: Optional[str] = None  # Optional on-disk tier for GET responses
     
     def __post_init__(self):
         if self.ip_whitelist is None:
@@ -53,41 +92,47 @@ class MetaGraphClient:
     Includes all security requirements for App ID 689310950781431
     """
     
-    def __init__(self, config: MetaAppConfig):
+    def __init__(self, config: MetaAppConfig, transport: Optional[HTTPTransport] = None):
         self.config = config
         self.base_url = f"https://graph.facebook.com/{config.api_version}"
-        self.session = self._create_secure_session()
+        self.transport = transport or get_shared_transport()
+        self._register_host_pool()
         self.logger = logging.getLogger(__name__)
         
-        # Rate limiting tracking
-        self.calls_made = 0
-        self.calls_reset_at = datetime.now() + timedelta(hours=1)
-        self.page_calls = {}
-        
-    def _create_secure_session(self) -> requests.Session:
-        """Create secure HTTP session with retry logic"""
-        session = requests.Session()
-        
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST", "DELETE"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("https://", adapter)
-        session.mount("http://", adapter)
-        
-        # Set security headers
-        session.headers.update({
+        # Security headers sent with every Graph call
+        self.headers = {
             "User-Agent": "Auto-Notion/2.0.0 (Meta-Graph-API-Client)",
             "Accept": "application/json",
             "Accept-Encoding": "gzip, deflate"
-        })
+        }
         
-        return session
+        # Baseline rate limiting: app 200/hour and page 50/hour, with a 10%
+        # buffer. Pass a ledger path to share the budget between runners.
+        self.rate_limiter = TokenBucketLimiter({
+            "app": BucketSpec.per_hour(180),
+            "page": BucketSpec.per_hour(45)
+        }, ledger_path=config.rate_limit_ledger)
+        # Live usage from Meta's headers tunes the bucket refill rates
+        self.usage_model = MetaUsageModel(config.app_id)
+        
+        # GET response cache (page tokens, media lists, insights)
+        self.cache = ResponseCache(sqlite_path=config.cache_path) if config.cache_enabled else None
+        
+        # Breakers per endpoint family and per page: fail fast while Graph is degraded
+        self.breakers = CircuitBreakerRegistry()
+        
+        # Identical GETs in flight at the same time share one request
+        self.single_flight = SingleFlight()
+        
+        # Called with (access_token, error) when Meta rejects a token with
+        # code 190; TokenManager hooks in here to stop handing it out
+        self.on_invalid_token: Optional[Callable[[str, str], None]] = None
+        
+    def _register_host_pool(self):
+        """Size the shared transport's Graph pool for this client's concurrency"""
+        pool = HostPoolConfig(pool_connections=1, pool_maxsize=self.config.max_concurrency)
+        self.transport.configure_host("https://graph.facebook.com", pool)
+        self.transport.configure_host("https://rupload.facebook.com", pool)
     
     def _generate_appsecret_proof(self, access_token: str) -> str:
         """Generate appsecret_proof for API calls"""
@@ -101,45 +146,65 @@ class MetaGraphClient:
         )
         return h.hexdigest()
     
-    def _check_rate_limit(self, page_id: str = None) -> bool:
-        """Check and enforce rate limits"""
-        now = datetime.now()
-        
-        # Reset hourly counter
-        if now > self.calls_reset_at:
-            self.calls_made = 0
-            self.calls_reset_at = now + timedelta(hours=1)
-            self.page_calls = {}
-        
-        # App-level rate limit (200 calls/hour)
-        if self.calls_made >= 180:  # Leave 10% buffer
-            wait_time = (self.calls_reset_at - now).seconds
-            self.logger.warning(f"App rate limit approaching. Waiting {wait_time} seconds")
-            time.sleep(wait_time)
-            return self._check_rate_limit(page_id)
-        
-        # Page-level rate limit (50 calls/hour per page)
+    def _rate_limit_keys(self, page_id: str = None) -> List[str]:
+        """Token buckets charged for a call"""
+        keys = [f"app:{self.config.app_id}"]
         if page_id:
-            page_calls = self.page_calls.get(page_id, 0)
-            if page_calls >= 45:  # Leave 10% buffer
-                self.logger.warning(f"Page {page_id} rate limit approaching")
-                return False
-        
+            keys.append(f"page:{page_id}")
+        return keys
+    
+    def time_until_next_slot(self, page_id: str = None, calls: int = 1) -> float:
+        """Seconds until `calls` calls for this page would be admitted (0.0 = now)"""
+        return self.rate_limiter.time_until_available(self._rate_limit_keys(page_id),
+                                                      tokens=calls)
+    
+    def _check_rate_limit(self, page_id: str = None) -> bool:
+        """Take a slot from the app and page buckets without blocking"""
+        wait = self.rate_limiter.try_acquire(self._rate_limit_keys(page_id))
+        if wait > 0:
+            scope = f"page {page_id}" if page_id else "app"
+            self.logger.warning(f"Rate limit reached for {scope}. Next slot in {wait:.0f} seconds")
+            raise RateLimitExceeded(f"Rate limit exceeded for {scope}", retry_after=wait)
         return True
     
-    def _make_request(self, method: str, endpoint: str, access_token: str, 
-                     page_id: str = None, **kwargs) -> Dict:
-        """Make secure API request with error handling"""
-        
-        # Check rate limits
-        if not self._check_rate_limit(page_id):
-            raise MetaAPIError("Rate limit exceeded for page")
-        
-        url = f"{self.base_url}/{endpoint}"
-        params = kwargs.get('params', {})
-        
-        # Add authentication parameters
-        params['access_token'] = access_token
+    def _breaker_keys(self, endpoint: str, page_id: str = None) -> List[str]:
+        """Circuit breakers guarding a call, e.g. meta:{id}/media and meta:page:123"""
+        family = endpoint_template(f"/{endpoint}").strip('/') or 'batch'
+        keys = [f"meta:{family}"]
+        if page_id:
+            keys.append(f"meta:page:{page_id}")
+        return keys
+    
+    def _check_circuit(self, endpoint: str, page_id: str = None):
+        """Refuse the call while one of its breakers is open"""
+        wait = self.breakers.allow(self._breaker_keys(endpoint, page_id))
+        if wait > 0:
+            scope = f"{endpoint or 'batch'}" + (f" (page {page_id})" if page_id else "")
+            raise CircuitOpenError(f"Circuit open for {scope}; retry in {wait:.0f} seconds",
+                                   retry_after=wait)
+    
+    def _admit(self, endpoint: str, page_id: str = None):
+        """
+        Fail fast on a degraded upstream, then check rate limits. A call
+        refused by the limiter gives back any half-open probe it claimed.
+        """
+        self._check_circuit(endpoint, page_id)
+        try:
+            self._check_rate_limit(page_id)
+        except RateLimitExceeded:
+            self.breakers.release(self._breaker_keys(endpoint, page_id))
+            raise
+    
+    def _apply_usage_headers(self, headers, page_id: str = None):
+        """Feed Meta's usage headers into the usage model and the limiter"""
+        for scope, snapshot in self.usage_model.observe(headers, page_id).items():
+            self.rate_limiter.set_rate_scale(scope, self.usage_model.rate_scale(snapshot))
+            if snapshot.regain_seconds > 0:
+                self.rate_limiter.penalize([scope], snapshot.regain_seconds)
+    
+    def _auth_params(self, endpoint: str, access_token: str) -> Dict[str, str]:
+        """Authentication parameters for a call with this token"""
+        params = {'access_token': access_token}
         
         # Add appsecret_proof if required
         if self.config.require_app_secret_proof:
@@ -151,30 +216,141 @@ class MetaGraphClient:
         if endpoint.startswith(f"{self.config.app_id}"):
             params['client_token'] = self.config.client_token
         
+        return params
+    
+    def _map_error(self, error_code: Any, error_msg: str) -> MetaAPIError:
+        """Translate a Graph error code into a MetaAPIError"""
+        if error_code == 190:  # Invalid OAuth access token
+            return MetaAPIError("Access token expired or invalid", code=error_code)
+        elif error_code == 4:   # Application request limit reached
+            return MetaAPIError("Application rate limit reached", code=error_code)
+        elif error_code == 32:  # Page request limit reached
+            return MetaAPIError("Page rate limit reached", code=error_code)
+        else:
+            return MetaAPIError(f"API Error {error_code}: {error_msg}", code=error_code)
+    
+    def _report_invalid_token(self, access_token: str, error: MetaAPIError):
+        """Tell the token owner that Meta rejected this token"""
+        if error.code != 190 or self.on_invalid_token is None:
+            return
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=kwargs.get('json'),
-                files=kwargs.get('files'),
-                timeout=30
-            )
+            self.on_invalid_token(access_token, str(error))
+        except Exception as e:
+            self.logger.error(f"Invalid-token callback failed: {e}")
+    
+    def _make_request(self, method: str, endpoint: str, access_token: str, 
+                     page_id: str = None, **kwargs) -> Dict:
+        """
+        Make secure API request with error handling.
+        Concurrent identical GETs are coalesced into one call. GETs tagged
+        with a cache_family are served from the response cache while fresh
+        and revalidated with If-None-Match once stale.
+        """
+        cache_family = kwargs.pop('cache_family', None)
+        if method == 'GET':
+            key = ResponseCache.make_key(endpoint, kwargs.get('params', {}), access_token)
+            return self.single_flight.do(key, lambda: self._get(
+                endpoint, access_token, page_id, cache_family, **kwargs
+            ))
+        
+        return self._uncached(method, endpoint, access_token, page_id, **kwargs)
+    
+    def _get(self, endpoint: str, access_token: str, page_id: str,
+            cache_family: Optional[str], **kwargs) -> Dict:
+        """GET through the response cache when the family is cacheable"""
+        if self.cache and self.cache.ttl_for(cache_family):
+            return self._cached_get(endpoint, access_token, page_id, cache_family, **kwargs)
+        return self._uncached('GET', endpoint, access_token, page_id, **kwargs)
+    
+    def _uncached(self, method: str, endpoint: str, access_token: str,
+                 page_id: str = None, **kwargs) -> Dict:
+        """Rate-limited request straight to Graph"""
+        self._admit(endpoint, page_id)
+        
+        return self._send(method, endpoint, access_token, page_id, **kwargs)
+    
+    def _cached_get(self, endpoint: str, access_token: str, page_id: str,
+                   cache_family: str, **kwargs) -> Dict:
+        """GET through the response cache"""
+        ttl = self.cache.ttl_for(cache_family)
+        key = self.cache.make_key(endpoint, kwargs.get('params', {}), access_token)
+        entry, fresh = self.cache.lookup(key)
+        # Callers get their own copy; mutating it must not touch the cache
+        if fresh:
+            return copy.deepcopy(entry.body)
+        
+        # Stale or missing: this one does spend quota
+        self._admit(endpoint, page_id)
+        
+        if entry is not None and entry.etag:
+            kwargs['headers'] = {'If-None-Match': entry.etag}
+        response = self._send_response('GET', endpoint, access_token, page_id, **kwargs)
+        
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated(key, entry, ttl)
+            return copy.deepcopy(entry.body)
+        
+        body = self._decode(response)
+        self.cache.store(key, body, response.headers.get('ETag'), ttl)
+        return copy.deepcopy(body)
+    
+    def _decode(self, response: requests.Response) -> Any:
+        """JSON body of a successful response"""
+        try:
+            return response.json()
+        except ValueError as e:
+            self.logger.error(f"Invalid JSON from Meta: {e}")
+            raise MetaAPIError(f"Invalid JSON response: {e}")
+    
+    def _send(self, method: str, endpoint: str, access_token: str,
+             page_id: str = None, **kwargs) -> Any:
+        """Send an already rate-limited request and decode the body"""
+        return self._decode(self._send_response(method, endpoint, access_token,
+                                                page_id, **kwargs))
+    
+    def _send_response(self, method: str, endpoint: str, access_token: str,
+                      page_id: str = None, **kwargs) -> requests.Response:
+        """Send an already rate-limited request and map errors"""
+        url = f"{self.base_url}/{endpoint}"
+        params = kwargs.get('params', {})
+        
+        # Add authentication parameters
+        params.update(self._auth_params(endpoint, access_token))
+        
+        breaker_keys = self._breaker_keys(endpoint, page_id)
+        start = time.monotonic()
+        try:
+            try:
+                response = self.transport.request(
+                    method,
+                    url,
+                    client="meta",
+                    params=params,
+                    data=kwargs.get('data'),
+                    json=kwargs.get('json'),
+                    files=kwargs.get('files'),
+                    headers={**self.headers, **kwargs.get('headers', {})},
+                    timeout=30
+                )
+            except requests.exceptions.RequestException:
+                self.breakers.record(breaker_keys, failed=True, latency=time.monotonic() - start)
+                raise
+            # Only server errors and slow answers count against the breakers
+            self.breakers.record(breaker_keys, failed=response.status_code >= 500,
+                                 latency=time.monotonic() - start)
             
-            # Update rate limit counters
-            self.calls_made += 1
-            if page_id:
-                self.page_calls[page_id] = self.page_calls.get(page_id, 0) + 1
+            # Adapt throttling to the quota Meta actually reports
+            self._apply_usage_headers(response.headers, page_id)
             
             # Handle Meta API errors
             if response.status_code == 429:
                 retry_after = int(response.headers.get('Retry-After', 3600))
-                self.logger.warning(f"Rate limited. Retrying after {retry_after} seconds")
-                time.sleep(retry_after)
-                return self._make_request(method, endpoint, access_token, page_id, **kwargs)
+                self.logger.warning(f"Rate limited. Next slot in {retry_after} seconds")
+                self.rate_limiter.penalize(self._rate_limit_keys(page_id), retry_after)
+                raise RateLimitExceeded("Rate limited by Meta", retry_after=retry_after)
             
             response.raise_for_status()
-            return response.json()
+            return response
             
         except requests.exceptions.HTTPError as e:
             error_data = {}
@@ -187,21 +363,140 @@ class MetaGraphClient:
             error_code = error_data.get('code', 'UNKNOWN')
             
             self.logger.error(f"Meta API Error {error_code}: {error_msg}")
-            
-            # Handle specific error codes
-            if error_code == 190:  # Invalid OAuth access token
-                raise MetaAPIError("Access token expired or invalid")
-            elif error_code == 4:   # Application request limit reached
-                raise MetaAPIError("Application rate limit reached")
-            elif error_code == 32:  # Page request limit reached
-                raise MetaAPIError("Page rate limit reached")
-            else:
-                raise MetaAPIError(f"API Error {error_code}: {error_msg}")
+            error = self._map_error(error_code, error_msg)
+            self._report_invalid_token(access_token, error)
+            raise error
                 
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Request failed: {e}")
             raise MetaAPIError(f"Network error: {e}")
     
+    # ==================== BATCH REQUESTS ====================
+    
+    def batch(self, calls: List[BatchRequest]) -> List[Union[Dict, MetaAPIError]]:
+        """
+        Send sub-requests through Graph batch calls of up to 50.
+        Each sub-request carries its own access token and appsecret_proof,
+        so one batch can span the whole fleet. Returns one entry per request,
+        in order: the decoded body or the MetaAPIError for that call.
+        """
+        results: List[Union[Dict, MetaAPIError]] = []
+        for chunk, costs in self._batch_chunks(calls):
+            try:
+                results.extend(self._send_batch(chunk, costs))
+            except RateLimitExceeded as e:
+                if not results:
+                    raise
+                # Earlier chunks went out; report the rest per call so a
+                # retry does not send those again
+                results.extend([e] * (len(calls) - len(results)))
+                break
+        return results
+    
+    def _batch_chunks(self, calls: List[BatchRequest]
+                      ) -> List[Tuple[List[BatchRequest], Dict[str, float]]]:
+        """
+        Split calls, in order, into batches of up to 50 whose token cost
+        fits every bucket they charge: each sub-request counts against the
+        app and its page, and no page can pay more than its capacity at once.
+        """
+        chunks: List[Tuple[List[BatchRequest], Dict[str, float]]] = []
+        chunk: List[BatchRequest] = []
+        costs: Dict[str, float] = {}
+        for item in calls:
+            keys = self._rate_limit_keys(item.page_id)
+            fits = len(chunk) < MAX_BATCH_SIZE and all(
+                costs.get(key, 0) + 1 <= self.rate_limiter.spec_for(key).capacity
+                for key in keys
+            )
+            if chunk and not fits:
+                chunks.append((chunk, costs))
+                chunk, costs = [], {}
+            chunk.append(item)
+            for key in keys:
+                costs[key] = costs.get(key, 0) + 1
+        if chunk:
+            chunks.append((chunk, costs))
+        return chunks
+    
+    def _send_batch(self, chunk: List[BatchRequest],
+                   costs: Dict[str, float]) -> List[Union[Dict, MetaAPIError]]:
+        """Send one batch call (<= 50 sub-requests) charging `costs`"""
+        self._check_circuit('')
+        
+        wait = self.rate_limiter.try_acquire(costs)
+        if wait > 0:
+            self.breakers.release(self._breaker_keys(''))
+            self.logger.warning(f"Rate limit reached for batch of {len(chunk)}. Next slot in {wait:.0f} seconds")
+            raise RateLimitExceeded(f"Rate limit exceeded for batch of {len(chunk)}", retry_after=wait)
+        
+        operations = []
+        for item in chunk:
+            params = dict(item.params or {})
+            params.update(self._auth_params(item.endpoint, item.access_token))
+            encoded = urlencode(params)
+            operation = {'method': item.method.upper()}
+            if operation['method'] == 'GET':
+                operation['relative_url'] = f"{item.endpoint}?{encoded}"
+            else:
+                operation['relative_url'] = item.endpoint
+                operation['body'] = encoded
+            operations.append(operation)
+        
+        # The outer call is authenticated with the first sub-request's token
+        responses = self._send('POST', '', chunk[0].access_token, data={
+            'batch': json.dumps(operations),
+            'include_headers': 'false'
+        })
+        
+        results = []
+        for item, response in zip(chunk, responses):
+            results.append(self._parse_batch_response(item, response))
+        return results
+    
+    def _parse_batch_response(self, item: BatchRequest,
+                              response: Optional[Dict]) -> Union[Dict, MetaAPIError]:
+        """Split one batch entry into a result or a MetaAPIError"""
+        if response is None:
+            # Meta returns null for sub-requests that did not complete
+            return MetaAPIError(f"Batch request {item.endpoint} did not complete")
+        
+        try:
+            body = json.loads(response.get('body') or '{}')
+        except ValueError:
+            body = {}
+        
+        if response.get('code') == 200:
+            return body
+        
+        error_data = body.get('error', {}) if isinstance(body, dict) else {}
+        error_msg = error_data.get('message', f"HTTP {response.get('code')}")
+        error_code = error_data.get('code', 'UNKNOWN')
+        self.logger.error(f"Meta API Error {error_code} in batch ({item.endpoint}): {error_msg}")
+        error = self._map_error(error_code, error_msg)
+        self._report_invalid_token(item.access_token, error)
+        return error
+    
+    def batch_get_instagram_insights(self, pages: Dict[str, str], metrics: List[str],
+                                     period: str = 'day') -> Dict[str, Union[Dict, MetaAPIError]]:
+        """Insights for many pages ({page_id: access_token}) in batched calls"""
+        calls = [
+            BatchRequest('GET', f"{page_id}/insights", token, page_id,
+                         self._insights_params(metrics, period))
+            for page_id, token in pages.items()
+        ]
+        return dict(zip(pages, self.batch(calls)))
+    
+    def batch_get_instagram_media(self, pages: Dict[str, str],
+                                  fields: List[str] = None) -> Dict[str, Union[Dict, MetaAPIError]]:
+        """Media lists for many pages ({page_id: access_token}) in batched calls"""
+        calls = [
+            BatchRequest('GET', f"{page_id}/media", token, page_id,
+                         self._media_params(fields))
+            for page_id, token in pages.items()
+        ]
+        return dict(zip(pages, self.batch(calls)))
+    
     # ==================== INSTAGRAM BUSINESS API METHODS ====================
     
     def upload_media(self, page_id: str, access_token: str, 
@@ -237,6 +532,11 @@ class MetaGraphClient:
         if media_type in [ContentType.VIDEO, ContentType.REELS] and 'thumb_url' in kwargs:
             params['thumb_url'] = kwargs['thumb_url']
         
+        # Carousel children carry no caption of their own
+        if kwargs.get('is_carousel_item'):
+            params['is_carousel_item'] = 'true'
+            params.pop('caption', None)
+        
         return self._make_request('POST', endpoint, access_token, page_id, params=params)
     
     def publish_media(self, page_id: str, access_token: str, 
@@ -247,35 +547,178 @@ class MetaGraphClient:
         
         return self._make_request('POST', endpoint, access_token, page_id, params=params)
     
+    def _insights_params(self, metrics: List[str], period: str = 'day') -> Dict:
+        """Query for the last 30 days of insights"""
+        # Hour-aligned window so repeated calls share a cache entry
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        return {
+            'metric': ','.join(metrics),
+            'period': period,
+            'since': int((now - timedelta(days=30)).timestamp()),
+            'until': int(now.timestamp())
+        }
+    
     def get_instagram_insights(self, page_id: str, access_token: str,
                               metrics: List[str], period: str = 'day') -> Dict:
         """Get Instagram insights data"""
         endpoint = f"{page_id}/insights"
-        params = {
-            'metric': ','.join(metrics),
-            'period': period,
-            'since': int((datetime.now() - timedelta(days=30)).timestamp()),
-            'until': int(datetime.now().timestamp())
-        }
+        params = self._insights_params(metrics, period)
         
-        return self._make_request('GET', endpoint, access_token, page_id, params=params)
+        return self._make_request('GET', endpoint, access_token, page_id, params=params,
+                                  cache_family='insights')
     
-    def get_instagram_media(self, page_id: str, access_token: str,
-                           fields: List[str] = None) -> Dict:
-        """Get Instagram media objects"""
-        endpoint = f"{page_id}/media"
-        
+    def _media_params(self, fields: List[str] = None) -> Dict:
+        """Query for the first page of media objects"""
         if fields is None:
             fields = ['id', 'caption', 'media_type', 'media_url', 
                      'permalink', 'timestamp', 'like_count', 
                      'comments_count']
         
-        params = {
+        return {
             'fields': ','.join(fields),
             'limit': 25
         }
+    
+    def get_instagram_media(self, page_id: str, access_token: str,
+                           fields: List[str] = None) -> Dict:
+        """Get Instagram media objects"""
+        endpoint = f"{page_id}/media"
+        params = self._media_params(fields)
+        
+        return self._make_request('GET', endpoint, access_token, page_id, params=params,
+                                  cache_family='media')
+    
+    def get_media_object(self, page_id: str, access_token: str, media_id: str,
+                        fields: List[str] = None) -> Dict:
+        """Get one Instagram media object"""
+        params = self._media_params(fields)
+        del params['limit']
+        
+        return self._make_request('GET', media_id, access_token, page_id, params=params,
+                                  cache_family='media')
+    
+    # ==================== STREAMING PAGINATION ====================
+    
+    @staticmethod
+    def _to_timestamp(value: Union[datetime, int, float, None]) -> Optional[int]:
+        """Unix timestamp from a datetime or number"""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return int(value.timestamp())
+        return int(value)
+    
+    @staticmethod
+    def _next_page_params(paging: Dict) -> Optional[Dict]:
+        """Query parameters for the next page, or None on the last page"""
+        if not paging or not paging.get('next'):
+            return None
+        
+        after = paging.get('cursors', {}).get('after')
+        if after:
+            return {'after': after}
+        
+        # Time-based paging (insights): carry the window from the next URL
+        query = parse_qs(urlparse(paging['next']).query)
+        params = {k: v[0] for k, v in query.items() if k in ('since', 'until', 'after')}
+        return params or None
+    
+    def _iter_edge(self, endpoint: str, access_token: str, page_id: str,
+                  params: Dict, stop_after: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """Follow paging cursors on an edge, holding one page at a time"""
+        params = dict(params)
+        while True:
+            response = self._make_request('GET', endpoint, access_token, page_id,
+                                          params=dict(params))
+            for item in response.get('data', []):
+                yield item
+            
+            next_params = self._next_page_params(response.get('paging'))
+            if next_params is None or (stop_after and stop_after(next_params)):
+                return
+            params.update(next_params)
+    
+    def _media_page_params(self, fields: List[str] = None, page_size: int = 25,
+                          since: Union[datetime, int, None] = None) -> Dict:
+        """Query for one page of media objects"""
+        params = self._media_params(fields)
+        params['limit'] = page_size
+        if since is not None and 'timestamp' not in params['fields'].split(','):
+            params['fields'] += ',timestamp'
+        return params
+    
+    def _media_stop_condition(self, since: Union[datetime, int, None] = None,
+                             stop: Callable[[Dict], bool] = None) -> Callable[[Dict], bool]:
+        """Predicate ending a newest-first media stream"""
+        since_ts = self._to_timestamp(since)
+        
+        def should_stop(item: Dict) -> bool:
+            if since_ts is not None and item.get('timestamp'):
+                posted = datetime.strptime(item['timestamp'], "%Y-%m-%dT%H:%M:%S%z")
+                if posted.timestamp() < since_ts:
+                    return True
+            return bool(stop and stop(item))
         
-        return self._make_request('GET', endpoint, access_token, page_id, params=params)
+        return should_stop
+    
+    def iter_media(self, page_id: str, access_token: str, fields: List[str] = None,
+                  page_size: int = 25, since: Union[datetime, int, None] = None,
+                  stop: Callable[[Dict], bool] = None) -> Iterator[Dict]:
+        """
+        Stream every media object of an account, newest first.
+        Pages are fetched lazily; the stream ends at the last page, at the
+        first item older than `since`, or when `stop(item)` returns True.
+        """
+        endpoint = f"{page_id}/media"
+        params = self._media_page_params(fields, page_size, since)
+        should_stop = self._media_stop_condition(since, stop)
+        
+        for item in self._iter_edge(endpoint, access_token, page_id, params):
+            if should_stop(item):
+                return
+            yield item
+    
+    def _insights_page_params(self, metrics: List[str], period: str,
+                             since: Union[datetime, int, None],
+                             until: Union[datetime, int, None]) -> Dict:
+        """Query for the first insights window"""
+        params = self._insights_params(metrics, period)
+        if since is not None:
+            params['since'] = self._to_timestamp(since)
+        if until is not None:
+            params['until'] = self._to_timestamp(until)
+        return params
+    
+    @staticmethod
+    def _flatten_insight(metric: Dict) -> Iterator[Dict]:
+        """One row per metric value"""
+        for value in metric.get('values', []):
+            yield {
+                'metric': metric.get('name'),
+                'period': metric.get('period'),
+                'end_time': value.get('end_time'),
+                'value': value.get('value')
+            }
+    
+    def iter_insights(self, page_id: str, access_token: str, metrics: List[str],
+                     period: str = 'day', since: Union[datetime, int, None] = None,
+                     until: Union[datetime, int, None] = None) -> Iterator[Dict]:
+        """
+        Stream insight values window by window, following paging.next
+        forward in time until `until` (default: now). Yields one row per
+        metric value.
+        """
+        endpoint = f"{page_id}/insights"
+        params = self._insights_page_params(metrics, period, since, until)
+        # The window's real end: the hour-aligned default when until is None
+        until_ts = int(params['until'])
+        
+        def past_until(next_params: Dict) -> bool:
+            return int(next_params.get('since', 0)) >= until_ts
+        
+        for metric in self._iter_edge(endpoint, access_token, page_id, params,
+                                      stop_after=past_until):
+            yield from self._flatten_insight(metric)
     
     def comment_on_media(self, page_id: str, access_token: str,
                         media_id: str, message: str) -> Dict:
@@ -290,19 +733,18 @@ class MetaGraphClient:
     def validate_app_access_token(self, access_token: str) -> Dict:
         """Validate app access token"""
         endpoint = "debug_token"
-        params = {
-            'input_token': access_token,
-            'access_token': f"{self.config.app_id}|{self.config.app_secret}"
-        }
+        params = {'input_token': access_token}
         
-        return self._make_request('GET', endpoint, access_token, params=params)
+        # debug_token is called with the app token; the inspected token is the input
+        app_token = f"{self.config.app_id}|{self.config.app_secret}"
+        return self._make_request('GET', endpoint, app_token, params=params)
     
     def get_app_roles(self) -> Dict:
         """Get app roles and permissions"""
         endpoint = f"{self.config.app_id}/roles"
         access_token = f"{self.config.app_id}|{self.config.app_secret}"
         
-        return self._make_request('GET', endpoint, access_token)
+        return self._make_request('GET', endpoint, access_token, cache_family='app_roles')
     
     def subscribe_to_webhooks(self, page_id: str, access_token: str,
                             subscription_fields: List[str]) -> Dict:
@@ -328,7 +770,8 @@ class MetaGraphClient:
         endpoint = f"{self.config.business_id}/owned_ad_accounts"
         access_token = f"{self.config.app_id}|{self.config.app_secret}"
         
-        return self._make_request('GET', endpoint, access_token)
+        return self._make_request('GET', endpoint, access_token,
+                                  cache_family='business_accounts')
     
     def get_page_access_tokens(self, page_id: str) -> Dict:
         """Get page access tokens"""
@@ -340,7 +783,8 @@ class MetaGraphClient:
             'access_token': access_token
         }
         
-        return self._make_request('GET', endpoint, access_token, params=params)
+        return self._make_request('GET', endpoint, access_token, params=params,
+                                  cache_family='page_tokens')
     
     # ==================== SECURITY METHODS ====================
     
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Metrics Registry
+In-process gauges, counters and timings for the API clients
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class MetricsRegistry:
+    """
+    Thread-safe metric store.
+    Snapshots are plain dicts for the dashboard; to_prometheus() renders
+    the text exposition format for scraping.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._timings: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+
+    @staticmethod
+    def _labels(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def gauge(self, name: str, value: float, **labels):
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges.setdefault(name, {})[self._labels(labels)] = float(value)
+
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        """Increment a counter"""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a sample (latency, size) as count/sum/max"""
+        key = self._labels(labels)
+        with self._lock:
+            stats = self._timings.setdefault(name, {}).setdefault(
+                key, {"count": 0.0, "sum": 0.0, "max": 0.0}
+            )
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["max"] = max(stats["max"], value)
+
+    def get(self, name: str, **labels) -> Optional[float]:
+        """Current value of a gauge or counter"""
+        key = self._labels(labels)
+        with self._lock:
+            for store in (self._gauges, self._counters):
+                if name in store and key in store[name]:
+                    return store[name][key]
+        return None
+
+    def snapshot(self) -> Dict:
+        """Copy of every series, labels rendered as 'k=v,k=v'"""
+        def render(store):
+            return {
+                name: {",".join(f"{k}={v}" for k, v in key): value
+                       for key, value in series.items()}
+                for name, series in store.items()
+            }
+
+        with self._lock:
+            return {
+                "gauges": render(self._gauges),
+                "counters": render(self._counters),
+                "timings": {
+                    name: {",".join(f"{k}={v}" for k, v in key): dict(stats)
+                           for key, stats in series.items()}
+                    for name, series in self._timings.items()
+                }
+            }
+
+    def to_prometheus(self) -> str:
+        """Render metrics in Prometheus text format"""
+        def fmt(name, key, value):
+            labels = ",".join(f'{k}="{v}"' for k, v in key)
+            return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+        lines = []
+        with self._lock:
+            for name, series in self._gauges.items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(fmt(name, key, value) for key, value in series.items())
+            for name, series in self._counters.items():
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(fmt(name, key, value) for key, value in series.items())
+            for name, series in self._timings.items():
+                lines.append(f"# TYPE {name} summary")
+                for key, stats in series.items():
+                    lines.append(fmt(f"{name}_count", key, stats["count"]))
+                    lines.append(fmt(f"{name}_sum", key, stats["sum"]))
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry
+_registry_instance: Optional[MetricsRegistry] = None
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Get or create the shared metrics registry."""
+    global _registry_instance
+    if _registry_instance is None:
+        _registry_instance = MetricsRegistry()
+    return _registry_instance
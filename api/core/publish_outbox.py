@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Publish Outbox
+Durable, idempotent upload-then-publish pipeline backed by SQLite
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+from .meta_client_v24 import (MetaGraphClient, MetaAPIError, RateLimitExceeded,
+                              CircuitOpenError, ContentType)
+
+class OutboxState(Enum):
+    """Where a planned post is in the publish flow"""
+    PLANNED = "PLANNED"
+    CONTAINER_CREATED = "CONTAINER_CREATED"
+    PUBLISHED = "PUBLISHED"
+    FAILED = "FAILED"
+
+@dataclass
+class OutboxEntry:
+    """One planned post"""
+    key: str
+    page_id: str
+    media_path: str
+    media_type: str
+    caption: Optional[str]
+    options: Dict
+    state: OutboxState
+    creation_id: Optional[str] = None
+    media_id: Optional[str] = None
+    attempts: int = 0
+    last_error: Optional[str] = None
+    next_attempt_at: float = 0.0
+    updated_at: float = 0.0
+
+_COLUMNS = ("key, page_id, media_path, media_type, caption, options, state, creation_id, "
+            "media_id, attempts, last_error, next_attempt_at, updated_at")
+
+class PublishOutbox:
+    """
+    SQLite outbox for Instagram posts.
+    Each post is stored under an idempotency key (e.g. the mission_id from
+    DeterministicEngine) and advances PLANNED -> CONTAINER_CREATED ->
+    PUBLISHED, with every step committed before the next call. Workers
+    claim entries with a lease, so several threads or processes can drain
+    the same file and a crashed worker's entries are picked up again once
+    its lease runs out. Before (re)publishing, the container status is
+    checked, so a publish whose response was lost is never sent twice.
+    Access tokens are not stored; `token_provider(page_id)` supplies them
+    on every attempt (e.g. TokenManager.page_token, so rotations apply).
+    """
+
+    def __init__(self, client: MetaGraphClient, token_provider: Callable[[str], str],
+                 path: str = ".cache/publish_outbox.db", workers: int = 4,
+                 lease_seconds: float = 300.0, max_attempts: int = 5,
+                 backoff: float = 30.0, poll_interval: float = 15.0,
+                 clock: Callable[[], float] = time.time):
+        self.client = client
+        self.token_provider = token_provider
+        self.path = path
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self._local = threading.local()
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            "key TEXT PRIMARY KEY, page_id TEXT NOT NULL, media_path TEXT NOT NULL, "
+            "media_type TEXT NOT NULL, caption TEXT, options TEXT, state TEXT NOT NULL, "
+            "creation_id TEXT, media_id TEXT, attempts INTEGER DEFAULT 0, last_error TEXT, "
+            "next_attempt_at REAL DEFAULT 0, lease_owner TEXT, lease_until REAL DEFAULT 0, "
+            "created_at REAL, updated_at REAL)"
+        )
+        self._conn().execute(
+            "CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, next_attempt_at)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _entry(row) -> OutboxEntry:
+        return OutboxEntry(
+            key=row[0], page_id=row[1], media_path=row[2], media_type=row[3],
+            caption=row[4], options=json.loads(row[5] or "{}"),
+            state=OutboxState(row[6]), creation_id=row[7], media_id=row[8],
+            attempts=row[9], last_error=row[10], next_attempt_at=row[11],
+            updated_at=row[12]
+        )
+
+    # ==================== PLANNING ====================
+
+    def enqueue(self, key: str, page_id: str, media_path: str,
+                media_type: ContentType, caption: str = None, **options) -> OutboxEntry:
+        """
+        Record a planned post. Enqueueing an existing key is a no-op and
+        returns the stored entry, whatever state it is in.
+        """
+        now = self.clock()
+        self._conn().execute(
+            "INSERT OR IGNORE INTO outbox (key, page_id, media_path, media_type, caption, "
+            "options, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, page_id, media_path, media_type.value, caption, json.dumps(options),
+             OutboxState.PLANNED.value, now, now)
+        )
+        return self.get(key)
+
+    def get(self, key: str) -> Optional[OutboxEntry]:
+        """Stored entry for an idempotency key"""
+        row = self._conn().execute(
+            f"SELECT {_COLUMNS} FROM outbox WHERE key = ?", (key,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def entries(self, state: OutboxState = None) -> List[OutboxEntry]:
+        """All entries, optionally filtered by state"""
+        if state is None:
+            rows = self._conn().execute(f"SELECT {_COLUMNS} FROM outbox ORDER BY created_at")
+        else:
+            rows = self._conn().execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE state = ? ORDER BY created_at",
+                (state.value,)
+            )
+        return [self._entry(row) for row in rows.fetchall()]
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count per state"""
+        rows = self._conn().execute("SELECT state, COUNT(*) FROM outbox GROUP BY state").fetchall()
+        counts = {state.value: 0 for state in OutboxState}
+        counts.update(dict(rows))
+        return counts
+
+    # ==================== LEASES ====================
+
+    def _claim(self, owner: str) -> Optional[OutboxEntry]:
+        """Lease the oldest due entry that nobody else holds"""
+        now = self.clock()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM outbox WHERE state IN (?, ?) "
+                "AND next_attempt_at <= ? AND lease_until <= ? "
+                "ORDER BY next_attempt_at, created_at LIMIT 1",
+                (OutboxState.PLANNED.value, OutboxState.CONTAINER_CREATED.value, now, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE outbox SET lease_owner = ?, lease_until = ? WHERE key = ?",
+                    (owner, now + self.lease_seconds, row[0])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self._entry(row) if row else None
+
+    def _save(self, entry: OutboxEntry, owner: str, release: bool = True):
+        """Persist progress; only the lease holder may write"""
+        entry.updated_at = self.clock()
+        self._conn().execute(
+            "UPDATE outbox SET state = ?, creation_id = ?, media_id = ?, attempts = ?, "
+            "last_error = ?, next_attempt_at = ?, updated_at = ?, "
+            "lease_owner = CASE WHEN ? THEN NULL ELSE lease_owner END, "
+            "lease_until = CASE WHEN ? THEN 0 ELSE lease_until END "
+            "WHERE key = ? AND lease_owner = ?",
+            (entry.state.value, entry.creation_id, entry.media_id, entry.attempts,
+             entry.last_error, entry.next_attempt_at, entry.updated_at,
+             release, release, entry.key, owner)
+        )
+
+    def next_due_in(self) -> Optional[float]:
+        """Seconds until the next unfinished entry is due (None = nothing left)"""
+        row = self._conn().execute(
+            "SELECT MIN(MAX(next_attempt_at, lease_until)) FROM outbox WHERE state IN (?, ?)",
+            (OutboxState.PLANNED.value, OutboxState.CONTAINER_CREATED.value)
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - self.clock())
+
+    # ==================== PROCESSING ====================
+
+    def _create_container(self, entry: OutboxEntry, token: str, owner: str):
+        result = self.client.upload_media(entry.page_id, token, entry.media_path,
+                                          ContentType(entry.media_type), entry.caption,
+                                          **entry.options)
+        if not result.get('id'):
+            raise MetaAPIError(f"Upload for {entry.key} returned no container id")
+        entry.creation_id = result['id']
+        entry.state = OutboxState.CONTAINER_CREATED
+        # Commit the container id before anything else can fail
+        self._save(entry, owner, release=False)
+
+    def _container_status(self, entry: OutboxEntry, token: str) -> str:
+        result = self.client._make_request('GET', entry.creation_id, token,
+                                           params={'fields': 'status_code'})
+        return result.get('status_code', 'UNKNOWN')
+
+    def _publish(self, entry: OutboxEntry, token: str):
+        status = self._container_status(entry, token)
+        if status == 'PUBLISHED':
+            # An earlier publish went through but its response was lost
+            entry.state = OutboxState.PUBLISHED
+        elif status == 'FINISHED':
+            result = self.client.publish_media(entry.page_id, token, entry.creation_id)
+            entry.media_id = result.get('id')
+            entry.state = OutboxState.PUBLISHED
+        elif status == 'EXPIRED':
+            # Containers live 24 hours; start over with a fresh one
+            entry.creation_id = None
+            entry.state = OutboxState.PLANNED
+        elif status == 'ERROR':
+            entry.state = OutboxState.FAILED
+            entry.last_error = f"Container {entry.creation_id} failed processing"
+        else:
+            # IN_PROGRESS: Meta is still processing the video
+            entry.next_attempt_at = self.clock() + self.poll_interval
+
+    def process_one(self, owner: str = None) -> Optional[OutboxEntry]:
+        """Claim one due entry and advance it as far as it can go"""
+        owner = owner or uuid.uuid4().hex
+        entry = self._claim(owner)
+        if entry is None:
+            return None
+
+        try:
+            token = self.token_provider(entry.page_id)
+            if entry.state == OutboxState.PLANNED:
+                self._create_container(entry, token, owner)
+            self._publish(entry, token)
+            if entry.state != OutboxState.FAILED:
+                entry.last_error = None
+        except (RateLimitExceeded, CircuitOpenError) as e:
+            # Not the post's fault: wait it out without spending an attempt
+            entry.next_attempt_at = self.clock() + e.retry_after
+            entry.last_error = str(e)
+        except MetaAPIError as e:
+            entry.attempts += 1
+            entry.last_error = str(e)
+            if entry.attempts >= self.max_attempts:
+                entry.state = OutboxState.FAILED
+                self.logger.error(f"Outbox entry {entry.key} failed for good: {e}")
+            else:
+                entry.next_attempt_at = self.clock() + self.backoff * (2 ** (entry.attempts - 1))
+                self.logger.warning(f"Outbox entry {entry.key} attempt {entry.attempts} failed: {e}")
+
+        self._save(entry, owner)
+        if entry.state == OutboxState.PUBLISHED:
+            self.logger.info(f"Published {entry.key} for {entry.page_id} ({entry.media_id})")
+        return entry
+
+    def _worker(self, deadline: Optional[float]) -> int:
+        owner = uuid.uuid4().hex
+        processed = 0
+        while deadline is None or self.clock() < deadline:
+            if self.process_one(owner) is None:
+                break
+            processed += 1
+        return processed
+
+    def drain(self, wait: bool = False, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        Work through due entries with `workers` threads.
+        With wait=True keep going (sleeping between rounds) until nothing
+        is left to publish or `timeout` seconds have passed.
+        """
+        deadline = self.clock() + timeout if timeout is not None else None
+        while True:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                list(pool.map(self._worker, [deadline] * self.workers))
+
+            due_in = self.next_due_in()
+            if not wait or due_in is None:
+                break
+            if deadline is not None and self.clock() + due_in >= deadline:
+                break
+            time.sleep(due_in)
+        return self.stats()
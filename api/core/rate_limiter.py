@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Token-Bucket Rate Limiter
+Non-blocking app/page quotas shared across threads and processes
+"""
+
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+# (tokens, updated_at, blocked_until)
+BucketState = Tuple[float, float, float]
+
+@dataclass
+class BucketSpec:
+    """Capacity and refill rate for a family of buckets"""
+    capacity: float
+    refill_per_second: float
+
+    @classmethod
+    def per_hour(cls, calls: float) -> "BucketSpec":
+        """Bucket allowing `calls` per hour with a full-hour burst"""
+        return cls(capacity=calls, refill_per_second=calls / 3600.0)
+
+class _MemoryLedger:
+    """Bucket state shared between threads of one process"""
+
+    def __init__(self):
+        self._rows: Dict[str, BucketState] = {}
+        self._scales: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            yield self
+
+    def get(self, key: str) -> Optional[BucketState]:
+        return self._rows.get(key)
+
+    def put(self, key: str, state: BucketState):
+        self._rows[key] = state
+
+    def get_scale(self, key: str) -> float:
+        return self._scales.get(key, 1.0)
+
+    def put_scale(self, key: str, scale: float):
+        self._scales[key] = scale
+
+class _SqliteLedger:
+    """Bucket state shared between processes through a SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL, updated_at REAL, blocked_until REAL)"
+        )
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS bucket_scales (key TEXT PRIMARY KEY, scale REAL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[BucketState]:
+        row = self._conn().execute(
+            "SELECT tokens, updated_at, blocked_until FROM buckets WHERE key = ?", (key,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def put(self, key: str, state: BucketState):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO buckets (key, tokens, updated_at, blocked_until) "
+            "VALUES (?, ?, ?, ?)", (key, *state)
+        )
+
+    def get_scale(self, key: str) -> float:
+        row = self._conn().execute(
+            "SELECT scale FROM bucket_scales WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 1.0
+
+    def put_scale(self, key: str, scale: float):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO bucket_scales (key, scale) VALUES (?, ?)", (key, scale)
+        )
+
+class TokenBucketLimiter:
+    """
+    Token buckets keyed as "<family>:<id>" (e.g. "app:689310950781431",
+    "page:123"). A call takes one token from every key it names, all or
+    nothing. Nothing here sleeps unless the caller asks to wait.
+    """
+
+    def __init__(self, buckets: Dict[str, BucketSpec],
+                 ledger_path: Optional[str] = None,
+                 clock: Callable[[], float] = time.time):
+        self.buckets = buckets
+        self.clock = clock
+        self.ledger = _SqliteLedger(ledger_path) if ledger_path else _MemoryLedger()
+        self.logger = logging.getLogger(__name__)
+
+    def spec_for(self, key: str) -> BucketSpec:
+        """Bucket spec for a key, looked up by its family prefix"""
+        family = key.split(':', 1)[0]
+        if family not in self.buckets:
+            raise KeyError(f"No bucket spec for '{family}'")
+        return self.buckets[family]
+
+    def _refill(self, key: str, ledger, now: float) -> Tuple[float, float, float]:
+        """Current (tokens, blocked_until, refill rate) for a bucket"""
+        spec = self.spec_for(key)
+        rate = spec.refill_per_second * ledger.get_scale(key)
+        state = ledger.get(key)
+        if state is None:
+            return spec.capacity, 0.0, rate
+        tokens, updated_at, blocked_until = state
+        tokens = min(spec.capacity, tokens + max(0.0, now - updated_at) * rate)
+        return tokens, blocked_until, rate
+
+    def _wait_for(self, key: str, tokens: float, blocked_until: float, rate: float,
+                  needed: float, now: float) -> float:
+        if needed > self.spec_for(key).capacity:
+            # A bucket never holds more than its capacity
+            return float('inf')
+        wait = max(0.0, blocked_until - now)
+        if tokens < needed:
+            if rate <= 0:
+                return float('inf')
+            wait = max(wait, (needed - tokens) / rate)
+        return wait
+
+    @staticmethod
+    def _costs(keys: Union[Iterable[str], Mapping[str, float]],
+               tokens: float) -> Dict[str, float]:
+        if isinstance(keys, Mapping):
+            return dict(keys)
+        return {key: tokens for key in keys}
+
+    def try_acquire(self, keys: Union[Iterable[str], Mapping[str, float]],
+                    tokens: float = 1.0) -> float:
+        """
+        Take `tokens` from every bucket if all can afford it; `keys` may
+        also map each bucket to its own cost.
+        Returns 0.0 on success, otherwise the seconds until the next slot
+        (nothing is consumed in that case); inf when a cost exceeds its
+        bucket's capacity and can never be paid.
+        """
+        costs = self._costs(keys, tokens)
+        now = self.clock()
+        with self.ledger.transaction() as ledger:
+            levels = {}
+            wait = 0.0
+            for key, cost in costs.items():
+                level, blocked_until, rate = self._refill(key, ledger, now)
+                levels[key] = (level, blocked_until)
+                wait = max(wait, self._wait_for(key, level, blocked_until, rate, cost, now))
+            if wait > 0:
+                return wait
+            for key, (level, blocked_until) in levels.items():
+                ledger.put(key, (level - costs[key], now, blocked_until))
+        return 0.0
+
+    def time_until_available(self, keys: Union[Iterable[str], Mapping[str, float]],
+                             tokens: float = 1.0) -> float:
+        """Seconds until `tokens` could be taken from every bucket (0.0 = now)"""
+        costs = self._costs(keys, tokens)
+        now = self.clock()
+        wait = 0.0
+        with self.ledger.transaction() as ledger:
+            for key, cost in costs.items():
+                level, blocked_until, rate = self._refill(key, ledger, now)
+                wait = max(wait, self._wait_for(key, level, blocked_until, rate, cost, now))
+        return wait
+
+    def acquire(self, keys: Iterable[str], tokens: float = 1.0,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Blocking acquire for worker threads; False if `timeout` would be
+        exceeded or the cost can never be paid
+        """
+        keys = self._costs(keys, tokens)
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire(keys, tokens)
+            if wait == 0:
+                return True
+            if wait == float('inf') or (deadline is not None
+                                        and self.clock() + wait > deadline):
+                return False
+            time.sleep(wait)
+
+    async def acquire_async(self, keys: Iterable[str], tokens: float = 1.0,
+                            timeout: Optional[float] = None) -> bool:
+        """Awaitable acquire; yields to the event loop while waiting (see acquire)"""
+        keys = self._costs(keys, tokens)
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire(keys, tokens)
+            if wait == 0:
+                return True
+            if wait == float('inf') or (deadline is not None
+                                        and self.clock() + wait > deadline):
+                return False
+            await asyncio.sleep(wait)
+
+    def penalize(self, keys: Iterable[str], seconds: float):
+        """Block buckets for `seconds` (e.g. after a 429 with Retry-After)"""
+        keys = list(keys)
+        now = self.clock()
+        with self.ledger.transaction() as ledger:
+            for key in keys:
+                level, blocked_until, _ = self._refill(key, ledger, now)
+                ledger.put(key, (level, now, max(blocked_until, now + seconds)))
+        self.logger.warning(f"Rate limit buckets {keys} blocked for {seconds:.0f}s")
+
+    def set_rate_scale(self, key: str, scale: float):
+        """
+        Speed up (>1) or slow down (<1) a bucket's refill, e.g. from the
+        usage Meta reports. Tokens earned so far are settled at the old rate.
+        """
+        now = self.clock()
+        with self.ledger.transaction() as ledger:
+            level, blocked_until, _ = self._refill(key, ledger, now)
+            ledger.put(key, (level, now, blocked_until))
+            ledger.put_scale(key, scale)
+
+if __name__ == "__main__":
+    limiter = TokenBucketLimiter({"app": BucketSpec.per_hour(180)})
+    print(f"Acquire: {limiter.try_acquire(['app:demo'])}")
+    print(f"Next slot in: {limiter.time_until_available(['app:demo'], tokens=180):.0f}s")
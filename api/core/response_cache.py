@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Graph Response Cache
+In-memory LRU with an optional SQLite tier, per-endpoint TTLs and
+ETag revalidation for Graph GET calls
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+# Never stored in a cache key
+SECRET_PARAMS = {'access_token', 'appsecret_proof', 'client_token',
+                 'client_secret', 'fb_exchange_token', 'input_token'}
+
+# Derived from the access token, which the key already fingerprints
+TOKEN_DERIVED_PARAMS = {'access_token', 'appsecret_proof'}
+
+# Seconds each endpoint family stays fresh; families not listed are not cached
+DEFAULT_TTLS = {
+    "page_tokens": 3600,
+    "business_accounts": 3600,
+    "app_roles": 3600,
+    "insights": 900,
+    "media": 300
+}
+
+@dataclass
+class CacheEntry:
+    """A cached response body"""
+    body: Any
+    etag: Optional[str]
+    expires_at: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+class _SqliteTier:
+    """Persistent second tier shared by runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, body TEXT, etag TEXT, expires_at REAL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        row = self._conn().execute(
+            "SELECT body, etag, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        return CacheEntry(body=json.loads(row[0]), etag=row[1], expires_at=row[2])
+
+    def put(self, key: str, entry: CacheEntry):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO responses (key, body, etag, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(entry.body), entry.etag, entry.expires_at)
+        )
+
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM responses")
+
+class ResponseCache:
+    """
+    Two-tier cache for Graph GET responses.
+    Keys hash the endpoint, the non-secret parameters and a fingerprint of
+    the access token, so tokens never appear in keys and different tokens
+    never share an entry. Bodies that contain an access token stay in
+    memory only.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None,
+                 max_entries: int = 1024, sqlite_path: Optional[str] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 clock: Callable[[], float] = time.time):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.disk = _SqliteTier(sqlite_path) if sqlite_path else None
+        self.metrics = metrics or get_metrics_registry()
+        self.clock = clock
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0}
+        self.logger = logging.getLogger(__name__)
+
+    def ttl_for(self, family: Optional[str]) -> float:
+        """Freshness lifetime for an endpoint family (0 = do not cache)"""
+        return self.ttls.get(family, 0) if family else 0
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any], access_token: str) -> str:
+        """
+        Cache key without secrets.
+        Secrets that name what is being asked about (input_token for
+        debug_token, fb_exchange_token ...) are fingerprinted into the key,
+        so two checks of different tokens never share a response.
+        """
+        public, fingerprints = [], []
+        for k, v in sorted((params or {}).items()):
+            if k in TOKEN_DERIVED_PARAMS:
+                continue
+            if k in SECRET_PARAMS:
+                fingerprints.append((k, hashlib.sha256(str(v).encode()).hexdigest()[:16]))
+            else:
+                public.append((k, str(v)))
+        token_id = hashlib.sha256(access_token.encode()).hexdigest()[:16]
+        raw = json.dumps([endpoint, public, fingerprints, token_id])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Tuple[Optional[CacheEntry], bool]:
+        """(entry, is_fresh) from memory, falling back to disk"""
+        now = self.clock()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+
+        if entry is None and self.disk:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        fresh = entry is not None and entry.is_fresh(now)
+        self._record("hits" if fresh else "misses")
+        return entry, fresh
+
+    def store(self, key: str, body: Any, etag: Optional[str], ttl: float):
+        """Cache a response body for `ttl` seconds"""
+        entry = CacheEntry(body=body, etag=etag, expires_at=self.clock() + ttl)
+        self._remember(key, entry)
+        if self.disk and not self._holds_token(body):
+            self.disk.put(key, entry)
+        self._record("stores")
+
+    def revalidated(self, key: str, entry: CacheEntry, ttl: float):
+        """A 304 confirmed the entry: extend its lifetime"""
+        self.store(key, entry.body, entry.etag, ttl)
+        self._record("revalidated")
+
+    def invalidate(self, key: str):
+        """Drop a single entry"""
+        with self._lock:
+            self._memory.pop(key, None)
+        if self.disk:
+            self.disk.delete(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk:
+            self.disk.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and the hit ratio"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._memory)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _remember(self, key: str, entry: CacheEntry):
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _record(self, event: str):
+        with self._lock:
+            self._stats[event] += 1
+        self.metrics.inc("meta_cache_events", event=event)
+
+    @staticmethod
+    def _holds_token(body: Any) -> bool:
+        return 'access_token' in json.dumps(body)
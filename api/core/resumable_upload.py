@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Resumable Video Upload
+Streams local Reels/videos to Meta's resumable upload endpoint in
+fixed-size chunks, resuming from the last acknowledged offset
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+import requests
+
+from .meta_client_v24 import MetaGraphClient, MetaAPIError, ContentType
+
+# Meta keeps unpublished containers for 24 hours
+SESSION_LIFETIME_SECONDS = 23 * 3600
+
+@dataclass
+class UploadSession:
+    """A resumable upload in progress"""
+    container_id: str
+    upload_uri: str
+    page_id: str
+    file_path: str
+    file_size: int
+    file_mtime: float
+    offset: int = 0
+    created_at: float = 0.0
+
+class ResumableUploader:
+    """
+    Chunked uploader for local video files.
+    Only one chunk is held in memory at a time. Progress is checkpointed
+    to disk after every acknowledged chunk, so a retry (or a restarted
+    process) continues from the last offset the server confirmed instead
+    of from zero.
+    """
+
+    def __init__(self, client: MetaGraphClient, chunk_size: int = 8 * 1024 * 1024,
+                 max_retries: int = 5, backoff: float = 1.0,
+                 state_dir: str = ".cache/uploads", max_parallel: int = 4,
+                 chunk_timeout: float = 120.0):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.state_dir = state_dir
+        self.max_parallel = max_parallel
+        self.chunk_timeout = chunk_timeout
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== CHECKPOINTS ====================
+
+    def _checkpoint_path(self, page_id: str, file_path: str) -> str:
+        digest = hashlib.sha256(f"{page_id}:{os.path.abspath(file_path)}".encode()).hexdigest()[:24]
+        return os.path.join(self.state_dir, f"{digest}.json")
+
+    def _save(self, session: UploadSession):
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self._checkpoint_path(session.page_id, session.file_path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(session), f)
+        os.replace(tmp_path, path)
+
+    def _load(self, page_id: str, file_path: str) -> Optional[UploadSession]:
+        path = self._checkpoint_path(page_id, file_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                session = UploadSession(**json.load(f))
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable upload checkpoint {path}: {e}")
+            return None
+
+        stat = os.stat(file_path)
+        if (session.file_size != stat.st_size or session.file_mtime != stat.st_mtime
+                or time.time() - session.created_at > SESSION_LIFETIME_SECONDS):
+            return None
+        return session
+
+    def _discard(self, session: UploadSession):
+        path = self._checkpoint_path(session.page_id, session.file_path)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # ==================== UPLOAD FLOW ====================
+
+    def start(self, page_id: str, access_token: str, file_path: str,
+              caption: str = None, media_type: ContentType = ContentType.REELS,
+              thumb_url: str = None) -> UploadSession:
+        """Create a container with upload_type=resumable"""
+        params = {
+            'media_type': media_type.value,
+            'upload_type': 'resumable',
+            'caption': caption[:2200] if caption else ''
+        }
+        if media_type == ContentType.REELS:
+            params['share_to_feed'] = 'true'
+        if thumb_url:
+            params['thumb_url'] = thumb_url
+
+        result = self.client._make_request('POST', f"{page_id}/media", access_token,
+                                           page_id, params=params)
+        if not result.get('id') or not result.get('uri'):
+            raise MetaAPIError(f"Resumable upload session not created: {result}")
+
+        stat = os.stat(file_path)
+        session = UploadSession(
+            container_id=result['id'],
+            upload_uri=result['uri'],
+            page_id=page_id,
+            file_path=file_path,
+            file_size=stat.st_size,
+            file_mtime=stat.st_mtime,
+            created_at=time.time()
+        )
+        self._save(session)
+        return session
+
+    def _headers(self, access_token: str) -> Dict[str, str]:
+        return {'Authorization': f"OAuth {access_token}"}
+
+    def query_offset(self, session: UploadSession, access_token: str) -> int:
+        """Bytes the upload endpoint has acknowledged so far"""
+        response = self.client.transport.get(session.upload_uri, client="meta",
+                                             headers=self._headers(access_token),
+                                             timeout=self.chunk_timeout)
+        response.raise_for_status()
+        data = response.json()
+        return int(data.get('offset', data.get('file_offset', 0)))
+
+    def _send_chunk(self, session: UploadSession, access_token: str, chunk: bytes):
+        headers = self._headers(access_token)
+        headers.update({
+            'offset': str(session.offset),
+            'file_size': str(session.file_size),
+            'Content-Type': 'application/octet-stream'
+        })
+        # The offset header makes a repeated chunk harmless
+        response = self.client.transport.post(session.upload_uri, client="meta",
+                                              idempotent=True, data=chunk, headers=headers,
+                                              timeout=self.chunk_timeout)
+        response.raise_for_status()
+
+    def upload(self, session: UploadSession, access_token: str) -> UploadSession:
+        """Send the rest of the file, resuming after failures"""
+        failures = 0
+        with open(session.file_path, 'rb') as f:
+            while session.offset < session.file_size:
+                f.seek(session.offset)
+                chunk = f.read(self.chunk_size)
+                try:
+                    self._send_chunk(session, access_token, chunk)
+                    session.offset += len(chunk)
+                    failures = 0
+                except requests.exceptions.RequestException as e:
+                    failures += 1
+                    if failures > self.max_retries:
+                        raise MetaAPIError(
+                            f"Upload of {session.file_path} failed at offset {session.offset}: {e}"
+                        )
+                    self.logger.warning(
+                        f"Chunk at offset {session.offset} failed ({e}); retry {failures}/{self.max_retries}"
+                    )
+                    time.sleep(self.backoff * (2 ** (failures - 1)))
+                    try:
+                        # The server may have stored the chunk before the failure
+                        session.offset = self.query_offset(session, access_token)
+                    except requests.exceptions.RequestException:
+                        pass
+                self._save(session)
+
+        self.logger.info(f"Uploaded {session.file_size} bytes for container {session.container_id}")
+        return session
+
+    def upload_file(self, page_id: str, access_token: str, file_path: str,
+                    caption: str = None, media_type: ContentType = ContentType.REELS,
+                    thumb_url: str = None) -> str:
+        """
+        Upload a local file and return its container id.
+        Picks up an unfinished session for the same page and file.
+        """
+        session = self._load(page_id, file_path)
+        if session is None:
+            session = self.start(page_id, access_token, file_path, caption,
+                                 media_type, thumb_url)
+        else:
+            self.logger.info(f"Resuming upload of {file_path} at offset {session.offset}")
+            try:
+                session.offset = self.query_offset(session, access_token)
+            except requests.exceptions.RequestException:
+                pass
+
+        self.upload(session, access_token)
+        self._discard(session)
+        return session.container_id
+
+    def upload_many(self, uploads: List[Dict]) -> List[Dict]:
+        """
+        Upload several files in parallel.
+        Each entry holds upload_file keyword arguments; results keep input
+        order with either the container id or the error.
+        """
+        def run(upload: Dict) -> Dict:
+            try:
+                return {"file_path": upload['file_path'], "status": "uploaded",
+                        "container_id": self.upload_file(**upload)}
+            except (MetaAPIError, OSError) as e:
+                self.logger.error(f"Upload of {upload['file_path']} failed: {e}")
+                return {"file_path": upload['file_path'], "status": "failed", "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as pool:
+            return list(pool.map(run, uploads))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Single-Flight Request Coalescing
+Concurrent identical calls share one in-flight execution and its result
+"""
+
+import copy
+import threading
+import logging
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+class _Call:
+    """An execution other callers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Per-key call deduplication across threads.
+    The first caller for a key runs the function; callers arriving while
+    it is in flight block until it finishes and receive their own deep
+    copy of the result (or the same exception), so no caller can mutate
+    another's. Nothing is remembered afterwards: caching is
+    the response cache's job, this only collapses simultaneous calls.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self.metrics = metrics or get_metrics_registry()
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """Run func() once for all concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            self.metrics.inc("single_flight_shared")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently executing"""
+        with self._lock:
+            return len(self._calls)
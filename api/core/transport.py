@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Shared HTTP Transport
+One pooled keep-alive session for the Meta, Notion and n8n clients,
+with per-host pool sizing, a single retry policy and request metrics
+"""
+
+import re
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+# Path segments that are object ids (Graph numeric ids, Notion UUIDs)
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F-]{32,36})$')
+
+@dataclass
+class HostPoolConfig:
+    """Connection pool sizing for one host"""
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+
+@dataclass
+class RequestRecord:
+    """What a request hook sees for every call"""
+    client: str
+    method: str
+    host: str
+    endpoint: str
+    status: Optional[int]
+    latency: float
+    request_bytes: Optional[int]
+    response_bytes: int
+    error: Optional[str] = None
+
+# Methods the session retries on its own; a repeated write could create
+# duplicate pages, webhook runs or posts
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+def default_retry() -> Retry:
+    """
+    Retry policy shared by every client: connection errors and 5xx on
+    idempotent methods only. POST/PATCH are retried only when the caller
+    passes idempotent=True. 429s are left to the callers' rate limiters,
+    which know how long to wait.
+    """
+    return Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False
+    )
+
+def endpoint_template(url: str) -> str:
+    """URL path with object ids collapsed, e.g. '/v24.0/{id}/media'"""
+    path = urlparse(url).path or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+class HTTPTransport:
+    """
+    Pooled HTTP transport.
+    Pools are mounted per host prefix (requests picks the longest match),
+    so the n8n instance, Graph and Notion each get their own keep-alive
+    pool sized for their concurrency. Hooks receive a RequestRecord after
+    every request; the default hook publishes latency, bytes and status
+    per client and endpoint to the metrics registry.
+    """
+
+    def __init__(self, retry: Optional[Retry] = None,
+                 default_pool: Optional[HostPoolConfig] = None,
+                 host_pools: Optional[Dict[str, HostPoolConfig]] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.retry = retry or default_retry()
+        self.default_pool = default_pool or HostPoolConfig()
+        self.metrics = metrics or get_metrics_registry()
+        self.session = requests.Session()
+        self.host_pools: Dict[str, HostPoolConfig] = {}
+        self.hooks: List[Callable[[RequestRecord], None]] = [self._record_metrics]
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+        adapter = self._adapter(self.default_pool)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        for prefix, pool in (host_pools or {}).items():
+            self.configure_host(prefix, pool)
+
+    def _adapter(self, pool: HostPoolConfig) -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=pool.pool_connections,
+            pool_maxsize=pool.pool_maxsize,
+            max_retries=self.retry
+        )
+
+    def configure_host(self, prefix: str, pool: HostPoolConfig):
+        """
+        Give a host its own pool, e.g. configure_host("https://graph.facebook.com", ...).
+        A host that is already configured keeps the larger pool.
+        """
+        prefix = prefix.rstrip("/")
+        with self._lock:
+            current = self.host_pools.get(prefix)
+            if current and current.pool_maxsize >= pool.pool_maxsize:
+                return
+            self.host_pools[prefix] = pool
+            self.session.mount(prefix, self._adapter(pool))
+
+    def add_hook(self, hook: Callable[[RequestRecord], None]):
+        """Register a callback run after every request"""
+        self.hooks.append(hook)
+
+    def request(self, method: str, url: str, client: str = "http",
+                idempotent: bool = False, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session.
+        idempotent=True opts a POST/PATCH into the retry policy; only use it
+        where repeating the call is harmless (e.g. an upload chunk sent with
+        its offset).
+        """
+        attempt = 0
+        while True:
+            try:
+                response = self._send(method, url, client, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not self._retry_write(method, idempotent, attempt):
+                    raise
+            else:
+                if (response.status_code not in (self.retry.status_forcelist or ())
+                        or not self._retry_write(method, idempotent, attempt)):
+                    return response
+            attempt += 1
+
+    def _retry_write(self, method: str, idempotent: bool, attempt: int) -> bool:
+        """Sleep and return True when an opted-in write should be sent again"""
+        if not idempotent or method.upper() in IDEMPOTENT_METHODS or attempt >= (self.retry.total or 0):
+            return False
+        time.sleep((self.retry.backoff_factor or 0) * (2 ** attempt))
+        return True
+
+    def _send(self, method: str, url: str, client: str, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method=method, url=url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            self._run_hooks(RequestRecord(
+                client=client, method=method, host=urlparse(url).netloc,
+                endpoint=endpoint_template(url), status=None,
+                latency=time.perf_counter() - start,
+                request_bytes=0, response_bytes=0, error=type(e).__name__
+            ))
+            raise
+
+        try:
+            self._run_hooks(RequestRecord(
+                client=client, method=method, host=urlparse(url).netloc,
+                endpoint=endpoint_template(url), status=response.status_code,
+                latency=time.perf_counter() - start,
+                request_bytes=self._body_size(response),
+                response_bytes=len(response.content or b"")
+            ))
+        except Exception as e:
+            # Metrics never fail a request that already went through
+            self.logger.error(f"Transport metrics failed for {method} {url}: {e}")
+        return response
+
+    @staticmethod
+    def _body_size(response: requests.Response) -> Optional[int]:
+        """Request body size, or None for streamed bodies (generators, files)"""
+        body = response.request.body if response.request is not None else None
+        if body is None:
+            return 0
+        if isinstance(body, (bytes, bytearray, str)):
+            return len(body)
+        return None
+
+    def get(self, url: str, client: str = "http", **kwargs) -> requests.Response:
+        return self.request("GET", url, client, **kwargs)
+
+    def post(self, url: str, client: str = "http", **kwargs) -> requests.Response:
+        return self.request("POST", url, client, **kwargs)
+
+    def patch(self, url: str, client: str = "http", **kwargs) -> requests.Response:
+        return self.request("PATCH", url, client, **kwargs)
+
+    def _run_hooks(self, record: RequestRecord):
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                self.logger.error(f"Transport hook failed: {e}")
+
+    def _record_metrics(self, record: RequestRecord):
+        labels = {"client": record.client, "endpoint": record.endpoint,
+                  "method": record.method}
+        status = str(record.status) if record.status is not None else record.error
+        self.metrics.inc("http_requests_total", status=status, **labels)
+        self.metrics.observe("http_request_seconds", record.latency, **labels)
+        if record.request_bytes is not None:
+            self.metrics.inc("http_request_bytes", record.request_bytes, **labels)
+        self.metrics.inc("http_response_bytes", record.response_bytes, **labels)
+
+# Shared instance for all clients in the process
+_transport_instance: Optional[HTTPTransport] = None
+
+def get_shared_transport() -> HTTPTransport:
+    """Get or create the process-wide transport."""
+    global _transport_instance
+    if _transport_instance is None:
+        _transport_instance = HTTPTransport(host_pools={
+            "https://graph.facebook.com": HostPoolConfig(pool_connections=1, pool_maxsize=16),
+            "https://rupload.facebook.com": HostPoolConfig(pool_connections=1, pool_maxsize=4),
+            "https://api.notion.com": HostPoolConfig(pool_connections=1, pool_maxsize=8)
+        })
+    return _transport_instance
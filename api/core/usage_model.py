@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Meta Usage Model
+Live app/page quota usage from X-App-Usage, X-Page-Usage and
+X-Business-Use-Case-Usage response headers
+"""
+
+import json
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+
+from .metrics import MetricsRegistry, get_metrics_registry
+
+@dataclass
+class UsageSnapshot:
+    """Percent of quota used in Meta's current sliding window"""
+    call_count: float = 0.0
+    total_time: float = 0.0
+    total_cputime: float = 0.0
+    regain_seconds: float = 0.0
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def utilization(self) -> float:
+        """The dimension closest to its limit decides throttling"""
+        return max(self.call_count, self.total_time, self.total_cputime)
+
+    def merge(self, other: "UsageSnapshot") -> "UsageSnapshot":
+        """Worst-case combination of two reports for the same scope"""
+        return UsageSnapshot(
+            call_count=max(self.call_count, other.call_count),
+            total_time=max(self.total_time, other.total_time),
+            total_cputime=max(self.total_cputime, other.total_cputime),
+            regain_seconds=max(self.regain_seconds, other.regain_seconds),
+            updated_at=max(self.updated_at, other.updated_at)
+        )
+
+class MetaUsageModel:
+    """
+    Per-app and per-page usage as last reported by Meta.
+    Scopes use the rate limiter's bucket keys ("app:<id>", "page:<id>") so
+    the client can feed rate_scale() straight back into the limiter.
+    """
+
+    def __init__(self, app_id: str, target_utilization: float = 95.0,
+                 max_boost: float = 2.0, min_scale: float = 0.05,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.app_id = app_id
+        self.target_utilization = target_utilization
+        self.max_boost = max_boost
+        self.min_scale = min_scale
+        self.metrics = metrics or get_metrics_registry()
+        self.usage: Dict[str, UsageSnapshot] = {}
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _parse_json(raw: Optional[str]):
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _snapshot(data: Mapping) -> UsageSnapshot:
+        return UsageSnapshot(
+            call_count=float(data.get('call_count', 0) or 0),
+            total_time=float(data.get('total_time', 0) or 0),
+            total_cputime=float(data.get('total_cputime', 0) or 0),
+            # Meta reports minutes
+            regain_seconds=float(data.get('estimated_time_to_regain_access', 0) or 0) * 60
+        )
+
+    def parse_headers(self, headers: Mapping[str, str],
+                      page_id: str = None) -> Dict[str, UsageSnapshot]:
+        """Extract usage reports from one response's headers"""
+        reports: Dict[str, UsageSnapshot] = {}
+
+        def add(scope: str, snapshot: UsageSnapshot):
+            reports[scope] = reports[scope].merge(snapshot) if scope in reports else snapshot
+
+        app_usage = self._parse_json(headers.get('X-App-Usage'))
+        if isinstance(app_usage, dict):
+            add(f"app:{self.app_id}", self._snapshot(app_usage))
+
+        page_usage = self._parse_json(headers.get('X-Page-Usage'))
+        if isinstance(page_usage, dict) and page_id:
+            add(f"page:{page_id}", self._snapshot(page_usage))
+
+        buc_usage = self._parse_json(headers.get('X-Business-Use-Case-Usage'))
+        if isinstance(buc_usage, dict):
+            for object_id, entries in buc_usage.items():
+                for entry in entries if isinstance(entries, list) else [entries]:
+                    if isinstance(entry, dict):
+                        add(f"page:{object_id}", self._snapshot(entry))
+
+        return reports
+
+    def observe(self, headers: Mapping[str, str],
+                page_id: str = None) -> Dict[str, UsageSnapshot]:
+        """Update the model from response headers and publish metrics"""
+        reports = self.parse_headers(headers, page_id)
+        for scope, snapshot in reports.items():
+            self.usage[scope] = snapshot
+            self._publish(scope, snapshot)
+        return reports
+
+    def rate_scale(self, snapshot: UsageSnapshot) -> float:
+        """
+        Multiplier for the bucket's baseline refill rate.
+        1.0 at half the target utilization, up to max_boost when idle and
+        down to min_scale at the target.
+        """
+        headroom = (self.target_utilization - snapshot.utilization) / (self.target_utilization / 2)
+        return max(self.min_scale, min(self.max_boost, headroom))
+
+    def _publish(self, scope: str, snapshot: UsageSnapshot):
+        for kind in ('call_count', 'total_time', 'total_cputime'):
+            self.metrics.gauge("meta_usage_percent", getattr(snapshot, kind),
+                               scope=scope, kind=kind)
+        self.metrics.gauge("meta_usage_regain_seconds", snapshot.regain_seconds, scope=scope)
+        self.metrics.gauge("meta_rate_scale", self.rate_scale(snapshot), scope=scope)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Current model as plain dicts"""
+        return {
+            scope: {
+                "call_count": s.call_count,
+                "total_time": s.total_time,
+                "total_cputime": s.total_cputime,
+                "utilization": s.utilization,
+                "regain_seconds": s.regain_seconds,
+                "rate_scale": self.rate_scale(s),
+                "updated_at": s.updated_at
+            }
+            for scope, s in self.usage.items()
+        }
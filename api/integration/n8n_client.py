@@ -4,6 +4,8 @@ import requests
 import logging
 from typing import Dict, Any, Optional, List
 
+from api.core.transport import HTTPTransport, HostPoolConfig, get_shared_transport
+
 logger = logging.getLogger(__name__)
 
 class N8nClient:
@@ -15,18 +17,24 @@ class N8nClient:
         Auto-Notion (AI Agent) → n8n (Webhook) → Instagram/Notion/APIs
     """
     
-    def __init__(self, base_url: str = "http://localhost:5678"):
+    def __init__(self, base_url: str = "http://localhost:5678",
+                 transport: Optional[HTTPTransport] = None):
         """
         Initialize n8n client.
         
         Args:
             base_url: Base URL for n8n instance (default: http://localhost:5678)
+            transport: HTTP transport (default: the shared keep-alive transport)
         """
         self.base_url = os.getenv("N8N_BASE_URL", base_url)
         self.webhook_base = f"{self.base_url}/webhook"
         self.api_key = os.getenv("N8N_API_KEY")  # Optional: for n8n API access
         self._is_connected = None
         
+        # Reuse connections to the n8n instance instead of one per webhook
+        self.transport = transport or get_shared_transport()
+        self.transport.configure_host(self.base_url, HostPoolConfig(pool_connections=1, pool_maxsize=4))
+        
     @property
     def headers(self) -> Dict[str, str]:
         """Get headers for API requests."""
@@ -45,14 +53,14 @@ class N8nClient:
         try:
             # Try to hit the n8n health check or root
             # n8n exposes /healthz for health checks
-            response = requests.get(f"{self.base_url}/healthz", timeout=2)
+            response = self.transport.get(f"{self.base_url}/healthz", client="n8n", timeout=2)
             
             if response.status_code == 200:
                 self._is_connected = True
                 return True
                 
             # Fallback: try root if healthz fails (older versions)
-            response = requests.get(self.base_url, timeout=2)
+            response = self.transport.get(self.base_url, client="n8n", timeout=2)
             self._is_connected = response.status_code in [200, 401, 403, 404]
             return self._is_connected
             
@@ -79,7 +87,8 @@ class N8nClient:
         url = f"{self.webhook_base}/{webhook_path}"
         try:
             logger.info(f"Triggering n8n webhook: {url}")
-            response = requests.post(url, json=data, headers=self.headers, timeout=30)
+            response = self.transport.post(url, client="n8n", json=data,
+                                           headers=self.headers, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.Timeout:
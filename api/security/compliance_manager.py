@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 import logging
 from enum import Enum
 
+from api.core.log_writer import get_log_writer, Durability
+
 class ComplianceLevel(Enum):
     """Compliance level enum"""
     FULL = "full_compliance"
@@ -249,15 +251,8 @@ class AutoNotionCompliance:
             "record": record
         }
         
-        audit_file = f"logs/compliance/deletion_{datetime.now().strftime('%Y%m%d')}.json"
-        
-        try:
-            os.makedirs(os.path.dirname(audit_file), exist_ok=True)
-            with open(audit_file, 'a') as f:
-                json.dump(audit_log, f)
-                f.write('\n')
-        except Exception as e:
-            self.logger.error(f"Failed to log deletion audit: {e}")
+        # Audit lines reach the OS before we return
+        get_log_writer("logs/compliance", "deletion", durability=Durability.FLUSH).write(audit_log)
     
     def _check_gdpr_compliance(self) -> bool:
         """Check GDPR compliance status"""
@@ -9,6 +9,8 @@ import json
 from datetime import datetime
 from typing import Dict, List
 
+from api.core.log_writer import get_log_writer, Durability
+
 class RiskGuard:
     """
     Protects the organization from 'Mission Drift' and 'Low Frequency' automation.
@@ -73,14 +75,8 @@ class RiskGuard:
             "institutional_status": "VERIFIED" if self.is_active else "HALTED"
         }
         
-        log_file = f"logs/audit/events_{datetime.now().strftime('%Y%m%d')}.json"
-        try:
-            import os
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            with open(log_file, "a") as f:
-                f.write(json.dumps(event) + "\n")
-        except Exception as e:
-            self.logger.error(f"Failed to log verifiable event: {e}")
+        # Audit lines reach the OS before we return
+        get_log_writer("logs/audit", "events", durability=Durability.FLUSH).write(event)
 
     def _contains_impulsive_patterns(self, content: Dict) -> bool:
         """Detect low-frequency, impulsive keywords or structures"""
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Token Lifecycle Manager
+Caches debug_token results and rotates long-lived tokens in the
+background before they expire
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from api.core.institutional_meta import InstitutionalMetaClient
+from api.core.meta_client_v24 import MetaAPIError
+from api.security.vault_manager import InstitutionalVault
+
+# Meta's code for expired or invalidated tokens
+TOKEN_EXPIRED_CODE = 190
+
+@dataclass
+class TokenInfo:
+    """What debug_token reported for a token"""
+    name: str
+    token: str
+    is_valid: bool = True
+    expires_at: float = 0.0               # 0 = never expires
+    data_access_expires_at: float = 0.0
+    scopes: List[str] = field(default_factory=list)
+    checked_at: float = 0.0
+    error: Optional[str] = None
+
+    def seconds_left(self, now: float) -> float:
+        return float('inf') if not self.expires_at else self.expires_at - now
+
+class TokenManager:
+    """
+    In-memory token registry for publishers.
+    get() never touches the network: it returns the current token or
+    raises straight away if the token is known to be dead, so a batch
+    skips that page instead of failing half-way. A background thread
+    re-inspects tokens periodically, rotates them `refresh_margin`
+    seconds before expiry and stores the new ones in the vault. Any
+    code 190 the client sees marks the rejected token invalid.
+    """
+
+    def __init__(self, client: InstitutionalMetaClient,
+                 vault: Optional[InstitutionalVault] = None,
+                 refresh_margin: float = 7 * 86400,
+                 recheck_interval: float = 6 * 3600,
+                 poll_interval: float = 300.0,
+                 on_rotated: Optional[Callable[[str, str], None]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.client = client
+        self.vault = vault or InstitutionalVault()
+        self.refresh_margin = refresh_margin
+        self.recheck_interval = recheck_interval
+        self.poll_interval = poll_interval
+        self.on_rotated = on_rotated
+        self.clock = clock
+        self.tokens: Dict[str, TokenInfo] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = logging.getLogger(__name__)
+        client.on_invalid_token = self.report_invalid_token
+
+    # ==================== REGISTRY ====================
+
+    def register(self, name: str, token: str = None, inspect: bool = True) -> TokenInfo:
+        """
+        Track a token under a name (e.g. "PAGE_TOKEN_123456789").
+        Without a token the vault copy is used; a given token is stored.
+        """
+        if token is None:
+            token = self.vault.get_token(name)
+            if token is None:
+                raise MetaAPIError(f"No token named {name} in the vault")
+        else:
+            self.vault.store_token(name, token)
+
+        with self._lock:
+            self.tokens[name] = TokenInfo(name=name, token=token)
+        return self.inspect(name) if inspect else self.tokens[name]
+
+    def get(self, name: str) -> str:
+        """Current token for a name, without a network call"""
+        with self._lock:
+            info = self.tokens.get(name)
+        if info is None:
+            raise MetaAPIError(f"Unknown token {name}")
+        if not info.is_valid or info.seconds_left(self.clock()) <= 0:
+            raise MetaAPIError(f"Token {name} is expired or invalid: {info.error}",
+                               code=TOKEN_EXPIRED_CODE)
+        return info.token
+
+    def page_token(self, page_id: str) -> str:
+        """Token for an Instagram account, registered as PAGE_TOKEN_<page_id>"""
+        return self.get(f"PAGE_TOKEN_{page_id}")
+
+    def info(self, name: str) -> Optional[TokenInfo]:
+        """Cached debug_token data for a name"""
+        with self._lock:
+            return self.tokens.get(name)
+
+    def report_invalid(self, name: str, error: str = None):
+        """A call failed with code 190: stop handing the token out"""
+        with self._lock:
+            info = self.tokens.get(name)
+            if info is not None:
+                info.is_valid = False
+                info.error = error or "Rejected by Meta"
+                info.checked_at = 0.0
+                self.logger.warning(f"Token {name} rejected by Meta: {info.error}")
+
+    def report_invalid_token(self, token: str, error: str = None):
+        """report_invalid() for whichever name currently holds `token`"""
+        with self._lock:
+            names = [name for name, info in self.tokens.items() if info.token == token]
+        for name in names:
+            self.report_invalid(name, error)
+
+    # ==================== INSPECTION ====================
+
+    def inspect(self, name: str, force: bool = False) -> TokenInfo:
+        """Refresh the cached debug_token result if it is older than recheck_interval"""
+        with self._lock:
+            info = self.tokens[name]
+        now = self.clock()
+        if not force and info.checked_at and now - info.checked_at < self.recheck_interval:
+            return info
+
+        try:
+            data = self.client.validate_app_access_token(info.token).get('data', {})
+        except MetaAPIError as e:
+            self.logger.warning(f"debug_token failed for {name}: {e}")
+            return info
+
+        with self._lock:
+            info.is_valid = bool(data.get('is_valid'))
+            info.expires_at = float(data.get('expires_at') or 0)
+            info.data_access_expires_at = float(data.get('data_access_expires_at') or 0)
+            info.scopes = data.get('scopes', [])
+            info.error = data.get('error', {}).get('message')
+            info.checked_at = now
+        return info
+
+    # ==================== ROTATION ====================
+
+    def _needs_rotation(self, info: TokenInfo, now: float) -> bool:
+        return info.is_valid and info.seconds_left(now) < self.refresh_margin
+
+    def rotate(self, name: str) -> str:
+        """Exchange a token for a fresh long-lived one and persist it"""
+        with self._lock:
+            old_token = self.tokens[name].token
+        new_token = self.client.rotate_token(old_token)
+        self.vault.store_token(name, new_token)
+
+        with self._lock:
+            self.tokens[name] = TokenInfo(name=name, token=new_token)
+        self.inspect(name, force=True)
+
+        self.logger.info(f"Rotated token {name}")
+        if self.on_rotated:
+            self.on_rotated(name, new_token)
+        return new_token
+
+    def refresh_due(self) -> List[str]:
+        """Re-inspect stale entries and rotate tokens close to expiry"""
+        rotated = []
+        for name in list(self.tokens):
+            info = self.inspect(name)
+            if not self._needs_rotation(info, self.clock()):
+                continue
+            try:
+                self.rotate(name)
+                rotated.append(name)
+            except MetaAPIError as e:
+                self.logger.error(f"Rotation of {name} failed: {e}")
+        return rotated
+
+    def start(self):
+        """Run refresh_due every poll_interval on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-manager", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh_due()
+            except Exception as e:
+                self.logger.error(f"Token refresh loop failed: {e}")
+            self._stop.wait(self.poll_interval)
@@ -5,6 +5,7 @@ AES-256-GCM Encryption for secure credential storage
 """
 
 import os
+import json
 import base64
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -64,7 +65,6 @@ class InstitutionalVault:
         
         vault[name] = encrypted
         with open(vault_path, "w") as f:
-            import json
             json.dump(vault, f, indent=2)
             
     def get_token(self, name: str) -> str:
@@ -74,7 +74,6 @@ class InstitutionalVault:
             return None
             
         with open(vault_path, "r") as f:
-            import json
             vault = json.load(f)
             
         encrypted = vault.get(name)
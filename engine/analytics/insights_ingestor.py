@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Insights Ingestor
+Incremental Instagram insights download with per-metric watermarks
+and an append-only local store
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from api.core.meta_client_v24 import MetaGraphClient, MetaAPIError
+
+# Graph rejects insights ranges longer than 30 days
+MAX_WINDOW = timedelta(days=30)
+
+def _parse_end_time(end_time: str) -> int:
+    """Graph end_time ("2026-01-01T08:00:00+0000") as a Unix timestamp"""
+    return int(datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+class InsightsIngestor:
+    """
+    Nightly insights sync for the fleet.
+    For every page and metric the state file keeps a high watermark (the
+    newest end_time stored) plus the values of the last `lookback` days.
+    Each run only asks Graph for [watermark - lookback, now]: the overlap
+    is how late corrections from Meta are caught, and a row is appended
+    to the store only when it is new or its value changed. Reading a
+    page's store and keeping the last row per (metric, period, end_time)
+    gives the corrected series.
+    """
+
+    def __init__(self, client: MetaGraphClient, data_root: str = "data/insights",
+                 lookback: timedelta = timedelta(days=3),
+                 initial_history: timedelta = timedelta(days=30),
+                 period: str = 'day'):
+        self.client = client
+        self.data_root = data_root
+        self.lookback = lookback
+        self.initial_history = initial_history
+        self.period = period
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== STATE ====================
+
+    def _state_path(self, page_id: str) -> str:
+        return os.path.join(self.data_root, f"{page_id}.state.json")
+
+    def store_path(self, page_id: str) -> str:
+        """Append-only JSONL file holding every ingested row for a page"""
+        return os.path.join(self.data_root, f"{page_id}.jsonl")
+
+    def _load_state(self, page_id: str) -> Dict:
+        path = self._state_path(page_id)
+        if not os.path.exists(path):
+            return {"watermarks": {}, "recent": {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_state(self, page_id: str, state: Dict):
+        os.makedirs(self.data_root, exist_ok=True)
+        path = self._state_path(page_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def watermark(self, page_id: str, metric: str) -> Optional[int]:
+        """Newest end_time stored for a metric (None = never ingested)"""
+        return self._load_state(page_id)["watermarks"].get(metric)
+
+    # ==================== PLANNING ====================
+
+    def _start_for(self, state: Dict, metric: str, now: datetime) -> int:
+        watermark = state["watermarks"].get(metric)
+        if watermark is None:
+            return int((now - self.initial_history).timestamp())
+        return int(watermark - self.lookback.total_seconds())
+
+    def _windows(self, since: int, until: int) -> Iterator[Tuple[int, int]]:
+        """Split [since, until] into ranges Graph accepts"""
+        step = int(MAX_WINDOW.total_seconds())
+        while since < until:
+            yield since, min(since + step, until)
+            since += step
+
+    # ==================== INGESTION ====================
+
+    def ingest_page(self, page_id: str, access_token: str, metrics: List[str],
+                    now: datetime = None) -> Dict[str, int]:
+        """Fetch new and corrected values for one page; returns rows appended per metric"""
+        now = (now or datetime.now(timezone.utc)).replace(minute=0, second=0, microsecond=0)
+        until = int(now.timestamp())
+        state = self._load_state(page_id)
+
+        # Metrics that start at the same point share requests
+        groups: Dict[int, List[str]] = {}
+        for metric in metrics:
+            groups.setdefault(self._start_for(state, metric, now), []).append(metric)
+
+        appended = {metric: 0 for metric in metrics}
+        rows = []
+        for since, group in sorted(groups.items()):
+            for window_since, window_until in self._windows(since, until):
+                for row in self.client.iter_insights(page_id, access_token, group,
+                                                     self.period, window_since, window_until):
+                    if row['end_time'] is None or row['metric'] not in appended:
+                        continue
+                    if self._merge(state, row):
+                        rows.append(row)
+                        appended[row['metric']] += 1
+
+        self._append(page_id, rows)
+        self._trim(state)
+        self._save_state(page_id, state)
+        self.logger.info(f"Ingested {len(rows)} insight rows for {page_id}")
+        return appended
+
+    def _merge(self, state: Dict, row: Dict) -> bool:
+        """Record a row; False if it repeats the stored value"""
+        metric = row['metric']
+        end_ts = _parse_end_time(row['end_time'])
+        recent = state["recent"].setdefault(metric, {})
+        key = str(end_ts)
+        if key in recent and recent[key] == row['value']:
+            return False
+
+        recent[key] = row['value']
+        watermark = state["watermarks"].get(metric)
+        if watermark is None or end_ts > watermark:
+            state["watermarks"][metric] = end_ts
+        return True
+
+    def _trim(self, state: Dict):
+        """Forget values the next run will not fetch again"""
+        for metric, values in state["recent"].items():
+            horizon = state["watermarks"].get(metric, 0) - self.lookback.total_seconds()
+            state["recent"][metric] = {k: v for k, v in values.items() if int(k) >= horizon}
+
+    def _append(self, page_id: str, rows: List[Dict]):
+        if not rows:
+            return
+        os.makedirs(self.data_root, exist_ok=True)
+        ingested_at = int(time.time())
+        with open(self.store_path(page_id), 'a') as f:
+            for row in rows:
+                f.write(json.dumps({**row, "page_id": page_id, "ingested_at": ingested_at}) + "\n")
+
+    def ingest_fleet(self, pages: Dict[str, str], metrics: List[str]) -> Dict[str, Dict]:
+        """Run ingest_page for every {page_id: access_token}; failures are reported per page"""
+        report = {}
+        for page_id, access_token in pages.items():
+            try:
+                report[page_id] = {"status": "ok",
+                                   "appended": self.ingest_page(page_id, access_token, metrics)}
+            except (MetaAPIError, OSError) as e:
+                self.logger.error(f"Insights ingestion failed for {page_id}: {e}")
+                report[page_id] = {"status": "failed", "error": str(e)}
+        return report
+
+    # ==================== READING ====================
+
+    def read(self, page_id: str, metric: str = None) -> List[Dict]:
+        """Corrected series: last stored row per (metric, period, end_time), oldest first"""
+        path = self.store_path(page_id)
+        if not os.path.exists(path):
+            return []
+        latest: Dict[Tuple, Dict] = {}
+        with open(path) as f:
+            for line in f:
+                row = json.loads(line)
+                if metric is None or row['metric'] == metric:
+                    latest[(row['metric'], row['period'], row['end_time'])] = row
+        return sorted(latest.values(), key=lambda r: (r['end_time'], r['metric']))
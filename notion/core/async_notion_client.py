@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Async Notion Client
+Paced, concurrent Notion calls on top of NotionClient
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .notion_client import NotionClient, NotionPage, NotionRateLimited, flatten_block_tree
+
+class AsyncNotionClient:
+    """
+    asyncio front-end for NotionClient.
+    Requests run on a small worker pool through the same pacing, breaker
+    and transport as the sync client. The wrapped client is non-blocking:
+    when no pacing slot is free (or Notion answers 429) the coroutine
+    awaits Retry-After instead of parking a worker thread, so bulk
+    operations run at Notion's rate limit rather than at request latency.
+    """
+
+    def __init__(self, api_key: str = None, client: Optional[NotionClient] = None,
+                 max_concurrency: int = 3, max_rate_limit_wait: float = 120.0):
+        # A non-blocking view: sync users of a shared client keep their pacing sleeps
+        self.sync = client.non_blocking() if client else NotionClient(api_key, block=False)
+        self.max_concurrency = max_concurrency
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="notion")
+
+    async def __aenter__(self) -> "AsyncNotionClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Release worker threads"""
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a client call in the pool, awaiting rate-limit waits"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return await loop.run_in_executor(self._executor,
+                                                  partial(func, *args, **kwargs))
+            except NotionRateLimited as e:
+                if e.retry_after > self.max_rate_limit_wait:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    # ==================== API METHODS ====================
+
+    async def create_page(self, page: NotionPage) -> Dict:
+        """Create a new page in Notion database"""
+        return await self._call(self.sync.create_page, page)
+
+    async def update_page(self, page_id: str, properties: Dict, force: bool = False) -> Dict:
+        """Update existing Notion page (changed properties only)"""
+        return await self._call(self.sync.update_page, page_id, properties, force)
+
+    async def query_database(self, database_id: str, filter_obj: Dict = None,
+                             sorts: List[Dict] = None, start_cursor: str = None,
+                             page_size: int = None) -> Dict:
+        """Query Notion database (one page of up to 100 results)"""
+        return await self._call(self.sync.query_database, database_id, filter_obj,
+                                sorts, start_cursor, page_size)
+
+    async def iter_database(self, database_id: str, filter_obj: Dict = None,
+                            sorts: List[Dict] = None, page_size: int = 100,
+                            prefetch: bool = False) -> AsyncIterator[Dict]:
+        """Async counterpart of NotionClient.iter_database"""
+        def fetch(cursor: Optional[str]):
+            return self.query_database(database_id, filter_obj, sorts, cursor, page_size)
+
+        response = await fetch(None)
+        while True:
+            upcoming = None
+            if response.get("has_more") and prefetch:
+                upcoming = asyncio.ensure_future(fetch(response.get("next_cursor")))
+            try:
+                for page in response.get("results", []):
+                    yield page
+            except GeneratorExit:
+                if upcoming:
+                    upcoming.cancel()
+                raise
+            if not response.get("has_more"):
+                return
+            response = await (upcoming or fetch(response.get("next_cursor")))
+
+    async def append_block_children(self, block_id: str, children: List[Dict]) -> List[Dict]:
+        """Append blocks under a page or block, 100 per request"""
+        return await self._call(self.sync.append_block_children, block_id, children)
+
+    async def get_page_content(self, page_id: str, start_cursor: str = None) -> Dict:
+        """Get one page (up to 100) of a page's or block's child blocks"""
+        return await self._call(self.sync.get_page_content, page_id, start_cursor)
+
+    async def get_block_children(self, block_id: str) -> List[Dict]:
+        """Every child block of a page or block, following next_cursor"""
+        blocks, cursor = [], None
+        while True:
+            response = await self.get_page_content(block_id, cursor)
+            blocks.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return blocks
+            cursor = response.get("next_cursor")
+
+    async def get_block_tree(self, page_id: str, max_depth: Optional[int] = None) -> List[Dict]:
+        """Async counterpart of NotionClient.get_block_tree (bounded by max_concurrency)"""
+        children: Dict[str, List[Dict]] = {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def walk(block_id: str, depth: int):
+            async with semaphore:
+                children[block_id] = await self.get_block_children(block_id)
+            if max_depth is not None and depth >= max_depth:
+                return
+            nested = [block["id"] for block in children[block_id] if block.get("has_children")]
+            await asyncio.gather(*(walk(child, depth + 1) for child in nested))
+
+        await walk(page_id, 0)
+        return flatten_block_tree(page_id, children, max_depth)
+
+    # ==================== BULK OPERATIONS ====================
+
+    async def bulk(self, operations: List[Callable[[], Awaitable[Any]]],
+                   concurrency: Optional[int] = None) -> List[Any]:
+        """
+        Run coroutine factories with at most `concurrency` in flight.
+        Results keep input order: the value or the exception raised.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_concurrency)
+
+        async def run(operation):
+            async with semaphore:
+                return await operation()
+
+        return await asyncio.gather(*(run(op) for op in operations), return_exceptions=True)
+
+    async def create_pages(self, pages: List[NotionPage]) -> List[Any]:
+        """Create many pages concurrently"""
+        return await self.bulk([partial(self.create_page, page) for page in pages])
+
+    async def update_pages(self, updates: List[Tuple[str, Dict]]) -> List[Any]:
+        """Apply many (page_id, properties) updates concurrently"""
+        return await self.bulk([partial(self.update_page, page_id, properties)
+                                for page_id, properties in updates])
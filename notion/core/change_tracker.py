@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Change Tracker
+Remembers what was last written to each Notion page so updates carry
+only the properties that changed
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+class ChangeTracker:
+    """
+    Per-page, per-property hashes of the payloads we last wrote.
+    diff() returns the subset of a property payload whose hashes differ;
+    an empty diff means the update can be skipped. Only our own writes
+    are tracked, so edits made in Notion by hand are not overwritten
+    unless the value we want to write changes too (or forget()/force is used).
+    With a path the hashes survive restarts, which is what makes nightly
+    refreshes cheap.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._memory: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn().execute(
+                "CREATE TABLE IF NOT EXISTS property_hashes ("
+                "page_id TEXT, property TEXT, hash TEXT, PRIMARY KEY (page_id, property))"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def property_hash(value: Any) -> str:
+        """Stable hash of one property payload"""
+        raw = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+    def _hashes(self, page_id: str) -> Dict[str, str]:
+        with self._lock:
+            cached = self._memory.get(page_id)
+        if cached is not None or not self.path:
+            return cached or {}
+        rows = self._conn().execute(
+            "SELECT property, hash FROM property_hashes WHERE page_id = ?", (page_id,)
+        ).fetchall()
+        hashes = dict(rows)
+        with self._lock:
+            self._memory[page_id] = hashes
+        return hashes
+
+    def diff(self, page_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Properties whose payload differs from the last one written"""
+        known = self._hashes(page_id)
+        return {name: value for name, value in properties.items()
+                if known.get(name) != self.property_hash(value)}
+
+    def record(self, page_id: str, properties: Dict[str, Any]):
+        """Remember a successful write"""
+        hashes = {name: self.property_hash(value) for name, value in properties.items()}
+        current = self._hashes(page_id)
+        with self._lock:
+            self._memory[page_id] = {**current, **hashes}
+        if self.path:
+            self._conn().executemany(
+                "INSERT OR REPLACE INTO property_hashes (page_id, property, hash) VALUES (?, ?, ?)",
+                [(page_id, name, h) for name, h in hashes.items()]
+            )
+
+    def forget(self, page_id: str):
+        """Drop what we know about a page; its next update is sent in full"""
+        with self._lock:
+            self._memory.pop(page_id, None)
+        if self.path:
+            self._conn().execute("DELETE FROM property_hashes WHERE page_id = ?", (page_id,))
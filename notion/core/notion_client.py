@@ -5,13 +5,81 @@ Synchronizes Instagram content with Notion databases
 """
 
 import os
+import copy
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 import requests
 from dataclasses import dataclass, asdict
 from enum import Enum
 import logging
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from api.core.transport import HTTPTransport, get_shared_transport, endpoint_template
+from api.core.circuit_breaker import CircuitBreakerRegistry
+from api.core.rate_limiter import TokenBucketLimiter, BucketSpec
+from api.core.log_writer import get_log_writer, Durability
+from notion.core.properties import plain_value, block_text
+from notion.core.change_tracker import ChangeTracker
+from notion.core.reconcile import Reconciler, ReconcileReport
+from notion.core.property_serializers import (PropertySerializer, NotionSchemaError,
+                                              MAX_TEXT_LENGTH, rich_text)
+
+# Notion's documented average limit per integration, with a small burst
+NOTION_RATE = BucketSpec(capacity=3, refill_per_second=3.0)
+
+# Most blocks Notion accepts in one create or children-append request
+MAX_CHILDREN_PER_REQUEST = 100
+
+# Hashes of our last writes, kept between runs so nightly refreshes skip unchanged rows
+DEFAULT_CHANGE_TRACKER_PATH = ".cache/notion_property_hashes.db"
+
+# Graph media fields needed to build a post page
+POST_MEDIA_FIELDS = ['id', 'caption', 'media_type', 'media_url', 'permalink',
+                     'timestamp', 'like_count', 'comments_count']
+
+class NotionRateLimited(Exception):
+    """Raised instead of sleeping when a non-blocking client has no free slot"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class NotionCircuitOpenError(requests.exceptions.RequestException):
+    """Raised without a network call while a Notion endpoint breaker is open"""
+    
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def flatten_block_tree(root_id: str, children: Dict[str, List[Dict]],
+                       max_depth: Optional[int] = None) -> List[Dict]:
+    """
+    Blocks fetched per parent, flattened in document order.
+    Each entry: id, parent_id, depth (0 for top-level blocks), type,
+    plain text, has_children and the type-specific payload.
+    """
+    flat = []
+    stack = [(block, 0, root_id) for block in reversed(children.get(root_id, []))]
+    while stack:
+        block, depth, parent_id = stack.pop()
+        flat.append({
+            "id": block["id"],
+            "parent_id": parent_id,
+            "depth": depth,
+            "type": block.get("type"),
+            "text": block_text(block),
+            "has_children": bool(block.get("has_children")),
+            "data": block.get(block.get("type"), {}),
+        })
+        if max_depth is None or depth < max_depth:
+            stack.extend((child, depth + 1, block["id"])
+                         for child in reversed(children.get(block["id"], [])))
+    return flat
 
 class NotionDatabase(Enum):
     """Notion database IDs for Auto-Notion"""
@@ -29,16 +97,26 @@ class NotionPage:
     content: Optional[List[Dict]] = None
     
     def to_notion_format(self) -> Dict:
-        """Convert to Notion API format"""
-        return {
+        """Convert to Notion API format (with the first chunk of content blocks)"""
+        data = {
             "parent": {"database_id": self.database_id},
             "properties": self.properties
         }
+        if self.content:
+            data["children"] = self.content[:MAX_CHILDREN_PER_REQUEST]
+        return data
+    
+    def remaining_content(self) -> List[Dict]:
+        """Content blocks that do not fit in the create request"""
+        return (self.content or [])[MAX_CHILDREN_PER_REQUEST:]
 
 class NotionClient:
     """Notion API client for Auto-Notion"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, transport: Optional[HTTPTransport] = None,
+                 rate_limit_ledger: Optional[str] = None, max_retries: int = 5,
+                 backoff: float = 1.0, jitter: float = 0.25, block: bool = True,
+                 change_tracker: Optional[ChangeTracker] = None):
         self.api_key = api_key
         self.base_url = "https://api.notion.com/v1"
         self.headers = {
@@ -46,63 +124,327 @@ class NotionClient:
             "Content-Type": "application/json",
             "Notion-Version": "2022-06-28"
         }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
+        self.transport = transport or get_shared_transport()
+        self.breakers = CircuitBreakerRegistry()
         self.logger = logging.getLogger(__name__)
+        
+        # Pacing is per integration token; a ledger shares it between processes
+        self.rate_limiter = TokenBucketLimiter({"notion": NOTION_RATE},
+                                               ledger_path=rate_limit_ledger)
+        self._rate_keys = [f"notion:{hashlib.sha256(api_key.encode()).hexdigest()[:12]}"]
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.jitter = jitter
+        # False: raise NotionRateLimited instead of sleeping (async front-end)
+        self.block = block
+        
+        # Hashes of what we last wrote, so unchanged properties are not re-sent
+        self.change_tracker = change_tracker or ChangeTracker(DEFAULT_CHANGE_TRACKER_PATH)
+    
+    def non_blocking(self) -> "NotionClient":
+        """
+        A view of this client that raises NotionRateLimited instead of
+        sleeping. It shares the transport, limiter, breakers and change
+        tracker, so pacing stays global; this client is left as it is.
+        """
+        view = copy.copy(self)
+        view.block = False
+        return view
+    
+    def _wait_for_slot(self):
+        """Take a pacing slot, sleeping for it unless the client is non-blocking"""
+        while True:
+            wait = self.rate_limiter.try_acquire(self._rate_keys)
+            if wait <= 0:
+                return
+            if not self.block:
+                raise NotionRateLimited(f"Notion rate limit; next slot in {wait:.2f}s",
+                                        retry_after=wait)
+            time.sleep(wait)
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Retry-After when Notion sends it, exponential backoff otherwise, plus jitter"""
+        try:
+            delay = float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            delay = self.backoff * (2 ** attempt)
+        return delay * (1 + random.uniform(0, self.jitter))
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Paced request through the shared transport.
+        429s are retried after Retry-After (jittered) up to max_retries;
+        the wait is also charged to the limiter so other threads back off.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_slot()
+            response = self._send(method, url, **kwargs)
+            if response.status_code != 429:
+                return response
+            
+            delay = self._retry_delay(response, attempt)
+            self.rate_limiter.penalize(self._rate_keys, delay)
+            if not self.block:
+                raise NotionRateLimited(f"Rate limited by Notion; retry in {delay:.1f}s",
+                                        retry_after=delay)
+            self.logger.warning(f"Rate limited by Notion; retry {attempt + 1}/{self.max_retries} "
+                                f"in {delay:.1f}s")
+            time.sleep(delay)
+        return response
+    
+    def _request_after_write(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Paced request that follows a write which already went through.
+        It always waits for its slot, even on a non-blocking client, because
+        retrying the whole operation from the top would repeat that write.
+        """
+        while True:
+            try:
+                return self._request(method, url, **kwargs)
+            except NotionRateLimited as e:
+                time.sleep(e.retry_after)
+    
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send one request, guarded by a per-endpoint breaker"""
+        family = endpoint_template(url).replace("/v1/", "", 1)
+        breaker_keys = [f"notion:{family}"]
+        wait = self.breakers.allow(breaker_keys)
+        if wait > 0:
+            raise NotionCircuitOpenError(
+                f"Circuit open for Notion {family}; retry in {wait:.0f} seconds",
+                retry_after=wait
+            )
+        
+        start = time.monotonic()
+        try:
+            response = self.transport.request(method, url, client="notion",
+                                              headers=self.headers, timeout=30, **kwargs)
+        except requests.exceptions.RequestException:
+            self.breakers.record(breaker_keys, failed=True, latency=time.monotonic() - start)
+            raise
+        self.breakers.record(breaker_keys, failed=response.status_code >= 500,
+                             latency=time.monotonic() - start)
+        return response
     
     def create_page(self, page: NotionPage) -> Dict:
-        """Create a new page in Notion database"""
+        """
+        Create a new page in Notion database.
+        Content beyond the first 100 blocks is appended afterwards. The page
+        exists once the create succeeds, so a failed append is logged and
+        reported as result["content_error"] rather than raised.
+        """
         url = f"{self.base_url}/pages"
         data = page.to_notion_format()
         
         try:
-            response = self.session.post(url, json=data)
+            response = self._request('POST', url, json=data)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to create Notion page: {e}")
             raise
+        
+        self.change_tracker.record(result["id"], page.properties)
+        
+        remaining = page.remaining_content()
+        if remaining:
+            try:
+                self._append_batches(result["id"], remaining, after_write=True)
+            except requests.exceptions.RequestException as e:
+                result["content_error"] = str(e)
+        return result
     
-    def update_page(self, page_id: str, properties: Dict) -> Dict:
-        """Update existing Notion page"""
+    def update_page(self, page_id: str, properties: Dict, force: bool = False) -> Dict:
+        """
+        Update existing Notion page with only the properties that changed
+        since our last write. Returns {"id": ..., "unchanged": True}
+        without calling Notion when nothing changed.
+        """
+        changed = properties if force else self.change_tracker.diff(page_id, properties)
+        if not changed:
+            return {"object": "page", "id": page_id, "unchanged": True}
+        
         url = f"{self.base_url}/pages/{page_id}"
-        data = {"properties": properties}
+        data = {"properties": changed}
         
         try:
-            response = self.session.patch(url, json=data)
+            response = self._request('PATCH', url, json=data)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to update Notion page: {e}")
             raise
+        
+        self.change_tracker.record(page_id, changed)
+        return result
     
-    def query_database(self, database_id: str, filter_obj: Dict = None) -> Dict:
-        """Query Notion database"""
+    def get_database(self, database_id: str) -> Dict:
+        """Database object, including its property schema"""
+        url = f"{self.base_url}/databases/{database_id}"
+        
+        try:
+            response = self._request('GET', url)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Failed to get Notion database: {e}")
+            raise
+    
+    def query_database(self, database_id: str, filter_obj: Dict = None,
+                       sorts: List[Dict] = None, start_cursor: str = None,
+                       page_size: int = None) -> Dict:
+        """Query Notion database (one page of up to 100 results)"""
         url = f"{self.base_url}/databases/{database_id}/query"
         data = {}
         
         if filter_obj:
             data["filter"] = filter_obj
+        if sorts:
+            data["sorts"] = sorts
+        if start_cursor:
+            data["start_cursor"] = start_cursor
+        if page_size:
+            data["page_size"] = min(page_size, 100)
         
         try:
-            response = self.session.post(url, json=data)
+            response = self._request('POST', url, json=data)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to query Notion database: {e}")
             raise
     
-    def get_page_content(self, page_id: str) -> Dict:
-        """Get page content blocks"""
+    def iter_database(self, database_id: str, filter_obj: Dict = None,
+                      sorts: List[Dict] = None, page_size: int = 100,
+                      prefetch: bool = False) -> Iterator[Dict]:
+        """
+        Yield every page of a database query, following next_cursor.
+        With prefetch=True the next batch is requested while the caller
+        works through the current one.
+        """
+        def fetch(cursor: Optional[str]) -> Dict:
+            return self.query_database(database_id, filter_obj, sorts, cursor, page_size)
+        
+        if not prefetch:
+            cursor = None
+            while True:
+                response = fetch(cursor)
+                yield from response.get("results", [])
+                if not response.get("has_more"):
+                    return
+                cursor = response.get("next_cursor")
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            response = fetch(None)
+            while True:
+                upcoming = None
+                if response.get("has_more"):
+                    upcoming = pool.submit(fetch, response.get("next_cursor"))
+                try:
+                    yield from response.get("results", [])
+                except GeneratorExit:
+                    if upcoming:
+                        upcoming.cancel()
+                    raise
+                if upcoming is None:
+                    return
+                response = upcoming.result()
+    
+    def get_page_content(self, page_id: str, start_cursor: str = None) -> Dict:
+        """Get one page (up to 100) of a page's or block's child blocks"""
         url = f"{self.base_url}/blocks/{page_id}/children"
+        params = {"page_size": 100}
+        if start_cursor:
+            params["start_cursor"] = start_cursor
         
         try:
-            response = self.session.get(url)
+            response = self._request('GET', url, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Failed to get page content: {e}")
             raise
+    
+    def get_block_children(self, block_id: str) -> List[Dict]:
+        """Every child block of a page or block, following next_cursor"""
+        blocks, cursor = [], None
+        while True:
+            response = self.get_page_content(block_id, cursor)
+            blocks.extend(response.get("results", []))
+            if not response.get("has_more"):
+                return blocks
+            cursor = response.get("next_cursor")
+    
+    def get_block_tree(self, page_id: str, max_concurrency: int = 3,
+                       max_depth: Optional[int] = None) -> List[Dict]:
+        """
+        Whole block tree of a page, flattened (see flatten_block_tree).
+        Blocks with has_children are fetched breadth-first, up to
+        max_concurrency at a time, as soon as their parent's children are in.
+        """
+        children: Dict[str, List[Dict]] = {}
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            pending = {pool.submit(self.get_block_children, page_id): (page_id, 0)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    block_id, depth = pending.pop(future)
+                    try:
+                        children[block_id] = future.result()
+                    except Exception:
+                        for other in pending:
+                            other.cancel()
+                        raise
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    for block in children[block_id]:
+                        if block.get("has_children"):
+                            pending[pool.submit(self.get_block_children, block["id"])] = \
+                                (block["id"], depth + 1)
+        
+        return flatten_block_tree(page_id, children, max_depth)
+    
+    def append_block_children(self, block_id: str, children: List[Dict]) -> List[Dict]:
+        """
+        Append blocks under a page or block, 100 per request.
+        Batches go out in order so the blocks keep their order.
+        """
+        return self._append_batches(block_id, children, after_write=False)
+    
+    def _append_batches(self, block_id: str, children: List[Dict], after_write: bool) -> List[Dict]:
+        url = f"{self.base_url}/blocks/{block_id}/children"
+        appended = []
+        
+        for offset in range(0, len(children), MAX_CHILDREN_PER_REQUEST):
+            batch = children[offset:offset + MAX_CHILDREN_PER_REQUEST]
+            # Only the first batch of a standalone append may bubble up a rate-limit wait
+            send = self._request_after_write if after_write or offset else self._request
+            try:
+                response = send('PATCH', url, json={"children": batch})
+                response.raise_for_status()
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"Failed to append blocks to {block_id} "
+                                  f"({len(appended)}/{len(children)} appended): {e}")
+                raise
+            appended.extend(response.json().get("results", []))
+        return appended
+    
+    def create_pages(self, pages: List[NotionPage], max_concurrency: int = 3) -> List[Any]:
+        """
+        Create many pages concurrently under the shared pacing.
+        Each page's content appends run on its own worker, so long pages
+        are filled in parallel with each other.
+        Results keep input order: the created page or the exception raised.
+        """
+        def create(page: NotionPage) -> Any:
+            try:
+                return self.create_page(page)
+            except requests.exceptions.RequestException as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            return list(pool.map(create, pages))
 
 class AutoNotionSync:
     """Synchronization between Meta Instagram and Notion"""
@@ -111,18 +453,62 @@ class AutoNotionSync:
         self.meta_client = meta_client
         self.notion_client = notion_client
         self.logger = logging.getLogger(__name__)
+        
+        # (database_id, key property) -> {key value: Notion page id}
+        self._key_indexes: Dict[tuple, Dict[Any, str]] = {}
+        self._index_lock = threading.Lock()
+        # Striped per-key locks: lookup, create and index insert for one key
+        # happen under one lock so concurrent upserts cannot both create
+        self._key_locks = [threading.Lock() for _ in range(64)]
+        
+        # Schema-checked record -> properties encoders, one per database
+        self.serializer = PropertySerializer(notion_client)
+    
+    def _key_index(self, database_id: str, key_property: str) -> Dict[Any, str]:
+        """Key -> page id map for a database, read from Notion once per run"""
+        with self._index_lock:
+            index = self._key_indexes.get((database_id, key_property))
+            if index is None:
+                index = {}
+                for page in self.notion_client.iter_database(database_id, prefetch=True):
+                    prop = page.get("properties", {}).get(key_property)
+                    key = plain_value(prop) if prop else None
+                    if key not in (None, ""):
+                        index.setdefault(key, page["id"])
+                self._key_indexes[(database_id, key_property)] = index
+                self.logger.info(f"Indexed {len(index)} pages of {database_id} by {key_property}")
+            return index
+    
+    def upsert_page(self, notion_page: NotionPage, key_property: str = "Post ID") -> Dict:
+        """Update the page holding this key, or create it if there is none"""
+        key = plain_value(notion_page.properties[key_property])
+        index = self._key_index(notion_page.database_id, key_property)
+        
+        stripe = hash((notion_page.database_id, key_property, key)) % len(self._key_locks)
+        with self._key_locks[stripe]:
+            existing = index.get(key)
+            if existing:
+                return self.notion_client.update_page(existing, notion_page.properties)
+            
+            result = self.notion_client.create_page(notion_page)
+            index[key] = result["id"]
+            return result
     
     def sync_instagram_post_to_notion(self, page_id: str, access_token: str, 
-                                    post_id: str, database_id: str) -> Dict:
-        """Sync Instagram post to Notion database"""
+                                    post_id: str, database_id: str,
+                                    upsert: bool = True) -> Dict:
+        """Sync Instagram post to Notion database (one row per Post ID when upserting)"""
         # Get post data from Instagram
         post_data = self._get_instagram_post_data(page_id, access_token, post_id)
         
         # Convert to Notion format
         notion_page = self._convert_post_to_notion_page(post_data, database_id)
         
-        # Create in Notion
-        result = self.notion_client.create_page(notion_page)
+        # Create in Notion, or update the row already holding this post
+        if upsert:
+            result = self.upsert_page(notion_page, "Post ID")
+        else:
+            result = self.notion_client.create_page(notion_page)
         
         # Log synchronization
         self._log_sync_activity("post_sync", post_id, result["id"])
@@ -138,10 +524,10 @@ class AutoNotionSync:
             page_id, access_token, metrics, "week"
         )
         
-        # Create analytics page in Notion
-        analytics_page = self._create_analytics_page(insights, database_id)
+        # One row per page and week; nightly refreshes send only changed numbers
+        analytics_page = self._create_analytics_page(insights, database_id, page_id)
         
-        result = self.notion_client.create_page(analytics_page)
+        result = self.upsert_page(analytics_page, "Title")
         
         self._log_sync_activity("insights_sync", page_id, result["id"])
         
@@ -150,153 +536,135 @@ class AutoNotionSync:
     def sync_content_calendar(self, page_name: str, content_plan: List[Dict],
                             database_id: str) -> Dict:
         """Sync content calendar to Notion"""
-        results = []
-        
+        calendar_pages, errors = [], []
         for content_item in content_plan:
-            # Create calendar entry
-            calendar_page = self._create_calendar_entry(
-                page_name, content_item, database_id
-            )
-            
-            result = self.notion_client.create_page(calendar_page)
-            results.append(result)
+            # Entries that do not fit the schema are reported without a round trip
+            try:
+                calendar_pages.append(
+                    self._create_calendar_entry(page_name, content_item, database_id)
+                )
+            except NotionSchemaError as e:
+                errors.append(str(e))
+        
+        # Created concurrently; the client's pacing keeps us at Notion's limit
+        outcomes = self.notion_client.create_pages(calendar_pages)
+        results = [o for o in outcomes if not isinstance(o, Exception)]
+        errors += [str(o) for o in outcomes if isinstance(o, Exception)]
+        for error in errors:
+            self.logger.error(f"Calendar entry for {page_name} failed: {error}")
         
-        return {"synced_items": len(results), "results": results}
+        return {"synced_items": len(results), "results": results, "errors": errors}
+    
+    def reconcile_instagram_posts(self, page_id: str, access_token: str, database_id: str,
+                                  since: datetime = None, workers: int = 3) -> ReconcileReport:
+        """
+        Bring the posts database in line with the account's media.
+        Graph media and the Notion database are each streamed once; only
+        new posts and changed properties are written. With `since`, older
+        media is not read and rows are never reported as orphaned.
+        """
+        media = self.meta_client.iter_media(page_id, access_token, POST_MEDIA_FIELDS,
+                                            page_size=100, since=since)
+        report = Reconciler(self.notion_client, workers).reconcile(
+            database_id, media, "Post ID", complete=since is None,
+            build=lambda item: self._convert_post_to_notion_page(
+                self._post_data_from_media(item), database_id)
+        )
+        # Rows were created behind the upsert index's back
+        with self._index_lock:
+            self._key_indexes.pop((database_id, "Post ID"), None)
+        
+        self._log_sync_activity("post_reconcile", page_id, database_id)
+        return report
     
     def _get_instagram_post_data(self, page_id: str, access_token: str, 
                                post_id: str) -> Dict:
         """Get Instagram post data"""
-        # This would use Meta Graph API to get post details
-        # For now, return sample data
+        media = self.meta_client.get_media_object(page_id, access_token, post_id,
+                                                  POST_MEDIA_FIELDS)
+        return self._post_data_from_media(media)
+    
+    @staticmethod
+    def _post_data_from_media(media: Dict) -> Dict:
+        """Graph media object -> post data used to build Notion pages"""
+        timestamp = media.get("timestamp")
+        if timestamp:
+            timestamp = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%S%z").isoformat()
         return {
-            "id": post_id,
-            "caption": "Sample post caption",
-            "media_type": "IMAGE",
-            "media_url": "https://example.com/image.jpg",
-            "permalink": f"https://instagram.com/p/{post_id}",
-            "timestamp": datetime.now().isoformat(),
+            "id": media["id"],
+            "caption": media.get("caption") or "No caption",
+            "media_type": media.get("media_type", "IMAGE"),
+            "media_url": media.get("media_url"),
+            "permalink": media.get("permalink"),
+            "timestamp": timestamp or datetime.now().isoformat(),
             "metrics": {
-                "likes": 150,
-                "comments": 20,
-                "shares": 5,
-                "saves": 10
+                "likes": media.get("like_count", 0),
+                "comments": media.get("comments_count", 0)
             }
         }
     
     def _convert_post_to_notion_page(self, post_data: Dict, 
                                    database_id: str) -> NotionPage:
         """Convert Instagram post to Notion page format"""
-        properties = {
-            "Title": {
-                "title": [
-                    {
-                        "text": {
-                            "content": f"Instagram Post: {post_data['id']}"
-                        }
-                    }
-                ]
-            },
-            "Platform": {
-                "select": {"name": "Instagram"}
-            },
-            "Post ID": {
-                "rich_text": [
-                    {
-                        "text": {"content": post_data["id"]}
-                    }
-                ]
-            },
-            "Caption": {
-                "rich_text": [
-                    {
-                        "text": {"content": post_data.get("caption", "No caption")[:2000]}
-                    }
-                ]
-            },
-            "Media Type": {
-                "select": {"name": post_data.get("media_type", "IMAGE")}
-            },
-            "Posted Date": {
-                "date": {
-                    "start": post_data.get("timestamp", datetime.now().isoformat())
-                }
-            },
-            "Likes": {
-                "number": post_data.get("metrics", {}).get("likes", 0)
-            },
-            "Comments": {
-                "number": post_data.get("metrics", {}).get("comments", 0)
-            },
-            "Status": {
-                "status": {"name": "Published"}
-            }
+        record = {
+            "Title": f"Instagram Post: {post_data['id']}",
+            "Platform": "Instagram",
+            "Post ID": post_data["id"],
+            "Caption": post_data.get("caption", "No caption")[:MAX_TEXT_LENGTH],
+            "Media Type": post_data.get("media_type", "IMAGE"),
+            "Posted Date": post_data.get("timestamp", datetime.now().isoformat()),
+            "Likes": post_data.get("metrics", {}).get("likes", 0),
+            "Comments": post_data.get("metrics", {}).get("comments", 0),
+            "Status": "Published"
         }
         
         return NotionPage(
             database_id=database_id,
-            properties=properties,
+            properties=self.serializer.encode(database_id, record),
             content=self._create_post_content_blocks(post_data)
         )
     
-    def _create_analytics_page(self, insights: Dict, database_id: str) -> NotionPage:
-        """Create analytics page in Notion"""
-        properties = {
-            "Title": {
-                "title": [
-                    {
-                        "text": {
-                            "content": f"Weekly Insights: {datetime.now().strftime('%Y-%m-%d')}"
-                        }
-                    }
-                ]
-            },
-            "Report Type": {
-                "select": {"name": "Weekly Analytics"}
-            },
-            "Report Date": {
-                "date": {"start": datetime.now().isoformat()}
-            },
-            # Note: This is a simplified extraction
-            "Total Impressions": {
-                "number": insights.get("data", [{}])[0].get("values", [{}])[0].get("value", 0) if insights.get("data") else 0
-            }
+    def _create_analytics_page(self, insights: Dict, database_id: str,
+                               page_id: str = None) -> NotionPage:
+        """
+        Create analytics page in Notion.
+        The title names the page and ISO week, so every refresh within a
+        week lands on the same row.
+        """
+        today = datetime.now().date()
+        week_start = today - timedelta(days=today.weekday())
+        year, week, _ = today.isocalendar()
+        # Note: This is a simplified extraction
+        data = insights.get("data") or [{}]
+        impressions = (data[0].get("values") or [{}])[0].get("value", 0)
+        
+        title = f"Weekly Insights: {year}-W{week:02d}"
+        if page_id:
+            title += f" ({page_id})"
+        record = {
+            "Title": title,
+            "Report Type": "Weekly Analytics",
+            "Report Date": week_start,
+            "Total Impressions": impressions
         }
         
-        return NotionPage(database_id=database_id, properties=properties)
+        return NotionPage(database_id=database_id,
+                          properties=self.serializer.encode(database_id, record))
     
     def _create_calendar_entry(self, page_name: str, content_item: Dict,
                              database_id: str) -> NotionPage:
         """Create content calendar entry"""
-        properties = {
-            "Title": {
-                "title": [
-                    {
-                        "text": {
-                            "content": f"{page_name}: {content_item.get('type', 'Post')}"
-                        }
-                    }
-                ]
-            },
-            "Instagram Page": {
-                "select": {"name": page_name}
-            },
-            "Content Type": {
-                "select": {"name": content_item.get("type", "Post")}
-            },
-            "Scheduled Date": {
-                "date": {
-                    "start": content_item.get("scheduled_date", datetime.now().isoformat())
-                }
-            },
-            "Status": {
-                "status": {"name": content_item.get("status", "Planned")}
-            },
-            "Priority": {
-                "select": {"name": content_item.get("priority", "Medium")}
-            }
+        record = {
+            "Title": f"{page_name}: {content_item.get('type', 'Post')}",
+            "Instagram Page": page_name,
+            "Content Type": content_item.get("type", "Post"),
+            "Scheduled Date": content_item.get("scheduled_date", datetime.now().isoformat()),
+            "Status": content_item.get("status", "Planned"),
+            "Priority": content_item.get("priority", "Medium")
         }
         
-        return NotionPage(database_id=database_id, properties=properties)
+        return NotionPage(database_id=database_id,
+                          properties=self.serializer.encode(database_id, record))
     
     def _create_post_content_blocks(self, post_data: Dict) -> List[Dict]:
         """Create Notion content blocks for post"""
@@ -312,14 +680,8 @@ class AutoNotionSync:
                 "object": "block",
                 "type": "paragraph",
                 "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {
-                                "content": f"Caption: {post_data.get('caption', 'No caption')}"
-                            }
-                        }
-                    ]
+                    # Captions run to 2200 characters; one text object holds 2000
+                    "rich_text": rich_text(f"Caption: {post_data.get('caption', 'No caption')}")
                 }
             }
         ]
@@ -346,14 +708,8 @@ class AutoNotionSync:
             "status": "success"
         }
         
-        log_file = f"logs/notion/sync_{datetime.now().strftime('%Y%m%d')}.json"
-        try:
-            os.makedirs(os.path.dirname(log_file), exist_ok=True)
-            with open(log_file, 'a') as f:
-                json.dump(log_entry, f)
-                f.write('\n')
-        except Exception as e:
-            self.logger.error(f"Failed to log sync activity: {e}")
+        # Batched and fsynced in the background; one open handle per day
+        get_log_writer("logs/notion", "sync", durability=Durability.BATCHED).write(log_entry)
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Notion Mirror
+Local SQLite copy of the Auto-Notion databases, kept current with
+incremental last_edited_time syncs
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from .notion_client import NotionClient, NotionPage, NotionDatabase
+from .properties import plain_properties
+
+class NotionMirror:
+    """
+    Read-through copy of Notion databases.
+    sync() asks Notion only for pages edited since the newest
+    last_edited_time already mirrored (Notion rounds edit times to the
+    minute, so the boundary minute is fetched again). Reads never touch
+    the API; writes go to Notion first and the returned page object is
+    stored, so the mirror reflects our own writes immediately.
+    Archived pages do not show up in incremental queries; a full sync
+    drops rows Notion no longer returns.
+    """
+
+    def __init__(self, client: NotionClient, path: str = ".cache/notion_mirror.db",
+                 database_ids: Optional[Dict[NotionDatabase, str]] = None):
+        self.client = client
+        self.path = path
+        # NotionDatabase member -> real database id (defaults to the enum values)
+        self.database_ids = database_ids or {db: db.value for db in NotionDatabase}
+        self._local = threading.local()
+        self.logger = logging.getLogger(__name__)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "page_id TEXT PRIMARY KEY, database_id TEXT NOT NULL, "
+            "last_edited_time TEXT, page TEXT NOT NULL, plain TEXT NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS pages_by_db ON pages (database_id, last_edited_time)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "database_id TEXT PRIMARY KEY, watermark TEXT, synced_at REAL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def database_id(self, database) -> str:
+        """Accept a NotionDatabase member or a raw id"""
+        if isinstance(database, NotionDatabase):
+            return self.database_ids.get(database, database.value)
+        return database
+
+    # ==================== SYNC ====================
+
+    def watermark(self, database) -> Optional[str]:
+        """Newest last_edited_time mirrored for a database"""
+        row = self._conn().execute(
+            "SELECT watermark FROM sync_state WHERE database_id = ?", (self.database_id(database),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, database, full: bool = False) -> Dict[str, int]:
+        """Pull pages edited since the last sync (everything when full=True)"""
+        database_id = self.database_id(database)
+        watermark = None if full else self.watermark(database_id)
+        filter_obj = None
+        if watermark:
+            filter_obj = {"timestamp": "last_edited_time",
+                          "last_edited_time": {"on_or_after": watermark}}
+        sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+        seen = set()
+        newest = watermark
+        conn = self._conn()
+        for page in self.client.iter_database(database_id, filter_obj, sorts, prefetch=True):
+            self._store(database_id, page)
+            seen.add(page["id"])
+            edited = page.get("last_edited_time")
+            if edited and (newest is None or edited > newest):
+                newest = edited
+
+        removed = 0
+        if full:
+            stale = [row[0] for row in conn.execute(
+                "SELECT page_id FROM pages WHERE database_id = ?", (database_id,)
+            ).fetchall() if row[0] not in seen]
+            conn.executemany("DELETE FROM pages WHERE page_id = ?", [(p,) for p in stale])
+            removed = len(stale)
+
+        conn.execute(
+            "INSERT OR REPLACE INTO sync_state (database_id, watermark, synced_at) VALUES (?, ?, ?)",
+            (database_id, newest, time.time())
+        )
+        self.logger.info(f"Mirrored {len(seen)} changed page(s) from {database_id}")
+        return {"fetched": len(seen), "removed": removed}
+
+    def sync_all(self, full: bool = False) -> Dict[str, Dict]:
+        """Sync every configured database; failures are reported per database"""
+        report = {}
+        for database in self.database_ids:
+            try:
+                report[database.name] = self.sync(database, full)
+            except (requests.exceptions.RequestException, sqlite3.Error) as e:
+                self.logger.error(f"Mirror sync failed for {database.name}: {e}")
+                report[database.name] = {"error": str(e)}
+        return report
+
+    def _store(self, database_id: str, page: Dict):
+        if page.get("archived") or page.get("in_trash"):
+            self._conn().execute("DELETE FROM pages WHERE page_id = ?", (page["id"],))
+            return
+        self._conn().execute(
+            "INSERT OR REPLACE INTO pages (page_id, database_id, last_edited_time, page, plain) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (page["id"], database_id, page.get("last_edited_time"), json.dumps(page),
+             json.dumps(plain_properties(page)))
+        )
+
+    # ==================== READS ====================
+
+    def get(self, page_id: str) -> Optional[Dict]:
+        """Mirrored page object"""
+        row = self._conn().execute("SELECT page FROM pages WHERE page_id = ?", (page_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def pages(self, database, where: Callable[[Dict[str, Any]], bool] = None) -> List[Dict]:
+        """Mirrored pages of a database, optionally filtered on their plain property values"""
+        rows = self._conn().execute(
+            "SELECT page, plain FROM pages WHERE database_id = ? ORDER BY last_edited_time",
+            (self.database_id(database),)
+        ).fetchall()
+        return [json.loads(page) for page, plain in rows
+                if where is None or where(json.loads(plain))]
+
+    def find(self, database, prop: str, value: Any) -> List[Dict]:
+        """Pages whose property has this plain value (e.g. find(db, "Post ID", "1789"))"""
+        rows = self._conn().execute(
+            "SELECT page FROM pages WHERE database_id = ? AND json_extract(plain, ?) = ?",
+            (self.database_id(database), f'$."{prop}"', value)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, database) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM pages WHERE database_id = ?", (self.database_id(database),)
+        ).fetchone()[0]
+
+    # ==================== WRITE-THROUGH ====================
+
+    def create_page(self, page: NotionPage) -> Dict:
+        """Create in Notion, then mirror the new page"""
+        result = self.client.create_page(page)
+        self._store(page.database_id, result)
+        return result
+
+    def update_page(self, page_id: str, properties: Dict) -> Dict:
+        """Update in Notion, then mirror the updated page"""
+        result = self.client.update_page(page_id, properties)
+        if result.get("unchanged"):
+            return result
+        row = self._conn().execute(
+            "SELECT database_id FROM pages WHERE page_id = ?", (page_id,)
+        ).fetchone()
+        database_id = row[0] if row else result.get("parent", {}).get("database_id")
+        if database_id:
+            self._store(database_id, result)
+        return result
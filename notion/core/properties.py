@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Notion Property Values
+Plain Python values out of Notion property objects and blocks
+"""
+
+from typing import Any, Dict
+
+def _text(rich_text: list) -> str:
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "")
+                   for part in rich_text or [])
+
+def plain_value(prop: Dict) -> Any:
+    """
+    The value a human sees in a property cell.
+    Titles and rich text become strings, selects their option name,
+    dates their start, relations and people lists of ids.
+    """
+    kind = prop.get("type") or next((k for k in prop if k != "id"), None)
+    value = prop.get(kind)
+
+    if kind in ("title", "rich_text"):
+        return _text(value)
+    if kind in ("select", "status"):
+        return value.get("name") if value else None
+    if kind == "multi_select":
+        return [option.get("name") for option in value or []]
+    if kind == "date":
+        return value.get("start") if value else None
+    if kind in ("relation", "people"):
+        return [item.get("id") for item in value or []]
+    if kind == "formula":
+        return value.get(value.get("type")) if value else None
+    if kind == "rollup":
+        return value.get(value.get("type")) if value else None
+    if kind == "unique_id":
+        return f"{value.get('prefix') or ''}{value.get('number')}" if value else None
+    # number, checkbox, url, email, phone_number, created_time, last_edited_time ...
+    return value
+
+def plain_properties(page: Dict) -> Dict[str, Any]:
+    """Every property of a page object as plain values"""
+    return {name: plain_value(prop) for name, prop in page.get("properties", {}).items()}
+
+def block_text(block: Dict) -> str:
+    """Plain text of a block's rich_text (empty for images, dividers ...)"""
+    return _text(block.get(block.get("type"), {}).get("rich_text"))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Property Serializers
+Plain Python records to Notion property JSON, compiled per database
+from its live schema and validated before anything is sent
+"""
+
+import threading
+import logging
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Notion rejects text objects longer than this
+MAX_TEXT_LENGTH = 2000
+
+# Computed by Notion; a write to them is always a 400
+READ_ONLY_TYPES = {"formula", "rollup", "created_time", "created_by", "last_edited_time",
+                   "last_edited_by", "unique_id", "verification", "button"}
+
+class NotionSchemaError(ValueError):
+    """A record does not fit the database schema; nothing was sent"""
+
+    def __init__(self, database_id: str, errors: List[str]):
+        super().__init__(f"{database_id}: " + "; ".join(errors))
+        self.database_id = database_id
+        self.errors = errors
+
+# ==================== VALUE ENCODERS ====================
+# Each returns the property payload or raises TypeError/ValueError with a
+# short reason; the encoder turns those into NotionSchemaError.
+
+def rich_text(text: str) -> List[Dict]:
+    """Rich text array for any length of text, split into 2000-character objects"""
+    return [{"text": {"content": text[i:i + MAX_TEXT_LENGTH]}}
+            for i in range(0, len(text), MAX_TEXT_LENGTH)] or [{"text": {"content": ""}}]
+
+def _text(value: Any) -> List[Dict]:
+    if not isinstance(value, (str, int)) or isinstance(value, bool):
+        raise TypeError(f"expected text, got {type(value).__name__}")
+    return rich_text(str(value))
+
+def _number(value: Any) -> Optional[float]:
+    if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+        raise TypeError(f"expected a number, got {type(value).__name__}")
+    return value
+
+def _name(value: Any) -> Dict:
+    if not isinstance(value, str) or not value:
+        raise TypeError(f"expected an option name, got {value!r}")
+    if "," in value:
+        raise ValueError(f"option names cannot contain commas: {value!r}")
+    return {"name": value}
+
+def _names(value: Any) -> List[Dict]:
+    if not isinstance(value, (list, tuple, set)):
+        raise TypeError(f"expected a list of option names, got {type(value).__name__}")
+    return [_name(v) for v in value]
+
+def _date(value: Any) -> Optional[Dict]:
+    if value is None:
+        return None
+    if isinstance(value, (datetime, date)):
+        return {"start": value.isoformat()}
+    if isinstance(value, str):
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+        return {"start": value}
+    raise TypeError(f"expected a date, got {type(value).__name__}")
+
+def _checkbox(value: Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError(f"expected a bool, got {type(value).__name__}")
+    return value
+
+def _string(value: Any) -> Optional[str]:
+    if value is not None and not isinstance(value, str):
+        raise TypeError(f"expected a string, got {type(value).__name__}")
+    return value
+
+def _ids(value: Any) -> List[Dict]:
+    if not isinstance(value, (list, tuple)) or not all(isinstance(v, str) for v in value):
+        raise TypeError("expected a list of ids")
+    return [{"id": v} for v in value]
+
+VALUE_ENCODERS: Dict[str, Callable[[Any], Any]] = {
+    "title": _text,
+    "rich_text": _text,
+    "number": _number,
+    "select": _name,
+    "status": _name,
+    "multi_select": _names,
+    "date": _date,
+    "checkbox": _checkbox,
+    "url": _string,
+    "email": _string,
+    "phone_number": _string,
+    "relation": _ids,
+    "people": _ids,
+}
+
+def _status_encoder(options: List[str]) -> Callable[[Any], Dict]:
+    """Status options cannot be created through the API, so check them here"""
+    allowed = set(options)
+
+    def encode(value: Any) -> Dict:
+        payload = _name(value)
+        if allowed and value not in allowed:
+            raise ValueError(f"unknown status {value!r} (have {sorted(allowed)})")
+        return payload
+
+    return encode
+
+# ==================== COMPILED ENCODERS ====================
+
+class PropertyEncoder:
+    """
+    Record -> properties for one database.
+    Built once per schema: each column maps to its property name, type
+    key and value encoder, so encoding a row is one dict pass.
+    """
+
+    def __init__(self, database_id: str, schema: Dict[str, Dict]):
+        self.database_id = database_id
+        self.schema = schema
+        self._columns: Dict[str, Tuple[str, Callable[[Any], Any]]] = {}
+        self._read_only = set()
+        for name, prop in schema.items():
+            kind = prop.get("type")
+            if kind in READ_ONLY_TYPES:
+                self._read_only.add(name)
+            elif kind == "status":
+                options = [o.get("name") for o in prop.get("status", {}).get("options", [])]
+                self._columns[name] = (kind, _status_encoder(options))
+            elif kind in VALUE_ENCODERS:
+                self._columns[name] = (kind, VALUE_ENCODERS[kind])
+
+    def __call__(self, record: Dict[str, Any]) -> Dict[str, Dict]:
+        properties, errors = {}, []
+        for name, value in record.items():
+            column = self._columns.get(name)
+            if column is None:
+                reason = "is read-only" if name in self._read_only else "is not in the database"
+                errors.append(f"{name!r} {reason}")
+                continue
+            kind, encode = column
+            try:
+                properties[name] = {kind: encode(value)}
+            except (TypeError, ValueError) as e:
+                errors.append(f"{name!r} ({kind}): {e}")
+        if errors:
+            raise NotionSchemaError(self.database_id, errors)
+        return properties
+
+class PropertySerializer:
+    """
+    Per-database encoders built from schemas fetched once.
+    The schema comes from GET /databases/{id} the first time a database
+    is used; invalidate() drops it after a schema change in Notion.
+    """
+
+    def __init__(self, notion_client):
+        self.client = notion_client
+        self._encoders: Dict[str, PropertyEncoder] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def encoder(self, database_id: str) -> PropertyEncoder:
+        with self._lock:
+            encoder = self._encoders.get(database_id)
+            if encoder is None:
+                schema = self.client.get_database(database_id).get("properties", {})
+                encoder = PropertyEncoder(database_id, schema)
+                self._encoders[database_id] = encoder
+                self.logger.info(f"Compiled property encoder for {database_id} "
+                                 f"({len(schema)} properties)")
+            return encoder
+
+    def encode(self, database_id: str, record: Dict[str, Any]) -> Dict[str, Dict]:
+        """Notion properties for a plain record; raises NotionSchemaError"""
+        return self.encoder(database_id)(record)
+
+    def invalidate(self, database_id: str = None):
+        with self._lock:
+            if database_id is None:
+                self._encoders.clear()
+            else:
+                self._encoders.pop(database_id, None)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Auto-Notion Reconciler
+Brings a Notion database in line with a stream of desired pages,
+writing only what differs
+"""
+
+import re
+import threading
+import logging
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .properties import plain_value
+from .change_tracker import ChangeTracker
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+def _comparable(value: Any) -> Any:
+    """Plain value normalised so Graph and Notion spellings of a date compare equal"""
+    if isinstance(value, str) and _ISO_DATE.match(value):
+        try:
+            return datetime.fromisoformat(value).isoformat()
+        except ValueError:
+            return value
+    return value
+
+def property_fingerprint(properties: Dict[str, Dict]) -> Dict[str, str]:
+    """Per-property hash of the plain values (works for read and write payloads)"""
+    return {name: ChangeTracker.property_hash(_comparable(plain_value(prop)))
+            for name, prop in properties.items()}
+
+@dataclass
+class ReconcileReport:
+    """Outcome of one reconcile run"""
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: List[Dict] = field(default_factory=list)
+    # Desired records that could not be turned into a page; nothing was sent
+    invalid: List[Dict] = field(default_factory=list)
+    # Notion pages whose key never showed up in the desired stream
+    orphaned: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class Reconciler:
+    """
+    Single-pass diff between a Notion database and a desired state.
+    The database is streamed once into key -> (page id, property hashes);
+    desired pages are then streamed and compared as they arrive. Missing
+    keys become creates, differing properties become updates carrying just
+    those properties, and everything else costs nothing. Writes run on a
+    bounded worker pool under the client's pacing, and at most
+    2 x workers writes are queued so the desired stream is consumed lazily.
+    A record that fails to encode or to write is reported and the run
+    carries on with the next one.
+    """
+
+    def __init__(self, notion_client, workers: int = 3):
+        self.client = notion_client
+        self.workers = workers
+        self.logger = logging.getLogger(__name__)
+
+    def snapshot(self, database_id: str, key_property: str) -> Dict[Any, Tuple[str, Dict[str, str]]]:
+        """Key -> (page id, property fingerprint) for every page of the database"""
+        existing = {}
+        for page in self.client.iter_database(database_id, prefetch=True):
+            properties = page.get("properties", {})
+            prop = properties.get(key_property)
+            key = plain_value(prop) if prop else None
+            if key in (None, "") or key in existing:
+                continue
+            existing[key] = (page["id"], property_fingerprint(properties))
+        return existing
+
+    def reconcile(self, database_id: str, desired: Iterable, key_property: str = "Post ID",
+                  complete: bool = True,
+                  build: Optional[Callable[[Any], Any]] = None) -> ReconcileReport:
+        """
+        Apply the NotionPage objects in `desired` to the database; with
+        `build`, `desired` holds source records and build(record) makes
+        each page, so a record that does not fit the schema is skipped.
+        With complete=False (e.g. a since-bounded source) pages absent from
+        `desired` are not reported as orphaned.
+        """
+        existing = self.snapshot(database_id, key_property)
+        report = ReconcileReport()
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.workers * 2)
+        seen = set()
+
+        def apply(key: Any, write, *args):
+            try:
+                write(*args)
+            except Exception as e:
+                self.logger.error(f"Reconcile write for {key} failed: {e}")
+                with lock:
+                    report.failed.append({"key": key, "error": str(e)})
+            finally:
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reconcile") as pool:
+            for position, record in enumerate(desired):
+                try:
+                    page = build(record) if build else record
+                    key = plain_value(page.properties[key_property])
+                except Exception as e:
+                    self.logger.error(f"Reconcile record {position} for {database_id} "
+                                      f"skipped: {e}")
+                    report.invalid.append({"position": position, "error": str(e)})
+                    continue
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                current = existing.get(key)
+                if current is None:
+                    write, args = self.client.create_page, (page,)
+                    report.created += 1
+                else:
+                    page_id, fingerprint = current
+                    wanted = property_fingerprint(page.properties)
+                    changed = {name: page.properties[name] for name, h in wanted.items()
+                               if fingerprint.get(name) != h}
+                    if not changed:
+                        report.unchanged += 1
+                        continue
+                    # Notion is the reference here, so skip the local change tracker
+                    write, args = self.client.update_page, (page_id, changed, True)
+                    report.updated += 1
+
+                slots.acquire()
+                pool.submit(apply, key, write, *args)
+
+        # Failed writes were counted when queued
+        for failure in report.failed:
+            if failure["key"] in existing:
+                report.updated -= 1
+            else:
+                report.created -= 1
+
+        if complete and report.invalid:
+            # A skipped record's key is unknown, so its row would look orphaned
+            self.logger.warning(f"Not reporting orphans for {database_id}: "
+                                f"{len(report.invalid)} record(s) could not be encoded")
+        elif complete:
+            report.orphaned = [page_id for key, (page_id, _) in existing.items() if key not in seen]
+
+        self.logger.info(f"Reconciled {database_id}: {report.created} created, "
+                         f"{report.updated} updated, {report.unchanged} unchanged, "
+                         f"{len(report.failed)} failed, {len(report.invalid)} invalid, "
+                         f"{len(report.orphaned)} orphaned")
+        return report
@@ -15,7 +15,9 @@ from dotenv import load_dotenv
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.core.institutional_meta import InstitutionalMetaClient, MetaAppConfig
+from api.core.publish_outbox import PublishOutbox
 from api.security.vault_manager import InstitutionalVault
+from api.security.token_manager import TokenManager
 from api.security.risk_guard import RiskGuard
 from engine.scheduler.cosmic_scheduler import CosmicScheduler
 from engine.ai.deterministic_engine import DeterministicEngine
@@ -71,9 +73,21 @@ class MissionsControl:
             app_id=os.getenv("META_APP_ID", "689310950781431"),
             app_secret=os.getenv("META_APP_SECRET"),
             client_token=os.getenv("META_CLIENT_TOKEN", "c1668ae918a78c66946cda97a2220ed7"),
-            business_id=os.getenv("META_BUSINESS_ID", "780866337893831")
+            business_id=os.getenv("META_BUSINESS_ID", "780866337893831"),
+            rate_limit_ledger=os.getenv("META_RATE_LIMIT_LEDGER", ".cache/meta_rate_limits.db")
         )
         self.meta = InstitutionalMetaClient(config)
+        
+        # Page tokens are checked and rotated in the background, ahead of expiry
+        self.tokens = TokenManager(self.meta, self.vault)
+        for page_info in self.fleet_manifest.values():
+            name = f"PAGE_TOKEN_{page_info['id']}"
+            if self.vault.get_token(name):
+                self.tokens.register(name, inspect=False)
+        self.tokens.start()
+        
+        # Posts go out through the outbox, which asks the manager for each page's token
+        self.outbox = PublishOutbox(self.meta, self.tokens.page_token)
 
     def execute_launch_sequence(self, days=1):
         """Execute the deterministic launch sequence for the whole fleet"""
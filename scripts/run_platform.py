@@ -55,7 +55,8 @@ def load_configuration():
         app_secret=os.getenv("META_APP_SECRET", "dummy_secret"),
         client_token=os.getenv("META_CLIENT_TOKEN", "c1668ae918a78c66946cda97a2220ed7"),
         business_id=os.getenv("META_BUSINESS_ID", "780866337893831"),
-        api_version="v24.0"
+        api_version="v24.0",
+        rate_limit_ledger=os.getenv("META_RATE_LIMIT_LEDGER", ".cache/meta_rate_limits.db")
     )
     
     return meta_config
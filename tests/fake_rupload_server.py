@@ -0,0 +1,82 @@
+"""
+Local stand-in for Meta's resumable upload flow.
+Serves POST /{page_id}/media (session start), POST /rupload/{container}
+(chunks with offset/file_size headers) and GET /rupload/{container}
+(acknowledged offset). Failures can be injected per chunk request.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeRuploadServer:
+    def __init__(self, drop_requests=None):
+        # 1-based chunk request numbers whose response is dropped after storing
+        self.drop_requests = set(drop_requests or [])
+        self.uploads = {}
+        self.chunk_requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                container_id = self.path.split("?")[0].rsplit("/", 1)[-1]
+                with server.lock:
+                    offset = len(server.uploads.get(container_id, b""))
+                self._reply(200, {"offset": offset})
+
+            def do_POST(self):
+                path = self.path.split("?")[0]
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+
+                if path.endswith("/media"):
+                    with server.lock:
+                        container_id = f"c{len(server.uploads) + 1}"
+                        server.uploads[container_id] = b""
+                    self._reply(200, {"id": container_id,
+                                      "uri": f"{server.url}/rupload/{container_id}"})
+                    return
+
+                container_id = path.rsplit("/", 1)[-1]
+                with server.lock:
+                    server.chunk_requests += 1
+                    request_no = server.chunk_requests
+                    stored = server.uploads[container_id]
+                    if int(self.headers["offset"]) != len(stored):
+                        self._reply(400, {"offset": len(stored)})
+                        return
+                    server.uploads[container_id] = stored + body
+
+                if request_no in server.drop_requests:
+                    # Chunk stored but the acknowledgement is lost
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+                self._reply(200, {"success": True})
+
+        return Handler
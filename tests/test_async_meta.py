@@ -0,0 +1,103 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from api.core.meta_client_v24 import MetaAppConfig, MetaAPIError, RateLimitExceeded, ContentType
+from api.core.async_meta import AsyncMetaGraphClient
+
+class FakeSyncClient:
+    """Upload/publish stand-in; `throttle` calls raise RateLimitExceeded first"""
+
+    def __init__(self, throttle=0, retry_after=0.05, failing_pages=()):
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.failing_pages = set(failing_pages)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def upload_media(self, page_id, access_token, media_path, media_type, caption=None, **kwargs):
+        with self.lock:
+            self.calls.append(("upload", page_id, time.monotonic()))
+            if self.throttle:
+                self.throttle -= 1
+                raise RateLimitExceeded("Page rate limit reached", retry_after=self.retry_after)
+        if page_id in self.failing_pages:
+            raise MetaAPIError("API Error 9004: media URL unreachable", code=9004)
+        time.sleep(0.1)
+        return {"id": f"container-{page_id}"}
+
+    def publish_media(self, page_id, access_token, creation_id):
+        with self.lock:
+            self.calls.append(("publish", page_id, time.monotonic()))
+        return {"id": f"media-{creation_id}"}
+
+def make_client(sync, **kwargs):
+    config = MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False)
+    return AsyncMetaGraphClient(config, client=sync, max_concurrency=4, **kwargs)
+
+def post(page_id):
+    return {"page_id": page_id, "access_token": "token", "media_path": f"https://cdn/{page_id}.jpg",
+            "media_type": ContentType.IMAGE}
+
+def test_rate_limited_calls_are_awaited_and_retried():
+    sync = FakeSyncClient(throttle=1, retry_after=0.1)
+    client = make_client(sync)
+
+    async def run():
+        async with client:
+            return await client.publish_post(**post("111"))
+
+    assert asyncio.run(run()) == {"id": "media-container-111"}
+    uploads = [at for kind, _, at in sync.calls if kind == "upload"]
+    assert len(uploads) == 2 and uploads[1] - uploads[0] >= 0.1
+
+def test_waits_longer_than_the_limit_are_raised():
+    client = make_client(FakeSyncClient(throttle=1, retry_after=60), max_rate_limit_wait=1)
+
+    async def run():
+        async with client:
+            return await client.publish_post(**post("111"))
+
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(run())
+
+def test_fleet_report_keeps_input_order_with_failures():
+    sync = FakeSyncClient(failing_pages={"222"})
+    client = make_client(sync)
+
+    started = time.monotonic()
+    report = client.publish_fleet_sync([post("111"), post("222"), post("333"), post("444")])
+
+    assert [(r["page_id"], r["status"]) for r in report] == [
+        ("111", "published"), ("222", "failed"), ("333", "published"), ("444", "published")
+    ]
+    assert report[0]["result"] == {"id": "media-container-111"}
+    assert "9004" in report[1]["error"]
+    # Uploads overlapped instead of running one after another
+    assert time.monotonic() - started < 0.25
+    assert not any(kind == "publish" and page == "222" for kind, page, _ in sync.calls)
+    client.close()
+
+def test_default_pool_keeps_dozens_of_calls_in_flight():
+    sync = FakeSyncClient()
+    config = MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False)
+    client = AsyncMetaGraphClient(config, client=sync)
+
+    async def run():
+        async with client:
+            return await asyncio.gather(*(client.upload_media(**post(str(i)))
+                                          for i in range(40)))
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+
+    assert len(results) == 40
+    # 40 uploads of 0.1s each finish together, not in waves
+    assert time.monotonic() - started < 0.35
@@ -0,0 +1,86 @@
+import sys
+import os
+import asyncio
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from api.core.meta_client_v24 import MetaAPIError, ContentType
+from api.core.carousel_publisher import (CarouselPublisher, CarouselItem,
+                                         CarouselPublishError)
+
+class FakeAsyncGraph:
+    """Containers finish on the first status check"""
+
+    def __init__(self, failing_url=None):
+        self.failing_url = failing_url
+        self.uploads = []
+        self.published = []
+
+    async def upload_media(self, page_id, access_token, media_path, media_type,
+                           caption=None, **kwargs):
+        await asyncio.sleep(0.01)
+        if media_path == self.failing_url:
+            raise MetaAPIError("API Error 9004: media URL unreachable", code=9004)
+        self.uploads.append((media_path, media_type, kwargs))
+        return {"id": f"c{len(self.uploads)}"}
+
+    def time_until_next_slot(self, page_id, calls=1):
+        return 0.0
+
+    async def batch(self, calls):
+        return [{"status_code": "FINISHED"} for _ in calls]
+
+    async def publish_container(self, page_id, access_token, creation_id):
+        self.published.append(creation_id)
+        return {"id": f"m-{creation_id}"}
+
+def make_publisher(graph):
+    return CarouselPublisher(graph, initial_delay=0.01, max_delay=0.05, timeout=5)
+
+def test_children_then_parent_then_publish():
+    graph = FakeAsyncGraph()
+    items = [CarouselItem("https://cdn/1.jpg"), CarouselItem("https://cdn/2.mp4", ContentType.VIDEO)]
+
+    result = asyncio.run(make_publisher(graph).publish("111", "token", items, "caption"))
+
+    assert sorted(result.children) == ["c1", "c2"]
+    assert all(kwargs == {"is_carousel_item": True} for _, _, kwargs in graph.uploads[:2])
+    parent_path, parent_type, parent_kwargs = graph.uploads[2]
+    assert parent_type == ContentType.CAROUSEL and parent_kwargs["children"] == result.children
+    assert graph.published == [result.container_id]
+    assert result.media_id == f"m-{result.container_id}"
+
+def test_failed_child_reports_orphans_and_skips_parent():
+    graph = FakeAsyncGraph(failing_url="https://cdn/bad.jpg")
+    items = [CarouselItem("https://cdn/1.jpg"), CarouselItem("https://cdn/bad.jpg")]
+
+    with pytest.raises(CarouselPublishError) as excinfo:
+        asyncio.run(make_publisher(graph).publish("111", "token", items))
+
+    assert all(kwargs.get("is_carousel_item") for _, _, kwargs in graph.uploads)
+    assert excinfo.value.orphaned_containers == [f"c{i + 1}" for i in range(len(graph.uploads))]
+    assert graph.published == []
+
+class SlowSiblingsGraph(FakeAsyncGraph):
+    """The bad slide fails at once; the others finish after the failure"""
+
+    async def upload_media(self, page_id, access_token, media_path, media_type,
+                           caption=None, **kwargs):
+        if media_path == self.failing_url:
+            raise MetaAPIError("API Error 9004: media URL unreachable", code=9004)
+        await asyncio.sleep(0.05)
+        self.uploads.append((media_path, media_type, kwargs))
+        return {"id": f"ok{len(self.uploads)}"}
+
+def test_uploads_finishing_after_a_failure_are_still_reported_as_orphans():
+    graph = SlowSiblingsGraph(failing_url="https://cdn/bad.jpg")
+    items = [CarouselItem("https://cdn/1.jpg"), CarouselItem("https://cdn/bad.jpg"),
+             CarouselItem("https://cdn/2.jpg")]
+
+    with pytest.raises(CarouselPublishError) as excinfo:
+        asyncio.run(make_publisher(graph).publish("111", "token", items))
+
+    assert sorted(excinfo.value.orphaned_containers) == ["ok1", "ok2"]
@@ -0,0 +1,126 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+from notion.core.notion_client import NotionClient, NotionPage, AutoNotionSync
+from notion.core.change_tracker import ChangeTracker
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class RecordingSession:
+    def __init__(self):
+        self.sent = []
+
+    def request(self, method, url, json=None, **kwargs):
+        self.sent.append((method, json))
+        return FakeResponse({"id": "page-1"})
+
+def make_client(tracker=None):
+    client = NotionClient("secret", transport=HTTPTransport(metrics=MetricsRegistry()),
+                          change_tracker=tracker or ChangeTracker())
+    client.transport.session = RecordingSession()
+    return client
+
+def metrics(likes, comments):
+    return {"Likes": {"number": likes}, "Comments": {"number": comments}}
+
+def test_only_changed_properties_are_sent():
+    client = make_client()
+    client.create_page(NotionPage("db", metrics(10, 2)))
+
+    unchanged = client.update_page("page-1", metrics(10, 2))
+    client.update_page("page-1", metrics(12, 2))
+
+    sent = client.transport.session.sent
+    assert unchanged["unchanged"] is True
+    assert len(sent) == 2
+    assert sent[1] == ("PATCH", {"properties": {"Likes": {"number": 12}}})
+
+def test_force_and_forget_send_everything():
+    client = make_client()
+    client.update_page("page-1", metrics(1, 1))
+
+    client.update_page("page-1", metrics(1, 1), force=True)
+    client.change_tracker.forget("page-1")
+    client.update_page("page-1", metrics(1, 1))
+
+    sent = client.transport.session.sent
+    assert len(sent) == 3
+    assert all(body["properties"] == metrics(1, 1) for _, body in sent)
+
+def test_hashes_survive_restarts(tmp_path):
+    path = str(tmp_path / "hashes.db")
+    make_client(ChangeTracker(path)).update_page("page-1", metrics(5, 0))
+
+    client = make_client(ChangeTracker(path))
+    result = client.update_page("page-1", metrics(5, 0))
+
+    assert result["unchanged"] is True
+    assert client.transport.session.sent == []
+
+ANALYTICS_SCHEMA = {"properties": {
+    "Title": {"type": "title"}, "Report Type": {"type": "select"},
+    "Report Date": {"type": "date"}, "Total Impressions": {"type": "number"},
+}}
+
+class NotionDatabaseSession:
+    """Just enough of Notion for the insights sync: schema, query, create, update"""
+
+    def __init__(self):
+        self.rows = {}
+        self.writes = []
+
+    def request(self, method, url, json=None, **kwargs):
+        if method == 'GET':
+            return FakeResponse(ANALYTICS_SCHEMA)
+        if url.endswith("/query"):
+            return FakeResponse({"results": list(self.rows.values()), "has_more": False})
+        self.writes.append((method, json))
+        if method == 'POST':
+            page_id = f"page-{len(self.rows) + 1}"
+            title = json["properties"]["Title"]["title"][0]["text"]["content"]
+            self.rows[page_id] = {"id": page_id, "properties": {
+                "Title": {"type": "title", "title": [{"plain_text": title}]}}}
+            return FakeResponse({"id": page_id})
+        return FakeResponse({"id": url.rsplit("/", 1)[1]})
+
+class FakeMeta:
+    def __init__(self, impressions):
+        self.impressions = impressions
+
+    def get_instagram_insights(self, page_id, access_token, metrics, period):
+        return {"data": [{"name": "impressions", "values": [{"value": self.impressions}]}]}
+
+def nightly_run(session, impressions):
+    """A fresh process: new client and sync objects, default change tracker"""
+    client = NotionClient("secret", transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.transport.session = session
+    return AutoNotionSync(FakeMeta(impressions), client).sync_insights_to_notion("111", "t", "db")
+
+def test_nightly_insights_refresh_writes_only_what_changed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    session = NotionDatabaseSession()
+
+    nightly_run(session, 100)
+    unchanged = nightly_run(session, 100)
+    nightly_run(session, 140)
+
+    assert unchanged["unchanged"] is True
+    assert [method for method, _ in session.writes] == ['POST', 'PATCH']
+    assert session.writes[1][1] == {"properties": {"Total Impressions": {"number": 140}}}
@@ -0,0 +1,77 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from api.core.circuit_breaker import BreakerConfig, BreakerState, CircuitBreakerRegistry
+from api.core.meta_client_v24 import (MetaGraphClient, MetaAppConfig, CircuitOpenError,
+                                      RateLimitExceeded)
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_registry(**overrides):
+    clock = FakeClock()
+    config = BreakerConfig(min_calls=4, open_seconds=30, **overrides)
+    return CircuitBreakerRegistry(config, metrics=MetricsRegistry(), clock=clock), clock
+
+def test_breaker_opens_on_error_rate_and_recovers():
+    registry, clock = make_registry()
+    for failed in (False, True, True, True):
+        assert registry.allow(["meta:{id}/media"]) == 0.0
+        registry.record(["meta:{id}/media"], failed=failed)
+
+    assert registry.get("meta:{id}/media").state == BreakerState.OPEN
+    assert registry.allow(["meta:{id}/media"]) == 30.0
+    assert registry.metrics.get("circuit_breaker_state", breaker="meta:{id}/media") == 2
+
+    clock.now += 30
+    assert registry.allow(["meta:{id}/media"]) == 0.0   # half-open probe
+    assert registry.allow(["meta:{id}/media"]) > 0      # one probe at a time
+    registry.record(["meta:{id}/media"], failed=False)
+    assert registry.get("meta:{id}/media").state == BreakerState.CLOSED
+
+def test_slow_calls_trip_the_breaker():
+    registry, _ = make_registry(slow_call_seconds=5)
+    for _ in range(4):
+        registry.record(["notion:pages"], failed=False, latency=6)
+
+    assert registry.get("notion:pages").state == BreakerState.OPEN
+
+def test_open_page_breaker_fails_fast_without_network():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz"),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.breakers, _ = make_registry()
+    client.transport.session = None  # any network call would raise AttributeError
+    for _ in range(4):
+        client.breakers.record(["meta:page:111"], failed=True)
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        client.get_instagram_media("111", "token")
+    assert excinfo.value.retry_after == 30.0
+
+def test_rate_limited_call_gives_back_the_half_open_probe():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz"),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.breakers, clock = make_registry()
+    client.transport.session = None
+    for _ in range(4):
+        client.breakers.record(["meta:page:111"], failed=True)
+    clock.now += 30
+    client.rate_limiter.try_acquire({"page:111": 45})
+
+    with pytest.raises(RateLimitExceeded):
+        client.get_instagram_media("111", "token")
+
+    # The refused call never reached Graph, so the next one may still probe
+    assert client.breakers.get("meta:page:111").state == BreakerState.HALF_OPEN
+    assert client.breakers.allow(["meta:page:111"]) == 0.0
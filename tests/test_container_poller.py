@@ -0,0 +1,140 @@
+import sys
+import os
+import time
+import asyncio
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.meta_client_v24 import MetaAPIError, RateLimitExceeded
+from api.core.rate_limiter import TokenBucketLimiter, BucketSpec
+from api.core.container_poller import ContainerPoller, PollerEventType
+
+class FakeGraph:
+    """
+    Replays a status script per container; a MetaAPIError entry fails that
+    check. Page buckets are real; `refusals` batches are refused outright.
+    """
+
+    def __init__(self, scripts, page_bucket=BucketSpec(50, 50), refusals=0):
+        self.scripts = {cid: list(statuses) for cid, statuses in scripts.items()}
+        self.checks = {cid: [] for cid in scripts}
+        self.limiter = TokenBucketLimiter({"page": page_bucket})
+        self.refusals = refusals
+        self.batches = []
+        self.published = []
+
+    def time_until_next_slot(self, page_id, calls=1):
+        return self.limiter.time_until_available([f"page:{page_id}"], tokens=calls)
+
+    async def batch(self, calls):
+        if self.refusals:
+            self.refusals -= 1
+            raise RateLimitExceeded("Rate limit exceeded for batch", retry_after=0.01)
+        pages = {}
+        for call in calls:
+            pages[f"page:{call.page_id}"] = pages.get(f"page:{call.page_id}", 0) + 1
+        assert self.limiter.try_acquire(pages) == 0
+        self.batches.append(calls)
+        results = []
+        for call in calls:
+            self.checks[call.endpoint].append(time.monotonic())
+            script = self.scripts[call.endpoint]
+            status = script.pop(0) if len(script) > 1 else script[0]
+            results.append(status if isinstance(status, MetaAPIError) else {"status_code": status})
+        return results
+
+    async def publish_container(self, page_id, access_token, creation_id):
+        self.published.append(creation_id)
+        return {"id": f"media-{creation_id}"}
+
+def make_poller(graph, **kwargs):
+    options = dict(initial_delay=0.01, max_delay=0.08, jitter=0, timeout=5)
+    options.update(kwargs)
+    return ContainerPoller(graph, **options)
+
+def test_in_progress_backs_off_then_auto_publishes():
+    graph = FakeGraph({"c1": ["IN_PROGRESS", "IN_PROGRESS", "IN_PROGRESS", "FINISHED"]})
+    poller = make_poller(graph)
+    poller.track("c1", "111", "token")
+
+    events = poller.run_sync()
+
+    assert [(e.type, e.data) for e in events] == [
+        (PollerEventType.PUBLISHED, {"media_id": "media-c1"})
+    ]
+    assert graph.published == ["c1"]
+    checks = graph.checks["c1"]
+    gaps = [later - earlier for earlier, later in zip(checks, checks[1:])]
+    assert len(checks) == 4 and gaps[0] < gaps[1] < gaps[2]
+
+def test_status_checks_are_charged_to_the_page():
+    graph = FakeGraph({"c1": ["FINISHED"], "c2": ["FINISHED"]})
+    poller = make_poller(graph)
+    poller.track("c1", "111", "token", auto_publish=False)
+    poller.track("c2", "222", "token", auto_publish=False)
+
+    events = poller.run_sync()
+
+    assert {e.type for e in events} == {PollerEventType.READY}
+    assert sorted(call.page_id for call in graph.batches[0]) == ["111", "222"]
+    assert graph.published == []
+
+def test_error_and_expired_statuses_end_tracking():
+    graph = FakeGraph({"bad": ["IN_PROGRESS", "ERROR"], "old": ["EXPIRED"], "ok": ["FINISHED"]})
+    poller = make_poller(graph)
+    for cid in ("bad", "old", "ok"):
+        poller.track(cid, "111", "token")
+
+    events = {e.container_id: e.type for e in poller.run_sync()}
+
+    assert events == {"bad": PollerEventType.ERROR, "old": PollerEventType.EXPIRED,
+                      "ok": PollerEventType.PUBLISHED}
+    assert graph.published == ["ok"]
+
+def test_repeated_check_failures_become_an_error_event():
+    graph = FakeGraph({"c1": [MetaAPIError("API Error 2: temporary")]})
+    poller = make_poller(graph, max_check_errors=3)
+    poller.track("c1", "111", "token")
+
+    events = poller.run_sync()
+
+    assert [e.type for e in events] == [PollerEventType.ERROR]
+    assert len(graph.checks["c1"]) == 3
+
+def test_containers_that_never_finish_expire_at_the_deadline():
+    graph = FakeGraph({"c1": ["IN_PROGRESS"]})
+    poller = make_poller(graph, timeout=0.1, max_delay=0.02)
+    poller.track("c1", "111", "token")
+
+    started = time.monotonic()
+    events = poller.run_sync()
+
+    assert [e.type for e in events] == [PollerEventType.EXPIRED]
+    assert events[0].data["polls"] >= 2
+    assert time.monotonic() - started < 1
+    assert graph.published == []
+
+def test_rounds_only_poll_pages_with_a_free_slot():
+    graph = FakeGraph({cid: ["FINISHED"] for cid in ("a1", "a2", "a3", "b1")},
+                      page_bucket=BucketSpec(capacity=1, refill_per_second=20))
+    poller = make_poller(graph)
+    for cid in ("a1", "a2", "a3"):
+        poller.track(cid, "111", "token", auto_publish=False)
+    poller.track("b1", "222", "token", auto_publish=False)
+
+    events = poller.run_sync()
+
+    assert [e.type for e in events] == [PollerEventType.READY] * 4
+    assert [sorted(call.endpoint for call in calls) for calls in graph.batches][0] == ["a1", "b1"]
+    assert all(sum(call.page_id == "111" for call in calls) == 1 for calls in graph.batches)
+
+def test_rate_limit_refusals_are_not_check_errors():
+    graph = FakeGraph({"c1": ["FINISHED"]}, refusals=4)
+    poller = make_poller(graph, max_check_errors=2)
+    poller.track("c1", "111", "token", auto_publish=False)
+
+    events = poller.run_sync()
+
+    assert [(e.type, e.data) for e in events] == [(PollerEventType.READY, {})]
+    assert len(graph.checks["c1"]) == 1
@@ -0,0 +1,57 @@
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.analytics.insights_ingestor import InsightsIngestor
+
+DAY = 86400
+
+def end_time(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+class FakeGraph:
+    """Daily values for every day in the requested range"""
+
+    def __init__(self):
+        self.values = {}
+        self.requests = []
+
+    def iter_insights(self, page_id, access_token, metrics, period, since, until):
+        self.requests.append((tuple(metrics), since, until))
+        for metric in metrics:
+            for ts in range(since - since % DAY + DAY, until + 1, DAY):
+                yield {"metric": metric, "period": period, "end_time": end_time(ts),
+                       "value": self.values.get((metric, ts), 1)}
+
+def test_second_run_only_fetches_the_lookback_window(tmp_path):
+    graph = FakeGraph()
+    ingestor = InsightsIngestor(graph, data_root=str(tmp_path))
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    first = ingestor.ingest_page("111", "token", ["reach", "impressions"], now=now)
+    second = ingestor.ingest_page("111", "token", ["reach", "impressions"],
+                                  now=now + timedelta(days=1))
+
+    assert first == {"reach": 30, "impressions": 30}
+    assert second == {"reach": 1, "impressions": 1}
+    metrics, since, until = graph.requests[-1]
+    assert metrics == ("reach", "impressions")
+    assert until - since == 4 * DAY
+
+def test_late_corrections_are_appended_and_win(tmp_path):
+    graph = FakeGraph()
+    ingestor = InsightsIngestor(graph, data_root=str(tmp_path))
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    ingestor.ingest_page("111", "token", ["reach"], now=now)
+
+    corrected_day = int(now.timestamp()) - DAY
+    graph.values[("reach", corrected_day)] = 42
+    appended = ingestor.ingest_page("111", "token", ["reach"], now=now)
+
+    assert appended == {"reach": 1}
+    series = {row["end_time"]: row["value"] for row in ingestor.read("111", "reach")}
+    assert series[end_time(corrected_day)] == 42
+    assert len(series) == 30
@@ -0,0 +1,105 @@
+import sys
+import os
+import json
+import time
+import threading
+from datetime import datetime
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.log_writer import JsonLinesWriter, Durability, get_log_writer
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+def test_flush_mode_writes_every_line_through_one_handle(tmp_path):
+    writer = JsonLinesWriter(str(tmp_path), "sync", clock=Clock(datetime(2024, 5, 1, 12)))
+
+    writer.write({"n": 1})
+    handle = writer._file
+    writer.write({"n": 2})
+
+    assert read_lines(tmp_path / "sync_20240501.json") == [{"n": 1}, {"n": 2}]
+    assert writer._file is handle
+    writer.close()
+
+def wait_for_lines(path, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if path.exists() and len(read_lines(path)) >= count:
+            return read_lines(path)
+        time.sleep(0.01)
+    return read_lines(path) if path.exists() else []
+
+def test_batched_mode_holds_lines_until_the_batch_fills(tmp_path):
+    writer = JsonLinesWriter(str(tmp_path), "sync", Durability.BATCHED, max_lines=3,
+                             flush_interval=60, clock=Clock(datetime(2024, 5, 1, 12)))
+    path = tmp_path / "sync_20240501.json"
+
+    writer.write({"n": 1})
+    writer.write({"n": 2})
+    time.sleep(0.1)
+    assert not path.exists()
+
+    writer.write({"n": 3})
+    assert len(wait_for_lines(path, 3)) == 3
+    writer.close()
+
+def test_batched_writes_never_touch_the_file_on_the_callers_thread(tmp_path, monkeypatch):
+    writer = JsonLinesWriter(str(tmp_path), "sync", Durability.BATCHED, max_lines=2,
+                             flush_interval=60, clock=Clock(datetime(2024, 5, 1, 12)))
+    writers = set()
+    write_batch = writer._write_batch
+
+    def recording(batch):
+        if batch:
+            writers.add(threading.current_thread())
+        write_batch(batch)
+
+    monkeypatch.setattr(writer, "_write_batch", recording)
+    for n in range(6):
+        writer.write({"n": n})
+
+    assert len(wait_for_lines(tmp_path / "sync_20240501.json", 6)) == 6
+    assert writers == {writer._thread}
+    writer.close()
+
+def test_background_thread_flushes_idle_buffers(tmp_path):
+    writer = JsonLinesWriter(str(tmp_path), "sync", Durability.BATCHED, flush_interval=0.05,
+                             clock=Clock(datetime(2024, 5, 1, 12)))
+    writer.write({"n": 1})
+
+    time.sleep(0.3)
+
+    assert read_lines(tmp_path / "sync_20240501.json") == [{"n": 1}]
+    writer.close()
+
+def test_files_rotate_at_midnight(tmp_path):
+    clock = Clock(datetime(2024, 5, 1, 23, 59))
+    writer = JsonLinesWriter(str(tmp_path), "events", Durability.BATCHED, flush_interval=60,
+                             clock=clock)
+
+    writer.write({"n": 1})
+    clock.now = datetime(2024, 5, 2, 0, 1)
+    writer.write({"n": 2})
+    writer.close()
+
+    assert read_lines(tmp_path / "events_20240501.json") == [{"n": 1}]
+    assert read_lines(tmp_path / "events_20240502.json") == [{"n": 2}]
+
+def test_writers_are_shared_per_file_family(tmp_path):
+    first = get_log_writer(str(tmp_path), "audit")
+
+    assert get_log_writer(str(tmp_path), "audit") is first
+    assert get_log_writer(str(tmp_path), "other") is not first
+    first.close()
+    assert get_log_writer(str(tmp_path), "audit") is not first
@@ -0,0 +1,81 @@
+import sys
+import os
+import json
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.meta_client_v24 import (MetaGraphClient, MetaAppConfig, MetaAPIError,
+                                      RateLimitExceeded, BatchRequest)
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        self.calls.append({"method": method, "url": url, "params": params, "data": data})
+        operations = json.loads(data["batch"])
+        responses = []
+        for op in operations:
+            if "bad" in op["relative_url"]:
+                responses.append({"code": 400, "body": json.dumps(
+                    {"error": {"code": 190, "message": "Invalid token"}})})
+            else:
+                responses.append({"code": 200, "body": json.dumps({"data": [op["relative_url"]]})})
+        return FakeResponse(responses)
+
+def make_client():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz"),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.transport.session = FakeSession()
+    return client
+
+def test_batch_splits_results_and_errors():
+    client = make_client()
+    results = client.batch([
+        BatchRequest("GET", "111/insights", "token-a", "111", {"metric": "reach"}),
+        BatchRequest("GET", "bad/insights", "token-b", "bad", {"metric": "reach"}),
+    ])
+
+    assert "access_token=token-a" in results[0]["data"][0]
+    assert "appsecret_proof=" in results[0]["data"][0]
+    assert isinstance(results[1], MetaAPIError)
+    assert results[1].code == 190
+
+def test_batch_chunks_at_fifty():
+    client = make_client()
+    pages = {str(i): f"token-{i}" for i in range(120)}
+    results = client.batch_get_instagram_media(pages)
+
+    assert len(client.transport.session.calls) == 3
+    assert set(results) == set(pages)
+
+def test_batch_chunks_never_charge_a_page_beyond_its_bucket():
+    client = make_client()
+    calls = [BatchRequest("GET", f"c{i}", "token", "111") for i in range(50)]
+    calls.append(BatchRequest("GET", "c50", "token", "222"))
+
+    results = client.batch(calls)
+
+    sizes = [len(json.loads(call["data"]["batch"])) for call in client.transport.session.calls]
+    assert sizes == [45]
+    assert all("data" in result for result in results[:45])
+    # Page 111 is out of tokens; the remainder is refused per call, not resent
+    assert all(isinstance(result, RateLimitExceeded) for result in results[45:])
+    assert len(results) == 51
@@ -0,0 +1,162 @@
+import sys
+import os
+import asyncio
+import threading
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+from notion.core.notion_client import NotionClient, NotionPage, AutoNotionSync
+from notion.core.async_notion_client import AsyncNotionClient
+from notion.core.change_tracker import ChangeTracker
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class BlockSession:
+    """Creates pages and echoes appended children; can throttle the first append"""
+
+    def __init__(self, throttle_appends=0):
+        self.throttle_appends = throttle_appends
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, json=None, **kwargs):
+        with self.lock:
+            self.sent.append((method, url, json))
+            if method == 'PATCH' and self.throttle_appends:
+                self.throttle_appends -= 1
+                return FakeResponse({}, 429, {"Retry-After": "0.1"})
+            pages = sum(1 for m, u, _ in self.sent if m == 'POST')
+        if method == 'POST':
+            return FakeResponse({"id": f"page-{pages}"})
+        return FakeResponse({"results": json["children"]})
+
+def make_client(session, **kwargs):
+    kwargs.setdefault("change_tracker", ChangeTracker())
+    client = NotionClient("secret", transport=HTTPTransport(metrics=MetricsRegistry()), **kwargs)
+    client.transport.session = session
+    return client
+
+def paragraphs(count):
+    return [{"type": "paragraph", "paragraph": {"rich_text": [{"text": {"content": str(i)}}]}}
+            for i in range(count)]
+
+def test_long_content_is_sent_in_100_block_batches():
+    session = BlockSession()
+    client = make_client(session)
+
+    client.create_page(NotionPage("db", {}, content=paragraphs(250)))
+
+    create, *appends = session.sent
+    assert len(create[2]["children"]) == 100
+    assert [len(body["children"]) for _, _, body in appends] == [100, 50]
+    assert all(url.endswith("/blocks/page-1/children") for _, url, _ in appends)
+    assert appends[-1][2]["children"][-1] == paragraphs(250)[-1]
+
+def test_short_content_goes_out_with_the_create():
+    session = BlockSession()
+    make_client(session).create_page(NotionPage("db", {}, content=paragraphs(3)))
+
+    assert len(session.sent) == 1
+    assert len(session.sent[0][2]["children"]) == 3
+
+def test_throttled_append_does_not_recreate_the_page_on_async_client():
+    session = BlockSession(throttle_appends=1)
+    client = AsyncNotionClient(client=make_client(session, jitter=0))
+
+    async def run():
+        async with client:
+            return await client.create_pages([NotionPage("db", {}, content=paragraphs(150))])
+
+    result = asyncio.run(run())[0]
+
+    assert result["id"] == "page-1"
+    assert [m for m, _, _ in session.sent] == ['POST', 'PATCH', 'PATCH']
+
+class TreeSession:
+    """
+    page
+    ├── heading
+    ├── toggle            (children split over two cursor pages)
+    │   ├── a
+    │   └── b ── b1
+    └── para
+    """
+
+    TREE = {
+        "page": ["heading", "toggle", "para"],
+        "toggle": ["a", "b"],
+        "b": ["b1"],
+    }
+
+    def __init__(self):
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def block(self, block_id):
+        return {"id": block_id, "type": "paragraph", "has_children": block_id in self.TREE,
+                "paragraph": {"rich_text": [{"plain_text": block_id.upper()}]}}
+
+    def request(self, method, url, params=None, **kwargs):
+        block_id = url.split("/blocks/")[1].split("/")[0]
+        cursor = (params or {}).get("start_cursor")
+        with self.lock:
+            self.fetched.append((block_id, cursor))
+        ids = self.TREE.get(block_id, [])
+        if block_id == "toggle":
+            if cursor is None:
+                return FakeResponse({"results": [self.block("a")], "has_more": True,
+                                     "next_cursor": "c2"})
+            ids = ["b"]
+        return FakeResponse({"results": [self.block(i) for i in ids], "has_more": False})
+
+def test_block_tree_follows_cursors_and_nesting_in_document_order():
+    session = TreeSession()
+    tree = make_client(session).get_block_tree("page")
+
+    assert [(b["id"], b["depth"], b["parent_id"]) for b in tree] == [
+        ("heading", 0, "page"), ("toggle", 0, "page"), ("a", 1, "toggle"),
+        ("b", 1, "toggle"), ("b1", 2, "b"), ("para", 0, "page"),
+    ]
+    assert tree[0]["text"] == "HEADING"
+    assert ("toggle", "c2") in session.fetched
+    assert len(session.fetched) == 4
+
+def test_block_tree_respects_max_depth():
+    session = TreeSession()
+    tree = make_client(session).get_block_tree("page", max_depth=0)
+
+    assert [b["id"] for b in tree] == ["heading", "toggle", "para"]
+    assert session.fetched == [("page", None)]
+
+def test_async_block_tree_matches_sync():
+    expected = make_client(TreeSession()).get_block_tree("page")
+    client = AsyncNotionClient(client=make_client(TreeSession()))
+
+    async def run():
+        async with client:
+            return await client.get_block_tree("page")
+
+    assert asyncio.run(run()) == expected
+
+def test_long_captions_are_split_into_text_objects_notion_accepts():
+    caption = "c" * 2200
+    blocks = AutoNotionSync(None, None)._create_post_content_blocks({"id": "1", "caption": caption})
+    parts = blocks[1]["paragraph"]["rich_text"]
+
+    assert all(len(part["text"]["content"]) <= 2000 for part in parts)
+    assert "".join(part["text"]["content"] for part in parts) == f"Caption: {caption}"
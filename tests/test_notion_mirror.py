@@ -0,0 +1,71 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notion.core.notion_client import NotionPage
+from notion.core.notion_mirror import NotionMirror
+
+def page(page_id, edited, post_id, likes=0):
+    return {"id": page_id, "last_edited_time": edited, "archived": False,
+            "parent": {"database_id": "db"},
+            "properties": {
+                "Post ID": {"type": "rich_text", "rich_text": [{"plain_text": post_id}]},
+                "Likes": {"type": "number", "number": likes}
+            }}
+
+class FakeNotion:
+    def __init__(self, pages):
+        self.pages = {p["id"]: p for p in pages}
+        self.queries = []
+
+    def iter_database(self, database_id, filter_obj=None, sorts=None, page_size=100, prefetch=False):
+        self.queries.append(filter_obj)
+        since = filter_obj["last_edited_time"]["on_or_after"] if filter_obj else ""
+        return iter(sorted((p for p in self.pages.values() if p["last_edited_time"] >= since),
+                           key=lambda p: p["last_edited_time"]))
+
+    def update_page(self, page_id, properties):
+        updated = dict(self.pages[page_id], last_edited_time="2026-03-02T10:00:00.000Z")
+        updated["properties"] = {**updated["properties"], **properties}
+        self.pages[page_id] = updated
+        return updated
+
+    def create_page(self, notion_page: NotionPage):
+        created = page(f"p{len(self.pages) + 1}", "2026-03-02T11:00:00.000Z", "new")
+        self.pages[created["id"]] = created
+        return created
+
+def test_incremental_sync_uses_the_watermark(tmp_path):
+    notion = FakeNotion([page("p1", "2026-03-01T09:00:00.000Z", "A"),
+                         page("p2", "2026-03-01T10:00:00.000Z", "B")])
+    mirror = NotionMirror(notion, path=str(tmp_path / "mirror.db"))
+
+    assert mirror.sync("db") == {"fetched": 2, "removed": 0}
+    notion.pages["p1"] = page("p1", "2026-03-01T12:00:00.000Z", "A", likes=5)
+    assert mirror.sync("db")["fetched"] == 2  # the edit plus the boundary minute
+    assert notion.queries[-1]["last_edited_time"] == {"on_or_after": "2026-03-01T10:00:00.000Z"}
+    assert mirror.find("db", "Post ID", "A")[0]["properties"]["Likes"]["number"] == 5
+
+def test_writes_go_through_to_the_mirror(tmp_path):
+    notion = FakeNotion([page("p1", "2026-03-01T09:00:00.000Z", "A")])
+    mirror = NotionMirror(notion, path=str(tmp_path / "mirror.db"))
+    mirror.sync("db")
+
+    mirror.update_page("p1", {"Likes": {"type": "number", "number": 9}})
+    mirror.create_page(NotionPage("db", {}))
+
+    assert mirror.get("p1")["properties"]["Likes"]["number"] == 9
+    assert mirror.count("db") == 2
+    assert [p["id"] for p in mirror.pages("db", where=lambda v: v["Likes"] == 9)] == ["p1"]
+
+def test_full_sync_drops_pages_gone_from_notion(tmp_path):
+    notion = FakeNotion([page("p1", "2026-03-01T09:00:00.000Z", "A"),
+                         page("p2", "2026-03-01T10:00:00.000Z", "B")])
+    mirror = NotionMirror(notion, path=str(tmp_path / "mirror.db"))
+    mirror.sync("db")
+
+    del notion.pages["p2"]
+    assert mirror.sync("db", full=True)["removed"] == 1
+    assert mirror.get("p2") is None
@@ -0,0 +1,121 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+from notion.core.notion_client import NotionClient, NotionPage
+from notion.core.async_notion_client import AsyncNotionClient
+from notion.core.change_tracker import ChangeTracker
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class NotionSession:
+    """Answers the first `throttle` requests with 429 Retry-After: 0.2"""
+
+    def __init__(self, throttle=0):
+        self.throttle = throttle
+        self.sent_at = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, json=None, **kwargs):
+        with self.lock:
+            self.sent_at.append(time.monotonic())
+            if self.throttle:
+                self.throttle -= 1
+                return FakeResponse({}, 429, {"Retry-After": "0.2"})
+        return FakeResponse({"id": f"page-{len(self.sent_at)}"})
+
+def make_client(session, **kwargs):
+    kwargs.setdefault("change_tracker", ChangeTracker())
+    client = NotionClient("secret", transport=HTTPTransport(metrics=MetricsRegistry()), **kwargs)
+    client.transport.session = session
+    return client
+
+def test_retry_after_is_honored():
+    session = NotionSession(throttle=1)
+    client = make_client(session, jitter=0)
+
+    result = client.create_page(NotionPage("db", {}))
+
+    assert result["id"] == "page-2"
+    assert session.sent_at[1] - session.sent_at[0] >= 0.2
+
+def test_bulk_creates_are_paced_to_three_per_second():
+    session = NotionSession()
+    notion = AsyncNotionClient(client=make_client(session), max_concurrency=6)
+
+    results = asyncio.run(notion.create_pages([NotionPage("db", {}) for _ in range(9)]))
+    notion.close()
+
+    assert len([r for r in results if isinstance(r, dict)]) == 9
+    # 3 burst slots, then 3 per second for the other 6
+    assert session.sent_at[-1] - session.sent_at[0] >= 1.9
+
+def test_async_front_end_leaves_a_shared_client_blocking():
+    session = NotionSession()
+    shared = make_client(session)
+    notion = AsyncNotionClient(client=shared)
+
+    asyncio.run(notion.create_pages([NotionPage("db", {}) for _ in range(4)]))
+    notion.close()
+
+    assert shared.block is True and notion.sync.block is False
+    assert notion.sync.rate_limiter is shared.rate_limiter
+    # The limiter is shared, so the sync client still has to wait for a slot
+    results = shared.create_pages([NotionPage("db", {}) for _ in range(2)])
+    assert all(isinstance(r, dict) for r in results)
+
+class PagedSession:
+    """A 250-row database served 100 rows at a time"""
+
+    def __init__(self, rows=250):
+        self.rows = rows
+        self.bodies = []
+
+    def request(self, method, url, json=None, **kwargs):
+        self.bodies.append(json)
+        start = int(json.get("start_cursor") or 0)
+        end = min(start + json.get("page_size", 100), self.rows)
+        return FakeResponse({"results": [{"id": str(i)} for i in range(start, end)],
+                             "has_more": end < self.rows,
+                             "next_cursor": str(end) if end < self.rows else None})
+
+def test_iter_database_follows_cursors():
+    session = PagedSession()
+    client = make_client(session)
+    sorts = [{"property": "Scheduled Date", "direction": "ascending"}]
+
+    ids = [page["id"] for page in client.iter_database("db", sorts=sorts, prefetch=True)]
+
+    assert ids == [str(i) for i in range(250)]
+    assert [body.get("start_cursor") for body in session.bodies] == [None, "100", "200"]
+    assert all(body["sorts"] == sorts for body in session.bodies)
+
+def test_async_iter_database_follows_cursors():
+    session = PagedSession(rows=120)
+    notion = AsyncNotionClient(client=make_client(session))
+
+    async def collect():
+        return [page["id"] async for page in notion.iter_database("db", page_size=50,
+                                                                   prefetch=True)]
+
+    assert asyncio.run(collect()) == [str(i) for i in range(120)]
+    notion.close()
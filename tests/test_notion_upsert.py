@@ -0,0 +1,78 @@
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notion.core.notion_client import AutoNotionSync
+
+POSTS_SCHEMA = {"properties": {
+    "Title": {"type": "title"}, "Platform": {"type": "select"}, "Post ID": {"type": "rich_text"},
+    "Caption": {"type": "rich_text"}, "Media Type": {"type": "select"},
+    "Posted Date": {"type": "date"}, "Likes": {"type": "number"}, "Comments": {"type": "number"},
+    "Status": {"type": "status", "status": {"options": [{"name": "Published"}]}},
+}}
+
+class FakeNotion:
+    def __init__(self, existing):
+        self.existing = existing
+        self.scans = 0
+        self.created = []
+        self.updated = []
+
+    def get_database(self, database_id):
+        return POSTS_SCHEMA
+
+    def iter_database(self, database_id, filter_obj=None, sorts=None, page_size=100, prefetch=False):
+        self.scans += 1
+        for page_id, post_id in self.existing.items():
+            yield {"id": page_id, "properties": {
+                "Post ID": {"type": "rich_text", "rich_text": [{"plain_text": post_id}]}}}
+
+    def create_page(self, notion_page):
+        self.created.append(notion_page)
+        return {"id": f"new-{len(self.created)}"}
+
+    def update_page(self, page_id, properties):
+        self.updated.append(page_id)
+        return {"id": page_id}
+
+class FakeMeta:
+    def get_media_object(self, page_id, access_token, media_id, fields=None):
+        return {"id": media_id, "caption": "hello", "media_type": "IMAGE",
+                "timestamp": "2024-05-01T10:00:00+0000", "like_count": 3}
+
+def test_resync_updates_existing_rows_and_creates_new_ones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = FakeNotion({"page-a": "1789"})
+    sync = AutoNotionSync(meta_client=FakeMeta(), notion_client=notion)
+
+    first = sync.sync_instagram_post_to_notion("111", "token", "1789", "db")
+    second = sync.sync_instagram_post_to_notion("111", "token", "1790", "db")
+    again = sync.sync_instagram_post_to_notion("111", "token", "1790", "db")
+
+    assert first["id"] == "page-a" and notion.updated == ["page-a", "new-1"]
+    assert second["id"] == again["id"] == "new-1"
+    assert len(notion.created) == 1
+    assert notion.scans == 1
+
+class SlowCreateNotion(FakeNotion):
+    def create_page(self, notion_page):
+        time.sleep(0.05)
+        return super().create_page(notion_page)
+
+def test_concurrent_upserts_of_one_key_create_one_page(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = SlowCreateNotion({})
+    sync = AutoNotionSync(meta_client=FakeMeta(), notion_client=notion)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(
+            lambda _: sync.sync_instagram_post_to_notion("111", "token", "1790", "db"),
+            range(6)))
+
+    assert len(notion.created) == 1
+    assert {result["id"] for result in results} == {"new-1"}
+    assert notion.updated == ["new-1"] * 5
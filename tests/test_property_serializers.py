@@ -0,0 +1,76 @@
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notion.core.notion_client import AutoNotionSync
+from notion.core.property_serializers import PropertySerializer, NotionSchemaError
+
+CALENDAR_SCHEMA = {"properties": {
+    "Title": {"type": "title"},
+    "Instagram Page": {"type": "select"},
+    "Content Type": {"type": "select"},
+    "Scheduled Date": {"type": "date"},
+    "Status": {"type": "status", "status": {"options": [{"name": "Planned"}, {"name": "Done"}]}},
+    "Priority": {"type": "select"},
+    "Score": {"type": "number"},
+    "Updated": {"type": "last_edited_time"},
+}}
+
+class FakeNotion:
+    def __init__(self):
+        self.schema_reads = 0
+        self.created = []
+
+    def get_database(self, database_id):
+        self.schema_reads += 1
+        return CALENDAR_SCHEMA
+
+    def create_pages(self, pages):
+        self.created.extend(pages)
+        return [{"id": f"page-{i}"} for i, _ in enumerate(pages)]
+
+def test_records_are_encoded_from_the_schema_fetched_once():
+    notion = FakeNotion()
+    serializer = PropertySerializer(notion)
+
+    first = serializer.encode("db", {"Title": "Hello", "Score": 4.5,
+                                     "Scheduled Date": datetime(2024, 5, 1, 9, 30)})
+    serializer.encode("db", {"Status": "Done"})
+
+    assert first == {
+        "Title": {"title": [{"text": {"content": "Hello"}}]},
+        "Score": {"number": 4.5},
+        "Scheduled Date": {"date": {"start": "2024-05-01T09:30:00"}},
+    }
+    assert notion.schema_reads == 1
+
+def test_every_mismatch_is_reported_before_sending():
+    serializer = PropertySerializer(FakeNotion())
+
+    with pytest.raises(NotionSchemaError) as error:
+        serializer.encode("db", {"Score": "high", "Status": "Someday", "Owner": "me",
+                                 "Updated": "2024-05-01", "Scheduled Date": "tomorrow"})
+
+    assert len(error.value.errors) == 5
+
+def test_long_text_is_split_into_text_objects():
+    serializer = PropertySerializer(FakeNotion())
+
+    title = serializer.encode("db", {"Title": "x" * 4500})["Title"]["title"]
+
+    assert [len(part["text"]["content"]) for part in title] == [2000, 2000, 500]
+
+def test_calendar_sync_skips_entries_that_do_not_fit(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = FakeNotion()
+    sync = AutoNotionSync(meta_client=None, notion_client=notion)
+
+    report = sync.sync_content_calendar("page", [{"type": "Reel"}, {"status": "Someday"}], "db")
+
+    assert report["synced_items"] == 1 and len(notion.created) == 1
+    assert "unknown status 'Someday'" in report["errors"][0]
@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.meta_client_v24 import MetaAPIError, ContentType
+from api.core.publish_outbox import PublishOutbox, OutboxState
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class FakeGraph:
+    """Containers finish immediately; publishes can lose their response"""
+
+    def __init__(self, lose_publish_responses=0):
+        self.containers = {}
+        self.uploads = 0
+        self.publishes = 0
+        self.lose_publish_responses = lose_publish_responses
+
+    def upload_media(self, page_id, access_token, media_path, media_type, caption=None, **kwargs):
+        self.uploads += 1
+        container_id = f"c{self.uploads}"
+        self.containers[container_id] = 'FINISHED'
+        return {"id": container_id}
+
+    def _make_request(self, method, endpoint, access_token, page_id=None, **kwargs):
+        return {"status_code": self.containers[endpoint]}
+
+    def publish_media(self, page_id, access_token, creation_id):
+        self.publishes += 1
+        self.containers[creation_id] = 'PUBLISHED'
+        if self.lose_publish_responses:
+            self.lose_publish_responses -= 1
+            raise MetaAPIError("Network error: read timed out")
+        return {"id": f"m-{creation_id}"}
+
+def make_outbox(tmp_path, graph, clock):
+    return PublishOutbox(graph, lambda page_id: "token", path=str(tmp_path / "outbox.db"),
+                         workers=2, backoff=10, clock=clock)
+
+def test_enqueue_is_idempotent_and_drain_publishes_once(tmp_path):
+    graph, clock = FakeGraph(), FakeClock()
+    outbox = make_outbox(tmp_path, graph, clock)
+
+    for _ in range(2):
+        outbox.enqueue("MISSION-1", "111", "https://cdn/1.jpg", ContentType.IMAGE, "hi")
+    outbox.enqueue("MISSION-2", "222", "https://cdn/2.jpg", ContentType.IMAGE)
+    outbox.drain()
+    outbox.drain()
+
+    assert outbox.stats()["PUBLISHED"] == 2
+    assert graph.uploads == 2 and graph.publishes == 2
+    assert outbox.get("MISSION-1").media_id == "m-c1"
+
+def test_lost_publish_response_is_not_published_twice(tmp_path):
+    graph, clock = FakeGraph(lose_publish_responses=1), FakeClock()
+    outbox = make_outbox(tmp_path, graph, clock)
+    outbox.enqueue("MISSION-1", "111", "https://cdn/1.jpg", ContentType.IMAGE)
+
+    entry = outbox.process_one()
+    assert entry.state == OutboxState.CONTAINER_CREATED and entry.attempts == 1
+
+    # A restarted process sees the same file and resumes after the backoff
+    clock.now += 10
+    resumed = make_outbox(tmp_path, graph, clock)
+    resumed.drain()
+
+    assert resumed.get("MISSION-1").state == OutboxState.PUBLISHED
+    assert graph.uploads == 1 and graph.publishes == 1
+
+def test_leased_entries_are_not_claimed_twice(tmp_path):
+    graph, clock = FakeGraph(), FakeClock()
+    outbox = make_outbox(tmp_path, graph, clock)
+    outbox.enqueue("MISSION-1", "111", "https://cdn/1.jpg", ContentType.IMAGE)
+
+    assert outbox._claim("worker-a") is not None
+    assert outbox._claim("worker-b") is None
+    clock.now += outbox.lease_seconds
+    assert outbox._claim("worker-b").key == "MISSION-1"
@@ -0,0 +1,104 @@
+import sys
+import os
+import asyncio
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.rate_limiter import TokenBucketLimiter, BucketSpec
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_bucket_exhausts_and_refills():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter({"page": BucketSpec(capacity=2, refill_per_second=0.5)}, clock=clock)
+
+    assert limiter.try_acquire(["page:1"]) == 0.0
+    assert limiter.try_acquire(["page:1"]) == 0.0
+    assert limiter.try_acquire(["page:1"]) == 2.0
+    assert limiter.time_until_available(["page:1"]) == 2.0
+
+    clock.now += 2.0
+    assert limiter.try_acquire(["page:1"]) == 0.0
+
+def test_acquire_is_all_or_nothing():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter({
+        "app": BucketSpec(capacity=5, refill_per_second=1),
+        "page": BucketSpec(capacity=1, refill_per_second=1)
+    }, clock=clock)
+
+    assert limiter.try_acquire(["app:a", "page:1"]) == 0.0
+    assert limiter.try_acquire(["app:a", "page:1"]) > 0
+    # The refused call must not have charged the app bucket
+    assert limiter.try_acquire(["app:a"], tokens=4) == 0.0
+
+def test_cost_above_capacity_can_never_be_paid():
+    limiter = TokenBucketLimiter({"page": BucketSpec(capacity=2, refill_per_second=1)},
+                                 clock=FakeClock())
+
+    assert limiter.try_acquire({"page:1": 3}) == float('inf')
+    assert limiter.time_until_available(["page:1"], tokens=3) == float('inf')
+    assert limiter.acquire(["page:1"], tokens=3) is False
+    assert limiter.try_acquire({"page:1": 2}) == 0.0
+
+def test_penalize_blocks_until_retry_after():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter({"app": BucketSpec.per_hour(180)}, clock=clock)
+
+    limiter.penalize(["app:a"], 30)
+    assert limiter.try_acquire(["app:a"]) == 30.0
+    clock.now += 30
+    assert limiter.try_acquire(["app:a"]) == 0.0
+
+def test_sqlite_ledger_is_shared(tmp_path):
+    ledger = str(tmp_path / "limits.db")
+    clock = FakeClock()
+    first = TokenBucketLimiter({"page": BucketSpec(capacity=1, refill_per_second=0.1)},
+                               ledger_path=ledger, clock=clock)
+    second = TokenBucketLimiter({"page": BucketSpec(capacity=1, refill_per_second=0.1)},
+                                ledger_path=ledger, clock=clock)
+
+    assert first.try_acquire(["page:1"]) == 0.0
+    assert second.try_acquire(["page:1"]) > 0
+
+def test_acquire_async_waits_for_slot():
+    limiter = TokenBucketLimiter({"page": BucketSpec(capacity=1, refill_per_second=50)})
+
+    async def take_two():
+        await limiter.acquire_async(["page:1"])
+        return await limiter.acquire_async(["page:1"], timeout=1.0)
+
+    assert asyncio.run(take_two()) is True
+
+def test_rate_scale_speeds_up_refill():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter({"page": BucketSpec(capacity=1, refill_per_second=0.1)}, clock=clock)
+
+    limiter.try_acquire(["page:1"])
+    assert limiter.time_until_available(["page:1"]) == 10.0
+    limiter.set_rate_scale("page:1", 2.0)
+    assert limiter.time_until_available(["page:1"]) == 5.0
+
+def test_usage_headers_drive_rate_scale():
+    from api.core.metrics import MetricsRegistry
+    from api.core.usage_model import MetaUsageModel
+
+    metrics = MetricsRegistry()
+    model = MetaUsageModel("app1", metrics=metrics)
+    reports = model.observe({
+        "X-App-Usage": '{"call_count": 10, "total_time": 5, "total_cputime": 2}',
+        "X-Business-Use-Case-Usage": '{"42": [{"type": "pages", "call_count": 96, '
+                                     '"total_cputime": 3, "total_time": 4, '
+                                     '"estimated_time_to_regain_access": 2}]}'
+    }, page_id="42")
+
+    assert model.rate_scale(reports["app:app1"]) > 1.0
+    assert model.rate_scale(reports["page:42"]) == model.min_scale
+    assert reports["page:42"].regain_seconds == 120
+    assert metrics.get("meta_usage_percent", scope="page:42", kind="call_count") == 96
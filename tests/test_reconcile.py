@@ -0,0 +1,115 @@
+import sys
+import os
+import threading
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from notion.core.notion_client import AutoNotionSync
+
+POSTS_SCHEMA = {"properties": {
+    "Title": {"type": "title"}, "Platform": {"type": "select"}, "Post ID": {"type": "rich_text"},
+    "Caption": {"type": "rich_text"}, "Media Type": {"type": "select"},
+    "Posted Date": {"type": "date"}, "Likes": {"type": "number"}, "Comments": {"type": "number"},
+    "Status": {"type": "status", "status": {"options": [{"name": "Published"}]}},
+}}
+
+def notion_row(page_id, post_id, likes, posted="2024-05-01T10:00:00.000+00:00"):
+    """A posts-database row the way Notion returns it"""
+    return {"id": page_id, "properties": {
+        "Title": {"type": "title", "title": [{"plain_text": f"Instagram Post: {post_id}"}]},
+        "Platform": {"type": "select", "select": {"name": "Instagram"}},
+        "Post ID": {"type": "rich_text", "rich_text": [{"plain_text": post_id}]},
+        "Caption": {"type": "rich_text", "rich_text": [{"plain_text": f"caption {post_id}"}]},
+        "Media Type": {"type": "select", "select": {"name": "IMAGE"}},
+        "Posted Date": {"type": "date", "date": {"start": posted}},
+        "Likes": {"type": "number", "number": likes},
+        "Comments": {"type": "number", "number": 0},
+        "Status": {"type": "status", "status": {"name": "Published"}},
+    }}
+
+def media(post_id, likes):
+    return {"id": post_id, "caption": f"caption {post_id}", "media_type": "IMAGE",
+            "timestamp": "2024-05-01T10:00:00+0000", "like_count": likes, "comments_count": 0}
+
+class FakeMeta:
+    def __init__(self, items):
+        self.items = items
+        self.since = "unset"
+
+    def iter_media(self, page_id, access_token, fields=None, page_size=25, since=None, stop=None):
+        self.since = since
+        yield from self.items
+
+class FakeNotion:
+    def __init__(self, rows):
+        self.rows = rows
+        self.created = []
+        self.updates = []
+        self.lock = threading.Lock()
+
+    def get_database(self, database_id):
+        return POSTS_SCHEMA
+
+    def iter_database(self, database_id, filter_obj=None, sorts=None, page_size=100, prefetch=False):
+        yield from self.rows
+
+    def create_page(self, page):
+        with self.lock:
+            self.created.append(page)
+        return {"id": f"new-{len(self.created)}"}
+
+    def update_page(self, page_id, properties, force=False):
+        with self.lock:
+            self.updates.append((page_id, properties, force))
+        return {"id": page_id}
+
+def test_reconcile_writes_only_new_posts_and_changed_fields(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = FakeNotion([notion_row("p1", "1", 10), notion_row("p2", "2", 5),
+                         notion_row("p3", "3", 1)])
+    meta = FakeMeta([media("1", 10), media("2", 7), media("4", 0)])
+    sync = AutoNotionSync(meta_client=meta, notion_client=notion)
+
+    report = sync.reconcile_instagram_posts("111", "token", "db")
+
+    assert (report.created, report.updated, report.unchanged) == (1, 1, 1)
+    assert report.orphaned == ["p3"]
+    assert notion.updates == [("p2", {"Likes": {"number": 7}}, True)]
+    assert notion.created[0].properties["Post ID"]["rich_text"][0]["text"]["content"] == "4"
+
+def test_incremental_reconcile_reports_no_orphans(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = FakeNotion([notion_row("p1", "1", 10), notion_row("p2", "2", 5)])
+    meta = FakeMeta([media("2", 5)])
+    sync = AutoNotionSync(meta_client=meta, notion_client=notion)
+
+    report = sync.reconcile_instagram_posts("111", "token", "db", since=1714550400)
+
+    assert meta.since == 1714550400
+    assert report.unchanged == 1 and report.orphaned == []
+    assert notion.updates == [] and notion.created == []
+
+class FlakyNotion(FakeNotion):
+    def update_page(self, page_id, properties, force=False):
+        if page_id == "p2":
+            raise ValueError("Notion rejected the update")
+        return super().update_page(page_id, properties, force)
+
+def test_bad_records_are_reported_and_the_run_carries_on(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notion = FlakyNotion([notion_row("p1", "1", 10), notion_row("p2", "2", 5),
+                          notion_row("p3", "3", 1)])
+    unencodable = dict(media("3", 1), media_type="IMAGE,VIDEO")
+    meta = FakeMeta([media("1", 11), unencodable, media("2", 7), media("4", 0)])
+    sync = AutoNotionSync(meta_client=meta, notion_client=notion)
+
+    report = sync.reconcile_instagram_posts("111", "token", "db")
+
+    assert [item["position"] for item in report.invalid] == [1]
+    assert "Media Type" in report.invalid[0]["error"]
+    assert report.failed == [{"key": "2", "error": "Notion rejected the update"}]
+    assert (report.created, report.updated) == (1, 1)
+    assert notion.updates == [("p1", {"Likes": {"number": 11}}, True)]
+    # The skipped record's row must not be mistaken for an orphan
+    assert report.orphaned == []
@@ -0,0 +1,96 @@
+import sys
+import os
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.meta_client_v24 import MetaGraphClient, MetaAppConfig
+from api.core.response_cache import ResponseCache
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class ETagSession:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.calls.append(headers)
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(None, status_code=304)
+        return FakeResponse({"data": [{"id": "1"}]}, headers={"ETag": '"v1"'})
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_client(clock):
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz"),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.cache = ResponseCache(metrics=MetricsRegistry(), clock=clock)
+    client.transport.session = ETagSession()
+    return client
+
+def test_fresh_hits_skip_the_network():
+    clock = FakeClock()
+    client = make_client(clock)
+
+    first = client.get_instagram_media("111", "token")
+    second = client.get_instagram_media("111", "token")
+
+    assert first == second
+    assert len(client.transport.session.calls) == 1
+    assert client.cache.stats()["hits"] == 1
+
+def test_callers_cannot_mutate_the_cached_body():
+    client = make_client(FakeClock())
+
+    client.get_instagram_media("111", "token")["data"].clear()
+    hit = client.get_instagram_media("111", "token")
+    hit["data"][0]["id"] = "changed"
+
+    assert client.get_instagram_media("111", "token") == {"data": [{"id": "1"}]}
+
+def test_stale_entries_revalidate_with_etag():
+    clock = FakeClock()
+    client = make_client(clock)
+
+    client.get_instagram_media("111", "token")
+    clock.now += 301
+    body = client.get_instagram_media("111", "token")
+
+    assert body == {"data": [{"id": "1"}]}
+    assert client.transport.session.calls[-1]["If-None-Match"] == '"v1"'
+    assert client.cache.stats()["revalidated"] == 1
+
+def test_keys_exclude_secrets_but_separate_tokens():
+    key_a = ResponseCache.make_key("111/media", {"fields": "id", "appsecret_proof": "x"}, "token-a")
+    key_b = ResponseCache.make_key("111/media", {"fields": "id", "appsecret_proof": "y"}, "token-a")
+    key_c = ResponseCache.make_key("111/media", {"fields": "id"}, "token-b")
+
+    assert key_a == key_b
+    assert key_a != key_c
+    assert "token-a" not in key_a
+
+def test_token_bodies_stay_off_disk(tmp_path):
+    cache = ResponseCache(sqlite_path=str(tmp_path / "cache.db"), metrics=MetricsRegistry())
+    cache.store("k", {"access_token": "secret-page-token"}, None, 60)
+
+    assert cache.disk.get("k") is None
+    assert cache.lookup("k")[1] is True
@@ -0,0 +1,111 @@
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from api.core.meta_client_v24 import MetaGraphClient, MetaAppConfig
+from api.core.metrics import MetricsRegistry
+from api.core.single_flight import SingleFlight
+from api.core.transport import HTTPTransport
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+        self.status_code = 200
+        self.headers = {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+class SlowSession:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return FakeResponse({"data": [{"id": "1"}]})
+
+def test_concurrent_identical_gets_share_one_request():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.transport.session = SlowSession()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: client.get_instagram_media("111", "token"), range(8)))
+        other_token = client.get_instagram_media("111", "other-token")
+
+    assert all(result == {"data": [{"id": "1"}]} for result in results)
+    assert other_token == results[0]
+    assert client.transport.session.calls == 2
+
+def test_each_caller_gets_its_own_copy():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.1)
+        return {"data": [{"id": "1"}]}
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait()
+        follower = pool.submit(flight.do, "key", lambda: "never runs")
+        first, second = leader.result(), follower.result()
+
+    assert first == second
+    assert first is not second and first["data"] is not second["data"]
+
+def test_followers_receive_the_leaders_error():
+    flight = SingleFlight(metrics=MetricsRegistry())
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", failing)
+        started.wait()
+        follower = pool.submit(flight.do, "key", lambda: "never runs")
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.in_flight() == 0
+
+class EchoTokenSession:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def request(self, method, url, params=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.2)
+        return FakeResponse({"data": {"input": params["input_token"]}})
+
+def test_debug_token_checks_of_different_tokens_are_not_coalesced():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.transport.session = EchoTokenSession()
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(client.validate_app_access_token, ["tokA", "tokB"]))
+
+    assert [r["data"]["input"] for r in results] == ["tokA", "tokB"]
+    assert client.transport.session.calls == 2
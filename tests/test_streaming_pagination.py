@@ -0,0 +1,109 @@
+import sys
+import os
+import asyncio
+from datetime import datetime, timezone
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.meta_client_v24 import MetaGraphClient, MetaAppConfig
+from api.core.async_meta import AsyncMetaGraphClient
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+
+DAY = 86400
+
+def make_client():
+    config = MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False)
+    return MetaGraphClient(config, transport=HTTPTransport(metrics=MetricsRegistry()))
+
+def posted(day):
+    return datetime(2024, 5, day, tzinfo=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S%z")
+
+class MediaGraph:
+    """Seven posts, newest first, served by cursor in pages of `limit`"""
+
+    def __init__(self):
+        self.posts = [{"id": str(day), "timestamp": posted(day)} for day in range(7, 0, -1)]
+        self.calls = []
+
+    def __call__(self, method, endpoint, access_token, page_id=None, params=None, **kwargs):
+        self.calls.append(dict(params))
+        start = int(params.get('after', 0))
+        end = start + params['limit']
+        paging = {"cursors": {"after": str(end)}, "next": "https://graph/next"} \
+            if end < len(self.posts) else {}
+        return {"data": self.posts[start:end], "paging": paging}
+
+class InsightsGraph:
+    """Serves at most `max_window` seconds per call; paging.next points at the following window"""
+
+    def __init__(self, max_window=40 * DAY):
+        self.max_window = max_window
+        self.calls = []
+
+    def __call__(self, method, endpoint, access_token, page_id=None, params=None, **kwargs):
+        self.calls.append(dict(params))
+        since = int(params['since'])
+        end = min(int(params['until']), since + self.max_window)
+        following = f"https://graph/next?since={end}&until={end + self.max_window}"
+        return {"data": [{"name": "reach", "period": "day",
+                          "values": [{"value": len(self.calls), "end_time": end}]}],
+                "paging": {"next": following}}
+
+def test_iter_media_follows_cursors_with_the_requested_page_size():
+    client = make_client()
+    client._make_request = graph = MediaGraph()
+
+    ids = [item["id"] for item in client.iter_media("111", "token", page_size=3)]
+
+    assert ids == ["7", "6", "5", "4", "3", "2", "1"]
+    assert [call.get('after') for call in graph.calls] == [None, "3", "6"]
+    assert all(call['limit'] == 3 for call in graph.calls)
+
+def test_iter_media_stops_at_since_without_fetching_older_pages():
+    client = make_client()
+    client._make_request = graph = MediaGraph()
+
+    since = datetime(2024, 5, 5, tzinfo=timezone.utc)
+    ids = [item["id"] for item in client.iter_media("111", "token", page_size=2, since=since)]
+
+    assert ids == ["7", "6", "5"]
+    assert len(graph.calls) == 2
+
+def test_iter_insights_follows_next_until_the_requested_end():
+    client = make_client()
+    client._make_request = graph = InsightsGraph(max_window=DAY)
+
+    start = 1714521600
+    rows = list(client.iter_insights("111", "token", ["reach"], since=start,
+                                     until=start + 3 * DAY))
+
+    assert [row["value"] for row in rows] == [1, 2, 3]
+    assert [int(call['since']) for call in graph.calls] == [start, start + DAY, start + 2 * DAY]
+
+def test_default_insights_window_is_one_request():
+    client = make_client()
+    client._make_request = graph = InsightsGraph()
+
+    list(client.iter_insights("111", "token", ["reach"]))
+
+    assert len(graph.calls) == 1
+
+def test_async_streams_match_sync():
+    client = make_client()
+    client._make_request = media = MediaGraph()
+    async_client = AsyncMetaGraphClient(client.config, client=client)
+
+    async def run():
+        async with async_client:
+            ids = [item["id"] async for item in async_client.iter_media("111", "token",
+                                                                         page_size=3)]
+            client._make_request = insights = InsightsGraph()
+            rows = [row async for row in async_client.iter_insights("111", "token", ["reach"])]
+            return ids, rows, insights
+
+    ids, rows, insights = asyncio.run(run())
+
+    assert ids == ["7", "6", "5", "4", "3", "2", "1"] and len(media.calls) == 3
+    assert len(rows) == 1 and len(insights.calls) == 1
@@ -0,0 +1,136 @@
+import sys
+import os
+import json
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import requests
+
+from api.core.meta_client_v24 import MetaGraphClient, MetaAppConfig, MetaAPIError, BatchRequest
+from api.core.metrics import MetricsRegistry
+from api.core.transport import HTTPTransport
+from api.security.token_manager import TokenManager
+
+DAY = 86400
+
+class FakeVault:
+    def __init__(self):
+        self.tokens = {}
+
+    def store_token(self, name, token):
+        self.tokens[name] = token
+
+    def get_token(self, name):
+        return self.tokens.get(name)
+
+class FakeClient:
+    def __init__(self, clock, lifetime):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.debug_calls = 0
+        self.rotations = 0
+
+    def validate_app_access_token(self, token):
+        self.debug_calls += 1
+        return {"data": {"is_valid": not token.startswith("dead"),
+                         "expires_at": self.clock() + self.lifetime,
+                         "scopes": ["instagram_content_publish"]}}
+
+    def rotate_token(self, token):
+        self.rotations += 1
+        return f"{token}-r{self.rotations}"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+def make_manager(lifetime=60 * DAY):
+    clock = FakeClock()
+    client = FakeClient(clock, lifetime)
+    vault = FakeVault()
+    manager = TokenManager(client, vault=vault, clock=clock)
+    return manager, client, vault, clock
+
+def test_debug_token_results_are_cached():
+    manager, client, _, clock = make_manager()
+    manager.register("PAGE_TOKEN_1", "abc")
+
+    assert manager.get("PAGE_TOKEN_1") == "abc"
+    assert manager.info("PAGE_TOKEN_1").scopes == ["instagram_content_publish"]
+    clock.now += 3600
+    manager.refresh_due()
+    assert client.debug_calls == 1
+
+def test_tokens_rotate_before_expiry_and_persist():
+    manager, client, vault, _ = make_manager(lifetime=3 * DAY)
+    manager.register("PAGE_TOKEN_1", "abc")
+
+    assert manager.refresh_due() == ["PAGE_TOKEN_1"]
+    assert manager.get("PAGE_TOKEN_1") == "abc-r1"
+    assert vault.tokens["PAGE_TOKEN_1"] == "abc-r1"
+
+def test_invalid_tokens_fail_fast():
+    manager, _, _, _ = make_manager()
+    manager.register("PAGE_TOKEN_1", "dead-token")
+
+    with pytest.raises(MetaAPIError) as excinfo:
+        manager.get("PAGE_TOKEN_1")
+    assert excinfo.value.code == 190
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.headers = {}
+        self.request = None
+        self.content = b""
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}")
+
+REVOKED = {"error": {"code": 190, "message": "Session has been invalidated"}}
+
+class RevokedTokenSession:
+    """Graph that rejects every token starting with "revoked" """
+
+    def request(self, method, url, params=None, data=None, **kwargs):
+        if data and "batch" in data:
+            return FakeResponse([
+                {"code": 400, "body": json.dumps(REVOKED)} if "revoked" in op["relative_url"]
+                else {"code": 200, "body": "{}"} for op in json.loads(data["batch"])
+            ])
+        if params["access_token"].startswith("revoked"):
+            return FakeResponse(REVOKED, status_code=400)
+        return FakeResponse({"data": []})
+
+def make_graph_manager():
+    client = MetaGraphClient(MetaAppConfig("app1", "secret", "client", "biz", cache_enabled=False),
+                             transport=HTTPTransport(metrics=MetricsRegistry()))
+    client.transport.session = RevokedTokenSession()
+    manager = TokenManager(client, vault=FakeVault(), clock=FakeClock())
+    for page_id, token in (("1", "revoked-a"), ("2", "revoked-b"), ("3", "good")):
+        manager.register(f"PAGE_TOKEN_{page_id}", token, inspect=False)
+    return client, manager
+
+def test_code_190_from_graph_invalidates_the_token():
+    client, manager = make_graph_manager()
+
+    with pytest.raises(MetaAPIError):
+        client.get_instagram_media("1", manager.page_token("1"))
+    client.batch([BatchRequest("GET", "2/media", manager.page_token("2"), "2"),
+                  BatchRequest("GET", "3/media", manager.page_token("3"), "3")])
+
+    for page_id in ("1", "2"):
+        with pytest.raises(MetaAPIError) as excinfo:
+            manager.page_token(page_id)
+        assert excinfo.value.code == 190
+    assert manager.page_token("3") == "good"
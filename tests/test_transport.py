@@ -0,0 +1,108 @@
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the project root to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.core.metrics import MetricsRegistry
+from urllib3.util.retry import Retry
+
+from api.core.transport import HTTPTransport, HostPoolConfig, endpoint_template, IDEMPOTENT_METHODS
+from fake_rupload_server import FakeRuploadServer
+
+def test_endpoint_template_collapses_ids():
+    assert endpoint_template("https://graph.facebook.com/v24.0/1784/media?x=1") == "/v24.0/{id}/media"
+    assert endpoint_template(
+        "https://api.notion.com/v1/pages/0f6c1c2e-6a1b-4c3d-9e8f-0123456789ab"
+    ) == "/v1/pages/{id}"
+
+def test_configure_host_keeps_larger_pool():
+    transport = HTTPTransport(metrics=MetricsRegistry())
+    transport.configure_host("https://graph.facebook.com/", HostPoolConfig(1, 16))
+    transport.configure_host("https://graph.facebook.com", HostPoolConfig(1, 4))
+
+    assert transport.host_pools["https://graph.facebook.com"].pool_maxsize == 16
+
+def test_requests_are_recorded_per_client_and_endpoint():
+    metrics = MetricsRegistry()
+    transport = HTTPTransport(metrics=metrics)
+    records = []
+    transport.add_hook(records.append)
+
+    with FakeRuploadServer() as server:
+        response = transport.get(f"{server.url}/rupload/123", client="meta")
+
+    assert response.status_code == 200
+    assert records[0].client == "meta" and records[0].endpoint == "/rupload/{id}"
+    assert metrics.get("http_requests_total", status="200", client="meta",
+                       endpoint="/rupload/{id}", method="GET") == 1
+
+class FlakyServer:
+    """Answers the first request to each path with 502, then 200"""
+
+    def __init__(self):
+        self.hits = []
+        hits = self.hits
+
+        class Handler(BaseHTTPRequestHandler):
+            def _answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                hits.append((self.command, self.path))
+                first = sum(1 for hit in hits if hit == (self.command, self.path)) == 1
+                self.send_response(502 if first else 200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            do_GET = do_POST = do_PATCH = _answer
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+def quick_retry_transport():
+    retry = Retry(total=3, backoff_factor=0, status_forcelist=[502],
+                  allowed_methods=IDEMPOTENT_METHODS, raise_on_status=False)
+    return HTTPTransport(retry=retry, metrics=MetricsRegistry())
+
+def test_writes_are_not_retried_unless_marked_idempotent():
+    transport = quick_retry_transport()
+
+    with FlakyServer() as server:
+        post = transport.post(f"{server.url}/v1/pages", json={"a": 1})
+        patch = transport.patch(f"{server.url}/v1/pages/1", json={"a": 1})
+        get = transport.get(f"{server.url}/v1/users")
+        chunk = transport.post(f"{server.url}/rupload/1", idempotent=True, data=b"chunk")
+
+    assert (post.status_code, patch.status_code) == (502, 502)
+    assert (get.status_code, chunk.status_code) == (200, 200)
+    assert [hit for hit in server.hits if hit[0] != 'GET'] == [
+        ('POST', '/v1/pages'), ('PATCH', '/v1/pages/1'),
+        ('POST', '/rupload/1'), ('POST', '/rupload/1'),
+    ]
+
+def test_streamed_bodies_do_not_break_metrics():
+    metrics = MetricsRegistry()
+    transport = HTTPTransport(metrics=metrics)
+    records = []
+    transport.add_hook(records.append)
+
+    with FlakyServer() as server:
+        response = transport.post(f"{server.url}/upload", client="meta",
+                                  data=(part for part in [b"ab", b"cd"]))
+
+    assert response.status_code == 502
+    assert records[0].request_bytes is None